@@ -34,12 +34,16 @@ class ImageConverter:
         canvas = tosc.ElementTOSC(main.findChildByName(self.canvas_name))
 
         pxs = self.pixel_size
-        for iy, ix in np.ndindex(self.pixels.shape[:2]):
-            box = tosc.ElementTOSC(canvas.createChild(ControlType.BOX))
-            (r, g, b) = self.pixels[iy, ix]
-            box.setName(f"p{ix}{iy}")
-            box.setColor((r, g, b, 1))
-            box.setFrame((ix * pxs, iy * pxs, pxs, pxs))
+        iy, ix = np.indices(self.pixels.shape[:2]).reshape(2, -1)
+        size = np.full(ix.size, pxs)
+        frames = np.stack((ix * pxs, iy * pxs, size, size), axis=1)
+        colors = np.concatenate(
+            (self.pixels[..., :3].reshape(-1, 3), np.ones((ix.size, 1))), axis=1
+        )
+        names = [f"p{x}{y}" for x, y in zip(ix, iy)]
+        canvas.createChildren(
+            ControlType.BOX, ix.size, frames, colors, names, sections=True
+        )
 
         return tosc.write(root, self.output_path)
 
@@ -1,2 +1,5 @@
 from .tosc import *
 from .layout import *
+from .arrays import *
+from .store import *
+from .flex import *
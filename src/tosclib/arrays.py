@@ -0,0 +1,156 @@
+"""
+Bulk access to frames and colors as NumPy arrays.
+
+Reading walks the subtree once and converts every param text in a single
+NumPy call. Writing formats the whole array at once and then updates the
+param texts of every node in one pass.
+
+    F, nodes = frames(page)
+    F[:, 0] += 10
+    setFrames(nodes, F)
+"""
+
+from itertools import islice
+from typing import Iterable, Iterator
+from .elements import ControlElements, Property, PropertyType
+from .controls import XmlFactory
+from .tosc import (
+    ElementTOSC,
+    ElementXML,
+    FRAME_HOOKS,
+    KeyIndex,
+    PARAMS,
+    formatFrames,
+    formatColors,
+)
+
+import numpy as np
+import xml.etree.ElementTree as ET
+
+
+FRAME_PARAMS = PARAMS[PropertyType.FRAME.value]
+COLOR_PARAMS = PARAMS[PropertyType.COLOR.value]
+
+
+def descendants(subtree: ElementTOSC | ElementXML) -> Iterator[ElementXML]:
+    """All nodes below an ElementTOSC or <node>, or all nodes in a root"""
+    if isinstance(subtree, ElementTOSC):
+        return subtree.children.iter(ControlElements.NODE.value)
+    if subtree.tag == ControlElements.NODE.value:
+        return islice(subtree.iter(ControlElements.NODE.value), 1, None)
+    return subtree.iter(ControlElements.NODE.value)
+
+
+def findProperty(node: ElementXML, key: str) -> ElementXML | None:
+    """<property> of a node by key, without building a KeyIndex"""
+    if (properties := node.find(ControlElements.PROPERTIES.value)) is not None:
+        for property in properties:
+            if property.findtext("key") == key:
+                return property
+    return None
+
+
+def readParams(
+    nodes: Iterable[ElementXML], key: str, params: tuple[str, ...]
+) -> tuple[np.ndarray, list[ElementXML]]:
+    """Collect the param texts of a property from every node that has it
+    and convert them to a (N, len(params)) float array in one call."""
+    found = []
+    texts: list[str | None] = []
+    for node in nodes:
+        if (property := findProperty(node, key)) is None:
+            continue
+        if (value := property.find("value")) is None:
+            continue
+        found.append(node)
+        texts.extend(value.findtext(p) for p in params)
+    if None in texts:
+        raise ValueError(f"Some {key} properties are missing {params} params.")
+    array = np.array(texts, dtype=float).reshape(len(found), len(params))
+    return array, found
+
+
+def writeParams(
+    nodes: list[ElementXML],
+    type: PropertyType,
+    key: str,
+    params: tuple[str, ...],
+    texts: list[list[str]],
+) -> bool:
+    """Set the param texts of a property on every node.
+    Existing params are updated in place, missing properties are created."""
+    if len(nodes) != len(texts) or any(len(row) != len(params) for row in texts):
+        raise ValueError(
+            f"Expected {len(nodes)} rows of {len(params)} values for {key}."
+        )
+    for node, row in zip(nodes, texts):
+        targets: list[ElementXML | None] = [None]
+        if (property := findProperty(node, key)) is not None:
+            if (value := property.find("value")) is not None:
+                targets = [value.find(p) for p in params]
+        if None not in targets:
+            for target, text in zip(targets, row):
+                target.text = text
+            continue
+        if (properties := node.find(ControlElements.PROPERTIES.value)) is None:
+            properties = ET.SubElement(node, ControlElements.PROPERTIES.value)
+        if property is not None:
+            properties.remove(property)
+            KeyIndex.removed(properties, property)
+        XmlFactory.buildProperties(
+            properties, [Property(type.value, key, "", dict(zip(params, row)))]
+        )
+    return True
+
+
+def frames(
+    subtree: ElementTOSC | ElementXML,
+) -> tuple[np.ndarray, list[ElementXML]]:
+    """Frames of every node in the subtree that has one.
+
+    Args:
+        subtree (ElementTOSC | ET.Element): Parent, <node> or root.
+
+    Returns:
+        tuple[np.ndarray, list[ET.Element]]: (N,4) int array of x,y,w,h
+        and the N nodes they belong to.
+    """
+    F, nodes = readParams(descendants(subtree), "frame", FRAME_PARAMS)
+    return F.astype(int), nodes
+
+
+def colors(
+    subtree: ElementTOSC | ElementXML,
+) -> tuple[np.ndarray, list[ElementXML]]:
+    """Colors of every node in the subtree that has one.
+
+    Args:
+        subtree (ElementTOSC | ET.Element): Parent, <node> or root.
+
+    Returns:
+        tuple[np.ndarray, list[ET.Element]]: (N,4) float array of r,g,b,a
+        and the N nodes they belong to.
+    """
+    return readParams(descendants(subtree), "color", COLOR_PARAMS)
+
+
+def setFrames(nodes: list[ElementXML], F: np.ndarray, hooks: bool = True) -> bool:
+    """Write a (N,4) array of x,y,w,h back to N nodes, floats are truncated.
+
+    Once every frame is written, the FRAME_HOOKS of the nodes are called in
+    order, unless hooks is False. Each hook reads its frame back, since an
+    earlier one may have laid out a later node again.
+    """
+    texts = formatFrames(F)
+    done = writeParams(nodes, PropertyType.FRAME, "frame", FRAME_PARAMS, texts)
+    if hooks and FRAME_HOOKS:
+        for node in nodes:
+            if (hook := FRAME_HOOKS.get(node)) is not None:
+                hook(node, None)
+    return done
+
+
+def setColors(nodes: list[ElementXML], C: np.ndarray) -> bool:
+    """Write a (N,4) array of r,g,b,a back to N nodes"""
+    texts = formatColors(C)
+    return writeParams(nodes, PropertyType.COLOR, "color", COLOR_PARAMS, texts)
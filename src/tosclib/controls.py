@@ -3,13 +3,20 @@ Hexler's Enumerations
 """
 
 from copy import deepcopy
-from dataclasses import dataclass, field
-from types import UnionType
-from typing import ClassVar, Final, Protocol, TypeAlias, TypeGuard
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType, UnionType
+from typing import (
+    Any, Callable, ClassVar, Final, Protocol, TypeAlias, TypeGuard,
+    get_args, get_origin,
+)
 import uuid
 from .elements import (
     MidiMessage,
+    MidiValue,
+    Partial,
+    Trigger,
     Property,
+    PropertyType,
     Value,
     OSC,
     MIDI,
@@ -25,8 +32,66 @@ import xml.etree.ElementTree as ET
 
 Properties: TypeAlias = list[Property]
 Values: TypeAlias = list[Value]
-Message: TypeAlias = OSC | MIDI | LOCAL
-Messages: TypeAlias = list[OSC | MIDI | LOCAL]
+Message: TypeAlias = OSC | MIDI | LOCAL | ET.Element
+"""Other messages like <gamepad> are kept as their raw Element."""
+Messages: TypeAlias = list[OSC | MIDI | LOCAL | ET.Element]
+ITEMS: dict[str, type] = {"trigger": Trigger, "partial": Partial, "value": MidiValue}
+"""Classes of the items in message lists by tag, <values> of <midi> hold <value>."""
+ITEM_TAGS: dict[type, str] = {cls: tag for tag, cls in ITEMS.items()}
+
+PropertyBuilder: TypeAlias = Callable[[Any], Properties]
+FieldBuilders: TypeAlias = dict[str, Callable[[Any], Property]]
+
+
+def propertyExpression(key: str, annotation: Any) -> str:
+    """Source of the expression that builds the Property of one field of
+    self, with key, PropertyType and formatting fixed from the annotation.
+    Tuples of ints are Frames, tuples of floats are Colors, anything else
+    goes through PropertyFactory.build.
+
+    Args:
+        key (str): Field name and Property key.
+        annotation (Any): Field type, Final[...] is unwrapped.
+
+    Returns:
+        str: Python expression.
+    """
+    if get_origin(annotation) is Final:
+        annotation = get_args(annotation)[0]
+    if annotation is str:
+        return f"Property('s', {key!r}, self.{key})"
+    if annotation is bool:
+        return f"Property('b', {key!r}, repr(int(self.{key})))"
+    if annotation is int:
+        return f"Property('i', {key!r}, repr(self.{key}))"
+    if annotation is float:
+        return f"Property('f', {key!r}, repr(self.{key}))"
+    if get_origin(annotation) is tuple and get_args(annotation)[:1] == (int,):
+        return f"Property('r', {key!r}, '', dict(zip('xywh', map(repr, self.{key}))))"
+    if get_origin(annotation) is tuple and get_args(annotation)[:1] == (float,):
+        return (f"Property('c', {key!r}, '', "
+                f"dict(zip('rgba', map(repr, map(float, self.{key})))))")
+    return f"PropertyFactory.build({key!r}, self.{key})"
+
+
+BUILDERS: dict[type, tuple[PropertyBuilder, FieldBuilders]] = {}
+"""Generated builders of each *Properties class: all fields and by field."""
+
+
+def propertyBuilders(cls: type) -> tuple[PropertyBuilder, FieldBuilders]:
+    """Generate the builders of a *Properties class on first use.
+
+    Returns:
+        tuple: Builder of all fields in order, and builders by field name.
+    """
+    if (builders := BUILDERS.get(cls)) is None:
+        namespace = {"Property": Property, "PropertyFactory": PropertyFactory}
+        expressions = {f.name: propertyExpression(f.name, f.type) for f in fields(cls)}
+        builders = BUILDERS[cls] = (
+            eval(f"lambda self: [{', '.join(expressions.values())}]", namespace),
+            {k: eval(f"lambda self: {e}", namespace) for k, e in expressions.items()},
+        )
+    return builders
 
 
 @dataclass
@@ -40,9 +105,11 @@ class _ControlProperties:
     """Any string"""
     script: Final[str] = " "
     """Any string"""
-    frame: Final[tuple] = field(default_factory=lambda: (0, 0, 100, 100))
+    frame: Final[tuple[int, ...]] = field(default_factory=lambda: (0, 0, 100, 100))
     """x,y,w,h float list"""
-    color: Final[tuple] = field(default_factory=lambda: (0.25, 0.25, 0.25, 1.0))
+    color: Final[tuple[float, ...]] = field(
+        default_factory=lambda: (0.25, 0.25, 0.25, 1.0)
+    )
     """r,g,b,a float list"""
     locked: Final[bool] = False
     visible: Final[bool] = True
@@ -65,10 +132,15 @@ class _ControlProperties:
         Returns:
             list[Property] from this class' attributes.
         """
+        buildAll, builders = propertyBuilders(self.__class__)
         if len(args) == 0:
-            args = tuple(key for key in vars(self))
+            return buildAll(self)
 
-        return [PropertyFactory.build(arg, getattr(self, arg)) for arg in args]
+        return [
+            builders[arg](self) if arg in builders
+            else PropertyFactory.build(arg, getattr(self, arg))
+            for arg in args
+        ]
 
 
 @dataclass
@@ -130,7 +202,9 @@ class _TextProperties:
     """0, 1 = default, monospaced"""
     textSize: Final[int] = 14
     """Any int"""
-    textColor: Final[tuple] = field(default_factory=lambda: (1, 1, 1, 1))
+    textColor: Final[tuple[float, ...]] = field(
+        default_factory=lambda: (1.0, 1.0, 1.0, 1.0)
+    )
     """rgba dict from 0 to 1 as str"""
     textAlignH: Final[int] = 2
     """1,2,3 = left, center, right"""
@@ -261,11 +335,58 @@ class PagerProperties(_ControlProperties, _GroupProperties):
 
 @dataclass
 class PageProperties(_ControlProperties, _GroupProperties):
-    tabColorOff: Final[tuple] = field(default_factory=lambda: (0.25, 0.25, 0.25, 1.0))
-    tabColorOn: Final[tuple] = field(default_factory=lambda: (0, 0, 0, 0))
+    tabColorOff: Final[tuple[float, ...]] = field(
+        default_factory=lambda: (0.25, 0.25, 0.25, 1.0)
+    )
+    tabColorOn: Final[tuple[float, ...]] = field(
+        default_factory=lambda: (0.0, 0.0, 0.0, 0.0)
+    )
     tabLabel: Final[str] = "1"
-    textColorOff: Final[tuple] = field(default_factory=lambda: (1, 1, 1, 1))
-    textColorOn: Final[tuple] = field(default_factory=lambda: (1, 1, 1, 1))
+    textColorOff: Final[tuple[float, ...]] = field(
+        default_factory=lambda: (1.0, 1.0, 1.0, 1.0)
+    )
+    textColorOn: Final[tuple[float, ...]] = field(
+        default_factory=lambda: (1.0, 1.0, 1.0, 1.0)
+    )
+
+
+DefaultTable: TypeAlias = tuple[Property, ...]
+
+
+def propertyTable(cls: type) -> DefaultTable:
+    """Build the default Property objects of a *Properties class once.
+
+    The table is shared by every Control of that type, params are
+    read-only mappings so it can't be modified by accident.
+
+    Args:
+        cls (type): *Properties dataclass.
+
+    Returns:
+        DefaultTable: tuple[Property, ...]
+    """
+    return tuple(
+        Property(p.type, p.key, p.value, MappingProxyType(p.params))
+        for p in cls().build()
+    )
+
+
+def mergeProperties(defaults: DefaultTable, overrides: Properties) -> Properties:
+    """Defaults with the overrides of the same key in their place,
+    followed by the overrides of keys not in the defaults. If several
+    overrides share a key the last one wins."""
+    if not overrides:
+        return list(defaults)
+    pending = {p.key: p for p in overrides}
+    merged = [pending.pop(p.key, p) for p in defaults]
+    merged.extend(pending.values())
+    return merged
+
+
+def mergedProperties(control: "Control") -> DefaultTable:
+    """All the properties a control is converted with, read-only.
+    control.properties only holds the overrides of control.defaults."""
+    return tuple(mergeProperties(getattr(control, "defaults", ()), control.properties))
 
 
 @dataclass
@@ -273,8 +394,9 @@ class Page:
     """Not a main control"""
 
     controlT: ClassVar[controlType] = ControlType.GROUP
+    defaults: ClassVar[DefaultTable] = propertyTable(PageProperties)
     id: str = field(default_factory=lambda:str(uuid.uuid4()))
-    properties: Properties = field(default_factory=lambda:PageProperties().build())
+    properties: Properties = field(default_factory=lambda: [])
     values: Values = field(default_factory=lambda: [])
     messages: Messages = field(default_factory=lambda: [])
     children: list["Control"] | None | list = None
@@ -283,8 +405,9 @@ class Page:
 @dataclass
 class Box:
     controlT: ClassVar[controlType] = ControlType.BOX
+    defaults: ClassVar[DefaultTable] = propertyTable(BoxProperties)
     id: str = field(default_factory=lambda:str(uuid.uuid4()))
-    properties: Properties = field(default_factory=lambda: BoxProperties().build())
+    properties: Properties = field(default_factory=lambda: [])
     values: Values = field(default_factory=lambda: [])
     messages: Messages = field(default_factory=lambda: [])
     children: list["Control"] | None | list = None
@@ -293,10 +416,9 @@ class Box:
 @dataclass
 class Button:
     controlT: ClassVar[controlType] = ControlType.BUTTON
+    defaults: ClassVar[DefaultTable] = propertyTable(ButtonProperties)
     id: str = field(default_factory=lambda:str(uuid.uuid4()))
-    properties: Properties = field(
-        default_factory=lambda: ButtonProperties().build()
-    )
+    properties: Properties = field(default_factory=lambda: [])
     values: Values = field(default_factory=lambda: [])
     messages: Messages = field(default_factory=lambda: [])
     children: list["Control"] | None | list = None
@@ -305,10 +427,9 @@ class Button:
 @dataclass
 class Label:
     controlT: ClassVar[controlType] = ControlType.LABEL
+    defaults: ClassVar[DefaultTable] = propertyTable(LabelProperties)
     id: str = field(default_factory=lambda:str(uuid.uuid4()))
-    properties: Properties = field(
-        default_factory=lambda: LabelProperties().build()
-    )
+    properties: Properties = field(default_factory=lambda: [])
     values: Values = field(default_factory=lambda: [])
     messages: Messages = field(default_factory=lambda: [])
     children: list["Control"] | None | list = None
@@ -317,10 +438,9 @@ class Label:
 @dataclass
 class Text:
     controlT: ClassVar[controlType] = ControlType.TEXT
+    defaults: ClassVar[DefaultTable] = propertyTable(TextProperties)
     id: str = field(default_factory=lambda:str(uuid.uuid4()))
-    properties: Properties = field(
-        default_factory=lambda: TextProperties().build()
-    )
+    properties: Properties = field(default_factory=lambda: [])
     values: Values = field(default_factory=lambda: [])
     messages: Messages = field(default_factory=lambda: [])
     children: list["Control"] | None | list = None
@@ -329,10 +449,9 @@ class Text:
 @dataclass
 class Fader:
     controlT: ClassVar[controlType] = ControlType.FADER
+    defaults: ClassVar[DefaultTable] = propertyTable(FaderProperties)
     id: str = field(default_factory=lambda:str(uuid.uuid4()))
-    properties: Properties = field(
-        default_factory=lambda: FaderProperties().build()
-    )
+    properties: Properties = field(default_factory=lambda: [])
     values: Values = field(default_factory=lambda: [])
     messages: Messages = field(default_factory=lambda: [])
     children: list["Control"] | None | list = None
@@ -341,8 +460,9 @@ class Fader:
 @dataclass
 class Xy:
     controlT: ClassVar[controlType] = ControlType.XY
+    defaults: ClassVar[DefaultTable] = propertyTable(XyProperties)
     id: str = field(default_factory=lambda:str(uuid.uuid4()))
-    properties: Properties = field(default_factory=lambda: XyProperties().build())
+    properties: Properties = field(default_factory=lambda: [])
     values: Values = field(default_factory=lambda: [])
     messages: Messages = field(default_factory=lambda: [])
     children: list["Control"] | None | list = None
@@ -351,10 +471,9 @@ class Xy:
 @dataclass
 class Radial:
     controlT: ClassVar[controlType] = ControlType.RADIAL
+    defaults: ClassVar[DefaultTable] = propertyTable(RadialProperties)
     id: str = field(default_factory=lambda:str(uuid.uuid4()))
-    properties: Properties = field(
-        default_factory=lambda: RadialProperties().build()
-    )
+    properties: Properties = field(default_factory=lambda: [])
     values: Values = field(default_factory=lambda: [])
     messages: Messages = field(default_factory=lambda: [])
     children: list["Control"] | None | list = None
@@ -363,10 +482,9 @@ class Radial:
 @dataclass
 class Encoder:
     controlT: ClassVar[controlType] = ControlType.ENCODER
+    defaults: ClassVar[DefaultTable] = propertyTable(EncoderProperties)
     id: str = field(default_factory=lambda:str(uuid.uuid4()))
-    properties: Properties = field(
-        default_factory=lambda: EncoderProperties().build()
-    )
+    properties: Properties = field(default_factory=lambda: [])
     values: Values = field(default_factory=lambda: [])
     messages: Messages = field(default_factory=lambda: [])
     children: list["Control"] | None | list = None
@@ -375,10 +493,9 @@ class Encoder:
 @dataclass
 class Radar:
     controlT: ClassVar[controlType] = ControlType.RADAR
+    defaults: ClassVar[DefaultTable] = propertyTable(RadarProperties)
     id: str = field(default_factory=lambda:str(uuid.uuid4()))
-    properties: Properties = field(
-        default_factory=lambda: RadarProperties().build()
-    )
+    properties: Properties = field(default_factory=lambda: [])
     values: Values = field(default_factory=lambda: [])
     messages: Messages = field(default_factory=lambda: [])
     children: list["Control"] | None | list = None
@@ -387,10 +504,9 @@ class Radar:
 @dataclass
 class Radio:
     controlT: ClassVar[controlType] = ControlType.RADIO
+    defaults: ClassVar[DefaultTable] = propertyTable(RadioProperties)
     id: str = field(default_factory=lambda:str(uuid.uuid4()))
-    properties: Properties = field(
-        default_factory=lambda: RadioProperties().build()
-    )
+    properties: Properties = field(default_factory=lambda: [])
     values: Values = field(default_factory=lambda: [])
     messages: Messages = field(default_factory=lambda: [])
     children: list["Control"] | None | list = None
@@ -399,10 +515,9 @@ class Radio:
 @dataclass
 class Group:
     controlT: ClassVar[controlType] = ControlType.GROUP
+    defaults: ClassVar[DefaultTable] = propertyTable(GroupProperties)
     id: str = field(default_factory=lambda:str(uuid.uuid4()))
-    properties: Properties = field(
-        default_factory=lambda: GroupProperties().build()
-    )
+    properties: Properties = field(default_factory=lambda: [])
     values: Values = field(default_factory=lambda: [])
     messages: Messages = field(default_factory=lambda: [])
     children: list["Control"] | None | list = None
@@ -411,10 +526,9 @@ class Group:
 @dataclass
 class Grid:
     controlT: ClassVar[controlType] = ControlType.GRID
+    defaults: ClassVar[DefaultTable] = propertyTable(GridProperties)
     id: str = field(default_factory=lambda:str(uuid.uuid4()))
-    properties: Properties = field(
-        default_factory=lambda: GridProperties().build()
-    )
+    properties: Properties = field(default_factory=lambda: [])
     values: Values = field(default_factory=lambda: [])
     messages: Messages = field(default_factory=lambda: [])
     children: list["Control"] | None | list = None
@@ -423,10 +537,9 @@ class Grid:
 @dataclass
 class Pager:
     controlT: ClassVar[controlType] = ControlType.PAGER
+    defaults: ClassVar[DefaultTable] = propertyTable(PagerProperties)
     id: str = field(default_factory=lambda:str(uuid.uuid4()))
-    properties: Properties = field(
-        default_factory=lambda: PagerProperties().build()
-    )
+    properties: Properties = field(default_factory=lambda: [])
     values: Values = field(default_factory=lambda: [])
     messages: Messages = field(default_factory=lambda: [])
     children: list["Control"] | None | list = field(
@@ -439,11 +552,14 @@ class Control(Protocol):
 
     Attributes:
         controlT: Control Type
-        properties: List of Property
+        defaults: Shared default Property table of the Control Type
+        properties: List of Property, overrides the defaults by key.
+            Empty unless given, see mergedProperties for the full list.
         values: List of Value
         messages: List of Message
     """
     controlT: ClassVar[controlType]
+    defaults: ClassVar[DefaultTable]
     id: str
     properties: Properties
     values: Values
@@ -516,7 +632,12 @@ class ControlConverter:
     """Convert from Control to XML"""
     @classmethod
     def build(cls, control: Control) -> ET.Element:
-        """Generate the XML Element and its SubElements
+        """Generate the XML Element and its SubElements.
+
+        Children are walked with a stack, so deep nests don't hit the
+        recursion limit. Property, Value and message objects shared
+        between controls, like the default tables, are built once per
+        call and copied after.
 
         Args:
             control (Control): Control
@@ -524,26 +645,72 @@ class ControlConverter:
         Returns:
             ET.Element: XML
         """
+        fragments = FragmentCache()
+        root = None
+        stack: list[tuple[Control, ET.Element | None]] = [(control, None)]
+        while stack:
+            control, parent = stack.pop()
+            node = cls.buildElement(control, fragments)
+            if parent is None:
+                root = node
+            else:
+                parent.append(node)
+            if control.children is not None:
+                children = ET.SubElement(node, ControlElements.CHILDREN.value)
+                stack.extend((c, children) for c in reversed(control.children))
+        return root
+
+    @classmethod
+    def buildElement(cls, control: Control, fragments: "FragmentCache") -> ET.Element:
+        """<node> of a single Control without its children"""
         node = ET.Element(
             ControlElements.NODE.value,
             attrib={"ID": control.id, "type": control.controlT.value},
         )
-        properties = ET.SubElement(node, ControlElements.PROPERTIES.value)
-        values = ET.SubElement(node, ControlElements.VALUES.value)
-        messages = ET.SubElement(node, ControlElements.MESSAGES.value)
-        
-        XmlFactory.buildProperties(properties, control.properties)
-        XmlFactory.buildValues(values, control.values)
-        XmlFactory.buildMessages(messages, control.messages)
-
-        if control.children is not None:
-            children = ET.SubElement(node, ControlElements.CHILDREN.value)
-            for child in control.children:
-                children.append(cls.build(child))
-        
+        node.append(fragments.section(
+            ControlElements.PROPERTIES.value,
+            mergeProperties(getattr(control, "defaults", ()), control.properties),
+            XmlFactory.propertyElement,
+        ))
+        node.append(fragments.section(
+            ControlElements.VALUES.value, control.values, XmlFactory.valueElement
+        ))
+        node.append(fragments.section(
+            ControlElements.MESSAGES.value, control.messages, XmlFactory.messageElement
+        ))
         return node
 
 
+class FragmentCache:
+    """XML fragments of Property, Value and message objects by identity,
+    and of whole sections by the identities of their objects. The first
+    use builds the fragment, the next ones get a copy of it."""
+
+    def __init__(self):
+        self.fragments: dict[Any, tuple[Any, ET.Element]] = {}
+
+    def get(self, obj: Any, build: Callable[[Any], ET.Element]) -> ET.Element:
+        """Fragment of obj, build is only called the first time"""
+        if (entry := self.fragments.get(id(obj))) is not None:
+            return deepcopy(entry[1])
+        e = build(obj)
+        # Keep obj alive so its id isn't reused while the cache exists
+        self.fragments[id(obj)] = (obj, e)
+        return e
+
+    def section(self, tag: str, objs: list,
+                build: Callable[[Any], ET.Element]) -> ET.Element:
+        """<tag> with the fragments of objs, copied whole if the same
+        objects were already converted in the same order"""
+        key = (tag, *map(id, objs))
+        if (entry := self.fragments.get(key)) is not None:
+            return deepcopy(entry[1])
+        e = ET.Element(tag)
+        e.extend([self.get(obj, build) for obj in objs])
+        self.fragments[key] = (objs, e)
+        return e
+
+
 class XmlFactory:
     """Generate specific XML structures"""
     @classmethod
@@ -557,17 +724,22 @@ class XmlFactory:
         Returns:
             bool: bool
         """
-        for prop in props:
-            property = ET.SubElement(
-                e, ControlElements.PROPERTY.value, attrib={"type": prop.type}
-            )
-            ET.SubElement(property, "key").text = prop.key
-            value = ET.SubElement(property, "value")
-            value.text = prop.value
-            for k in prop.params:
-                ET.SubElement(value, k).text = prop.params[k]
+        e.extend([cls.propertyElement(prop) for prop in props])
         return True
 
+    @classmethod
+    def propertyElement(cls, prop: Property) -> ET.Element:
+        """<property> of a single Property"""
+        property = ET.Element(
+            ControlElements.PROPERTY.value, attrib={"type": prop.type}
+        )
+        ET.SubElement(property, "key").text = prop.key
+        value = ET.SubElement(property, "value")
+        value.text = prop.value
+        for k in prop.params:
+            ET.SubElement(value, k).text = prop.params[k]
+        return property
+
     @classmethod
     def modifyProperty(cls, e: ET.Element, value:str, params:dict[str,str]) -> bool:
         """Modify an existing property XML
@@ -590,12 +762,17 @@ class XmlFactory:
 
     @classmethod
     def buildValues(cls, e: ET.Element, vals: Values) -> bool:
-        for val in vals:
-            value = ET.SubElement(e, ControlElements.VALUE.value)
-            for k in val.__slots__:
-                ET.SubElement(value, k).text = getattr(val, k)
+        e.extend([cls.valueElement(val) for val in vals])
         return True
 
+    @classmethod
+    def valueElement(cls, val: Value) -> ET.Element:
+        """<value> of a single Value"""
+        value = ET.Element(ControlElements.VALUE.value)
+        for k in val.__slots__:
+            ET.SubElement(value, k).text = getattr(val, k)
+        return value
+
     @classmethod
     def modifyValue(cls, e: ET.Element, val: Value) -> bool:
         for k in val.__slots__:
@@ -605,23 +782,30 @@ class XmlFactory:
 
     @classmethod
     def buildMessages(cls, e: ET.Element, msgs: Messages) -> bool:
-        for message in msgs:
-            msg = ET.SubElement(e, message.__class__.__name__.lower())
-            for k in message.__slots__:
-                element = ET.SubElement(msg, k)
-                v = getattr(message, k)
-                if isinstance(v, list):
-                    for pt in v:
-                        e = ET.SubElement(element, type(pt).__name__.lower())
-                        for x in pt.__slots__:
-                            ET.SubElement(e, x).text = getattr(pt, x)
-                elif isinstance(v, MidiMessage):
-                    for x in pt.__slots__:
-                        ET.SubElement(element, x).text = getattr(pt, x)
-                else:
-                    element.text = v
+        e.extend([cls.messageElement(message) for message in msgs])
         return True
 
+    @classmethod
+    def messageElement(cls, message: Message) -> ET.Element:
+        """<osc>, <midi> or <local> of a single message, a copy of a raw one"""
+        if isinstance(message, ET.Element):
+            return deepcopy(message)
+        msg = ET.Element(message.__class__.__name__.lower())
+        for k in message.__slots__:
+            element = ET.SubElement(msg, k)
+            v = getattr(message, k)
+            if isinstance(v, list):
+                for pt in v:
+                    item = ET.SubElement(element, ITEM_TAGS[type(pt)])
+                    for x in pt.__slots__:
+                        ET.SubElement(item, x).text = getattr(pt, x)
+            elif isinstance(v, MidiMessage):
+                for x in v.__slots__:
+                    ET.SubElement(element, x).text = getattr(v, x)
+            else:
+                element.text = v
+        return msg
+
     @classmethod
     def buildNode(cls, e: ET.Element, controlT: controlType, ) -> ET.Element:
         return ET.SubElement(
@@ -629,3 +813,127 @@ class XmlFactory:
             ControlElements.NODE.value,
             attrib={"ID": str(uuid.uuid4()), "type": controlT.value},
         )
+
+
+CONTROLS: dict[str, type] = {
+    ControlType.BOX.value: Box,
+    ControlType.BUTTON.value: Button,
+    ControlType.ENCODER.value: Encoder,
+    ControlType.FADER.value: Fader,
+    ControlType.GRID.value: Grid,
+    ControlType.GROUP.value: Group,
+    ControlType.LABEL.value: Label,
+    ControlType.PAGER.value: Pager,
+    ControlType.RADAR.value: Radar,
+    ControlType.RADIAL.value: Radial,
+    ControlType.RADIO.value: Radio,
+    ControlType.TEXT.value: Text,
+    ControlType.XY.value: Xy,
+}
+"""Control classes by <node type>."""
+
+MESSAGES: dict[str, type] = {
+    ControlElements.OSC.value: OSC,
+    ControlElements.MIDI.value: MIDI,
+    ControlElements.LOCAL.value: LOCAL,
+}
+"""Message classes by tag, other messages like <gamepad> are kept raw."""
+
+
+def fieldDecoder(default: Any) -> Callable[[ET.Element], Any]:
+    """Decoder of one message field, chosen from its default value"""
+    if isinstance(default, list):
+        return lambda e: [ControlDecoder.decodeSlots(ITEMS[i.tag], i) for i in e]
+    if isinstance(default, MidiMessage):
+        return lambda e: ControlDecoder.decodeSlots(MidiMessage, e)
+    return lambda e: e.text or ""
+
+
+FIELDS: dict[type, dict[str, Callable[[ET.Element], Any]]] = {
+    cls: {k: fieldDecoder(getattr(cls(), k)) for k in cls.__slots__}
+    for cls in MESSAGES.values()
+}
+"""Decoders of the fields of each message class, by tag."""
+
+LIST_FIELDS: dict[type, tuple[str, ...]] = {
+    cls: tuple(k for k in cls.__slots__ if isinstance(getattr(cls(), k), list))
+    for cls in MESSAGES.values()
+}
+"""List fields of each message class, empty when their tag is missing."""
+
+
+class ControlDecoder:
+    """Convert from XML to Control"""
+    @classmethod
+    def build(cls, node: ET.Element) -> Control:
+        """Generate the Control of a <node> and of all its children.
+
+        Children are walked with a stack. The decoded controls have no
+        defaults, so converting them back gives the same properties.
+
+        Args:
+            node (ET.Element): <node>
+
+        Returns:
+            Control: Box, Fader, Group, etc.
+        """
+        root = cls.decodeNode(node)
+        stack = [(node, root)]
+        while stack:
+            node, control = stack.pop()
+            if (children := node.find(ControlElements.CHILDREN.value)) is None:
+                continue
+            control.children = [cls.decodeNode(child) for child in children]
+            stack.extend(zip(children, control.children))
+        return root
+
+    @classmethod
+    def decodeNode(cls, node: ET.Element) -> Control:
+        """Control of a single <node>, children are set to None"""
+        control = CONTROLS[node.get("type")](
+            node.get("ID"), [], [], [], None
+        )
+        control.defaults = ()
+        for section in node:
+            match section.tag:
+                case "properties":
+                    control.properties = [cls.decodeProperty(e) for e in section]
+                case "values":
+                    control.values = [cls.decodeSlots(Value, e) for e in section]
+                case "messages":
+                    control.messages = [cls.decodeMessage(e) for e in section]
+        return control
+
+    @classmethod
+    def decodeProperty(cls, e: ET.Element) -> Property:
+        value = e.find("value")
+        return Property(
+            e.get("type"),
+            e.findtext("key") or "",
+            (value.text or "") if value is not None else "",
+            {p.tag: p.text or "" for p in value} if value is not None else {},
+        )
+
+    @classmethod
+    def decodeSlots(cls, slotsClass: type, e: ET.Element) -> Any:
+        """Value, Trigger, Partial, MidiMessage or MidiValue from the
+        leaves of e, missing leaves keep their defaults"""
+        obj = slotsClass()
+        for leaf in e:
+            if leaf.tag in slotsClass.__slots__:
+                setattr(obj, leaf.tag, leaf.text or "")
+        return obj
+
+    @classmethod
+    def decodeMessage(cls, e: ET.Element) -> Message:
+        """OSC, MIDI or LOCAL, a copy of e for the other tags"""
+        if (messageClass := MESSAGES.get(e.tag)) is None:
+            return deepcopy(e)
+        decoders = FIELDS[messageClass]
+        message = messageClass()
+        for k in LIST_FIELDS[messageClass]:
+            setattr(message, k, [])
+        for field in e:
+            if (decode := decoders.get(field.tag)) is not None:
+                setattr(message, field.tag, decode(field))
+        return message
@@ -0,0 +1,278 @@
+"""
+Flexbox-style layouts solved for a whole tree at once.
+
+A Flex is a box that places its children along a row or a column. Every
+child gets its basis plus a share of the free space by its grow factor,
+clamped to its min and max sizes, with padding inside the box and gaps
+between children. Children are placed along the main axis by justify and
+across it by align.
+
+The tree is flattened breadth first, so each level is solved with a few
+NumPy operations for all its boxes together, and every frame is written
+back in one call:
+
+    root = Flex(direction="row", padding=10, gap=5, children=[
+        Flex(basis=200, grow=0),
+        Flex(children=[Flex(), Flex(maxSize=100)], justify="center"),
+    ])
+    applyFlex(page, root)
+
+Frames are relative to the parent box, as in TouchOSC.
+"""
+
+import math
+from dataclasses import dataclass, field
+from .elements import ControlType
+from .tosc import ElementTOSC, ElementXML
+from .arrays import setFrames
+
+import numpy as np
+
+
+DIRECTIONS = ("column", "row")
+ALIGNS = ("start", "center", "end", "stretch")
+JUSTIFIES = ("start", "center", "end", "between")
+
+
+@dataclass
+class Flex:
+    """
+    A box of a flex layout.
+
+    Attributes:
+        children (list[Flex]): Boxes placed inside this one.
+        direction (str): "column" or "row", the main axis of the children.
+        grow (float): Share of the free space of the parent's main axis.
+        basis (float): Size along the parent's main axis before growing.
+        minSize (float): Smallest size along the parent's main axis.
+        maxSize (float): Largest size along the parent's main axis.
+        cross (float | None): Fixed size across the parent's main axis,
+            None fills the parent.
+        padding (float | tuple): All sides, or (top, right, bottom, left).
+        gap (float): Space between children.
+        align (str): "start", "center", "end" or "stretch", children
+            across the main axis.
+        justify (str): "start", "center", "end" or "between", children
+            along the main axis when there is space left.
+        controlType (ControlType): Type of the control made for this box.
+        name (str | None): Name of the control made for this box.
+        node (ElementXML | ElementTOSC | None): Control of this box, made
+            by applyFlex when missing.
+    """
+
+    children: list["Flex"] = field(default_factory=list)
+    direction: str = "column"
+    grow: float = 1.0
+    basis: float = 0.0
+    minSize: float = 0.0
+    maxSize: float = math.inf
+    cross: float | None = None
+    padding: float | tuple = 0.0
+    gap: float = 0.0
+    align: str = "stretch"
+    justify: str = "start"
+    controlType: ControlType = ControlType.GROUP
+    name: str | None = None
+    node: ElementXML | ElementTOSC | None = None
+
+
+def flatten(root: Flex) -> tuple[list[Flex], np.ndarray]:
+    """Boxes in breadth first order and the row of each one's parent.
+    Siblings are contiguous and parents come before their children."""
+    boxes = [root]
+    parents = [-1]
+    i = 0
+    while i < len(boxes):
+        for child in boxes[i].children:
+            boxes.append(child)
+            parents.append(i)
+        i += 1
+    return boxes, np.array(parents, dtype=np.int64)
+
+
+def paddings(boxes: list[Flex]) -> np.ndarray:
+    """(N,4) top, right, bottom, left padding of every box"""
+    P = np.array(
+        [b.padding if isinstance(b.padding, tuple) else (b.padding,) * 4 for b in boxes],
+        dtype=float,
+    )
+    return P.reshape(len(boxes), 4)
+
+
+def mainSizes(
+    basis: np.ndarray,
+    grow: np.ndarray,
+    low: np.ndarray,
+    high: np.ndarray,
+    group: np.ndarray,
+    space: np.ndarray,
+) -> np.ndarray:
+    """Sizes of siblings sharing space, for every group of siblings at once.
+
+    Each child gets basis + grow * share of the free space, clamped to its
+    min and max. As in CSS flexbox, if clamping grew the group in total its
+    min violators are frozen, if it shrunk the group its max violators,
+    else all of them, and the rest share again until no child is clamped.
+
+    Args:
+        basis, grow, low, high (np.ndarray): Per child.
+        group (np.ndarray): Index of each child's sibling group.
+        space (np.ndarray): Space of each group, without gaps.
+    """
+    n = len(space)
+    frozen = np.zeros(len(basis), dtype=bool)
+    size = np.zeros(len(basis))
+    for _ in range(len(basis) + 1):
+        fixed = np.bincount(group, np.where(frozen, size, basis), minlength=n)
+        shares = np.bincount(group, np.where(frozen, 0, grow), minlength=n)
+        free = space - fixed
+        share = np.divide(free, shares, out=np.zeros(n), where=shares > 0)
+        target = basis + grow * share[group]
+        clamped = np.clip(target, low, high)
+        size = np.where(frozen, size, clamped)
+        violation = np.where(frozen, 0.0, clamped - target)
+        total = np.bincount(group, violation, minlength=n)[group]
+        newly = np.select(
+            [total > 0, total < 0], [violation > 0, violation < 0], violation != 0
+        )
+        if not newly.any():
+            break
+        frozen |= newly
+    return size
+
+
+def flexFrames(root: Flex, frame: tuple) -> tuple[np.ndarray, list[Flex]]:
+    """Solve the frames of every box in the tree.
+
+    Args:
+        root (Flex): Top box.
+        frame (tuple): x,y,w,h of the top box.
+
+    Returns:
+        tuple[np.ndarray, list[Flex]]: (N,4) float frames relative to
+        each box's parent, and the N boxes in breadth first order.
+    """
+    boxes, parents = flatten(root)
+    return solveFrames(boxes, parents, frame), boxes
+
+
+def solveFrames(boxes: list[Flex], parents: np.ndarray, frame: tuple) -> np.ndarray:
+    """(N,4) frames of flattened boxes, see flexFrames"""
+    n = len(boxes)
+    F = np.zeros((n, 4))
+    F[0] = frame
+    if n == 1:
+        return F
+
+    P = paddings(boxes)
+    row = np.array([DIRECTIONS.index(b.direction) for b in boxes], dtype=bool)
+    gap = np.array([b.gap for b in boxes], dtype=float)
+    align = np.array([ALIGNS.index(b.align) for b in boxes])
+    justify = np.array([JUSTIFIES.index(b.justify) for b in boxes])
+    grow = np.array([b.grow for b in boxes], dtype=float)
+    basis = np.array([b.basis for b in boxes], dtype=float)
+    low = np.array([b.minSize for b in boxes], dtype=float)
+    high = np.array([b.maxSize for b in boxes], dtype=float)
+    cross = np.array([np.nan if b.cross is None else b.cross for b in boxes], dtype=float)
+
+    # Children only depend on the size of their parent, one level at a time
+    depth = np.zeros(n, dtype=np.int64)
+    for i in range(1, n):
+        depth[i] = depth[parents[i]] + 1
+    starts = np.searchsorted(depth, np.arange(1, depth[-1] + 2))
+
+    for start, end in zip(starts[:-1], starts[1:]):
+        c = np.arange(start, end)
+        p = parents[c]
+        owners, first, group, counts = np.unique(
+            p, return_index=True, return_inverse=True, return_counts=True
+        )
+        r = row[owners]
+        innerW = F[owners, 2] - P[owners, 1] - P[owners, 3]
+        innerH = F[owners, 3] - P[owners, 0] - P[owners, 2]
+        space = np.where(r, innerW, innerH)
+        available = np.where(r, innerH, innerW)
+        gaps = gap[owners] * (counts - 1)
+
+        size = mainSizes(basis[c], grow[c], low[c], high[c], group, space - gaps)
+
+        # Along the main axis
+        free = np.maximum(space - gaps - np.bincount(group, size, minlength=len(owners)), 0)
+        j = justify[owners]
+        between = np.where((j == 3) & (counts > 1), free / np.maximum(counts - 1, 1), 0)
+        offset = np.select([j == 1, j == 2], [free / 2, free], 0)
+        step = size + (gap[owners] + between)[group]
+        before = np.cumsum(step) - step
+        before -= before[first][group]
+        lead = np.where(r, P[owners, 3], P[owners, 0])
+        position = (lead + offset)[group] + before
+
+        # Across the main axis
+        room = available[group]
+        a = align[owners][group]
+        thickness = np.where(np.isnan(cross[c]), room, cross[c])
+        across = np.select([a == 1, a == 2], [(room - thickness) / 2, room - thickness], 0)
+        across += np.where(r, P[owners, 0], P[owners, 3])[group]
+
+        rows = r[group]
+        F[c, 0] = np.where(rows, position, across)
+        F[c, 1] = np.where(rows, across, position)
+        F[c, 2] = np.where(rows, size, thickness)
+        F[c, 3] = np.where(rows, thickness, size)
+    return F
+
+
+def applyFlex(parent: ElementTOSC, root: Flex) -> ElementTOSC:
+    """Solve root inside the frame of parent and write every frame back.
+
+    Boxes with a node get their frame updated in one setFrames call.
+    Boxes without one get a new control, made with one createChildren
+    per run of siblings of the same type, appended after the existing
+    children, and their node is set.
+
+    Args:
+        parent (ElementTOSC): Control of the root box.
+        root (Flex): Top box, its own frame is not changed.
+
+    Returns:
+        ElementTOSC: parent
+    """
+    root.node = parent
+    boxes, parents = flatten(root)
+    F = solveFrames(boxes, parents, parent.getFrame())
+
+    existing = [i for i in range(1, len(boxes)) if boxes[i].node is not None]
+    if existing:
+        setFrames([asNode(boxes[i].node) for i in existing], F[existing])
+
+    # Parents come first, so their node exists when their children are made
+    i = 1
+    while i < len(boxes):
+        if boxes[i].node is not None:
+            i += 1
+            continue
+        box = boxes[i]
+        run = [i]
+        while (
+            (k := run[-1] + 1) < len(boxes)
+            and parents[k] == parents[i]
+            and boxes[k].node is None
+            and boxes[k].controlType == box.controlType
+            and (boxes[k].name is None) == (box.name is None)
+        ):
+            run.append(k)
+        owner = boxes[parents[i]].node
+        owner = owner if isinstance(owner, ElementTOSC) else ElementTOSC(owner)
+        names = [boxes[k].name for k in run] if box.name is not None else None
+        nodes = owner.createChildren(
+            box.controlType, len(run), frames=F[run], names=names, sections=True
+        )
+        for k, node in zip(run, nodes):
+            boxes[k].node = node
+        i = run[-1] + 1
+    return parent
+
+
+def asNode(node: ElementXML | ElementTOSC) -> ElementXML:
+    """<node> of an ElementTOSC or the <node> itself"""
+    return node.node if isinstance(node, ElementTOSC) else node
@@ -26,11 +26,51 @@ The decorated function is also a good place to add Values and Messages
 to the children.
 
 All Layouts are currently built in top > bottom, left > right order.
+
+Every layout can also be planned from a frame instead of a parent, which
+computes the frames and colors of the whole nested tree without XML:
+
+    plan = mainLayout.plan((0, 0, 1600, 1600), ControlType.GROUP, (3, 3))
+    plan.frames, plan.colors  # (N,4) arrays
+    plan.apply(parent)  # build it later
+
+Plans are compiled to XML on their first apply, later applies copy it with
+new IDs and only add the data given to fill and names. cachedPlan keeps a
+plan on disk for the same layout call:
+
+    plan = cachedPlan("main.plan", mainLayout, frame, ControlType.GROUP, (3, 3))
+    plan.apply(parent, fill=lambda path, children: ...)
+
+Layouts remember their spec on the parent. Setting the parent's frame
+later with setFrame, update or arrays.setFrames recomputes the frames of
+its layouts and of the layouts nested in them, in place, see relayout.
+Frames set by hand on the laid out children are overwritten then.
+
+While planning, the children given to your function are PlanChild
+stand-ins. Only getFrame and getColor return values, other ElementTOSC
+calls are recorded and replayed by apply.
 """
 
+import hashlib
+import logging
+import os
+import pickle
 from copy import deepcopy
-from typing import Any, Callable
-from .tosc import ElementTOSC
+from dataclasses import dataclass, field
+from itertools import compress
+from types import CodeType
+from weakref import WeakKeyDictionary
+from typing import Any, Callable, Iterator, Sequence
+from .tosc import (
+    FRAME_HOOKS,
+    DocumentIndex,
+    ElementTOSC,
+    ElementView,
+    cloneElements,
+    createGroup,
+    gcPaused,
+)
+from .arrays import setFrames
 from .elements import (
     ControlElements,
     controlType,
@@ -40,6 +80,7 @@ from .controls import (
     Properties,
 )
 import numpy as np
+import xml.etree.ElementTree as ET
 
 
 """
@@ -65,6 +106,125 @@ def colorChecker(color: Any) -> tuple:
         raise TypeError(f"{color} type is not a valid color.")
 
 
+def columnFrames(frame: tuple, size: tuple) -> np.ndarray:
+    """Frames of cells stacked top to bottom with size ratios"""
+    H = frame[3] * (np.asarray(size) / np.sum(size))
+    Y = np.cumsum(np.concatenate(([0], H)))[:-1]
+    return np.stack((np.zeros(len(size)), Y, np.full(len(size), frame[2]), H), axis=1)
+
+
+def rowFrames(frame: tuple, size: tuple) -> np.ndarray:
+    """Frames of cells placed left to right with size ratios"""
+    W = frame[2] * (np.asarray(size) / np.sum(size))
+    X = np.cumsum(np.concatenate(([0], W)))[:-1]
+    return np.stack((X, np.zeros(len(size)), W, np.full(len(size), frame[3])), axis=1)
+
+
+def gridFrames(frame: tuple, size: tuple) -> np.ndarray:
+    """Frames of the cells of a size[0] x size[1] grid inside frame,
+    columns first, as a (N,4) array of x,y,w,h"""
+    w = frame[2] / size[0]
+    h = frame[3] / size[1]
+    X, Y = np.meshgrid(np.arange(size[0]) * w, np.arange(size[1]) * h, indexing="ij")
+    return np.stack(
+        (X.ravel(), Y.ravel(), np.full(X.size, w), np.full(X.size, h)), axis=1
+    )
+
+
+def gridPositions(size: tuple) -> tuple[np.ndarray, np.ndarray]:
+    """Normalized u,v (0 to 1) of every cell, in the order of gridFrames"""
+    U, V = np.meshgrid(
+        np.linspace(0, 1, size[0]), np.linspace(0, 1, size[1]), indexing="ij"
+    )
+    return U.ravel(), V.ravel()
+
+
+def gradient(t: np.ndarray, colors: Any, stops: Any = None) -> np.ndarray:
+    """Colors at positions t of a gradient through colors.
+
+    Args:
+        t (np.ndarray): Positions, clipped to the first and last stop.
+        colors: (K,4) colors.
+        stops (optional): K increasing positions, evenly spaced from 0 to 1
+            by default.
+
+    Returns:
+        np.ndarray: t.shape + (4,) colors.
+    """
+    C = np.asarray(colors, dtype=float)
+    t = np.asarray(t, dtype=float)
+    if len(C) == 1:
+        return np.broadcast_to(C[0], t.shape + C.shape[1:]).copy()
+    S = np.linspace(0, 1, len(C)) if stops is None else np.asarray(stops, dtype=float)
+    if S.shape != (len(C),):
+        raise ValueError(f"Expected {len(C)} stops, got {S.shape}.")
+    t = np.clip(t, S[0], S[-1])
+    k = np.clip(np.searchsorted(S, t, side="right") - 1, 0, len(S) - 2)
+    span = S[k + 1] - S[k]
+    f = np.divide(t - S[k], span, out=np.zeros_like(t), where=span > 0)
+    return C[k] + (C[k + 1] - C[k]) * f[..., None]
+
+
+def colorRamp(colors: Any, num: int, stops: Any = None) -> np.ndarray:
+    """num colors evenly spread over a gradient, two colors without stops
+    are the same as np.linspace"""
+    if len(colors) == 2 and stops is None:
+        return np.linspace(colors[0], colors[1], num)
+    return gradient(np.linspace(0, 1, num), colors, stops)
+
+
+def bilinearGradient(u: np.ndarray, v: np.ndarray, corners: Any) -> np.ndarray:
+    """Colors at u,v between four corners: top left, top right,
+    bottom left and bottom right"""
+    W = np.stack(((1 - u) * (1 - v), u * (1 - v), (1 - u) * v, u * v), axis=-1)
+    return W @ np.asarray(corners, dtype=float)
+
+
+def radialGradient(
+    u: np.ndarray,
+    v: np.ndarray,
+    colors: Any,
+    stops: Any = None,
+    center: tuple = (0.5, 0.5),
+) -> np.ndarray:
+    """Colors at u,v of a gradient from center to the farthest position"""
+    d = np.hypot(u - center[0], v - center[1])
+    if d.size and (far := d.max()) > 0:
+        d = d / far
+    return gradient(d, colors, stops)
+
+
+def gridColors(
+    size: tuple, colors: Any, colorStyle: int | str = 0, stops: Any = None
+) -> np.ndarray:
+    """Colors of the cells of a grid, in the order of gridFrames.
+    See grid for the colorStyle values."""
+    n = size[0] * size[1]
+    if colorStyle == "bilinear":
+        if len(colors) != 4:
+            raise ValueError(f"bilinear needs 4 colors, got {len(colors)}.")
+        return bilinearGradient(*gridPositions(size), colors)
+    if colorStyle == "radial":
+        return radialGradient(*gridPositions(size), colors, stops)
+    if isinstance(colorStyle, str):
+        raise ValueError(f"{colorStyle} is not a valid colorStyle.")
+    if colorStyle == 0:  # horizontal
+        return np.repeat(colorRamp(colors, size[0], stops), size[1], axis=0)
+    if colorStyle == 1:  # vertical
+        return np.tile(colorRamp(colors, size[1], stops), (size[0], 1))
+    if colorStyle == 2:  # sequential
+        return colorRamp(colors, n, stops)
+    if colorStyle == 3:  # sequential inverted
+        C = colorRamp(colors, n, stops)
+        return C.reshape(size[1], size[0], 4).transpose(1, 0, 2).reshape(n, 4)
+    if colorStyle >= 4:  # centered / mirrored around cell colorStyle
+        C = colorRamp(colors, n, stops)
+        m = np.arange(n)
+        center = min(colorStyle, n)
+        return C[np.where(m < center, (center - m) % max(n, 1), m - center)]
+    raise ValueError(f"{colorStyle} is not a valid colorStyle.")
+
+
 """
 
 LAYOUT FUNCTIONS
@@ -72,28 +232,463 @@ LAYOUT FUNCTIONS
 """
 
 
+class LayoutChildren(Sequence):
+    """The children created by a Layout, wrapped as ElementTOSC only when
+    they are accessed. Wrappers are the cached ones of the parent."""
+
+    def __init__(self, parent: ElementTOSC, nodes: list):
+        self.parent = parent
+        self.nodes = nodes
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __getitem__(self, item) -> ElementTOSC | list[ElementTOSC]:
+        if isinstance(item, slice):
+            return [self.parent.wrapChild(e) for e in self.nodes[item]]
+        return self.parent.wrapChild(self.nodes[item])
+
+
 def Layout(
     layout: ElementTOSC,
     controlT: controlType,
     F: np.ndarray,
     C: np.ndarray,
-    func: Callable[[list[ElementTOSC]], Properties],
+    func: Callable[[Sequence[ElementTOSC]], Properties],
+    spec: "LayoutSpec | None" = None,
 ):
-    """Basic process to append multiple properties to a layout of controls"""
+    """Basic process to append multiple properties to a layout of controls.
+    All children are built in one step from the F and C arrays. With the
+    spec that made them, the layout follows later frames of its parent,
+    see relayout."""
 
-    children = [ElementTOSC(layout.createChild(controlT)) for i in range(F.shape[0])]
-    for g, f, c in zip(children, F, C):
-        g.setFrame(f.astype(int))
-        g.setColor(c)
+    nodes = layout.createChildren(
+        controlT, F.shape[0], frames=F[:, :4], colors=C, sections=True
+    )
+    if spec is not None:
+        recordLayout(layout.node, spec, nodes)
 
     # Add extra properties to the parent, optional return
-    properties: Properties = func(children)
+    properties: Properties = func(LayoutChildren(layout, nodes))
     if properties is not None:
         [layout.createProperty(p) for p in properties]
 
     return layout
 
 
+def columnGeometry(frame: tuple, size: tuple, colors: tuple):
+    """Frames and colors of a column layout"""
+    colors = tuple(colorChecker(i) for i in colors)  # makes sure is normalized
+    return columnFrames(frame, size), colorRamp(colors, len(size))
+
+
+def rowGeometry(frame: tuple, size: tuple, colors: tuple):
+    """Frames and colors of a row layout"""
+    colors = tuple(colorChecker(i) for i in colors)  # makes sure is normalized
+    return rowFrames(frame, size), colorRamp(colors, len(size))
+
+
+def gridGeometry(
+    frame: tuple,
+    size: tuple,
+    colors: tuple,
+    colorStyle: int | str = 0,
+    stops: tuple | None = None,
+):
+    """Frames and colors of a grid layout"""
+    colors = tuple(colorChecker(i) for i in colors)
+    return gridFrames(frame, size), gridColors(size, colors, colorStyle, stops)
+
+
+GEOMETRY: dict[str, Callable[..., tuple[np.ndarray, np.ndarray]]] = {
+    "column": columnGeometry,
+    "row": rowGeometry,
+    "grid": gridGeometry,
+}
+"""Layout kind -> function of (frame, size, colors, **style) to (F, C)."""
+
+FRAMES: dict[str, Callable[[tuple, tuple], np.ndarray]] = {
+    "column": columnFrames,
+    "row": rowFrames,
+    "grid": gridFrames,
+}
+"""Layout kind -> function of (frame, size) to F, without colors."""
+
+
+@dataclass
+class LayoutSpec:
+    """Arguments of a layout call, everything but the parent frame"""
+
+    kind: str
+    controlType: ControlType
+    size: tuple
+    colors: tuple
+    style: dict = field(default_factory=dict)
+
+    def geometry(self, frame: tuple) -> tuple[np.ndarray, np.ndarray]:
+        """(N,4) frames and (N,4) colors of the children inside frame"""
+        return GEOMETRY[self.kind](frame, self.size, self.colors, **self.style)
+
+    def frames(self, frame: tuple) -> np.ndarray:
+        """(N,4) frames of the children inside frame"""
+        return FRAMES[self.kind](frame, self.size)
+
+
+PLAN_HEADER = b"tosclib LayoutPlan 1\n"
+"""First line of a saved plan, changed when the pickled format changes."""
+
+
+@dataclass
+class LayoutPlan:
+    """
+    Geometry of a layout computed without touching any ElementTOSC.
+
+    Attributes:
+        spec (LayoutSpec): The layout call.
+        frame (tuple): Frame of the parent.
+        frames (np.ndarray): (N,4) frames of the children.
+        colors (np.ndarray): (N,4) colors of the children.
+        properties (list): Properties returned by the layout function.
+        calls (list): In order, (child index, nested LayoutPlan) or
+            (child index, method name, args, kwargs) for each ElementTOSC
+            call made on the children, replayed by apply.
+        key (str): Call that made the plan, see cachedPlan.
+        built (ET.Element): <children> made by compile, saved with the plan.
+        placed (list): Nodes of built made by each layout, in iterPlans
+            order, so apply finds the copies of every nested layout.
+    """
+
+    spec: LayoutSpec
+    frame: tuple
+    frames: np.ndarray
+    colors: np.ndarray
+    properties: list = field(default_factory=list)
+    calls: list = field(default_factory=list)
+    key: str = ""
+    built: ET.Element | None = field(default=None, repr=False, compare=False)
+    placed: list = field(default_factory=list, repr=False, compare=False)
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def iterPlans(self, path: tuple = ()) -> Iterator[tuple[tuple, "LayoutPlan"]]:
+        """This plan and all nested ones, with the child indices that
+        lead to them"""
+        yield path, self
+        for call in self.calls:
+            if isinstance(call[1], LayoutPlan):
+                yield from call[1].iterPlans(path + (call[0],))
+
+    def build(self, parent: ElementTOSC, record: bool = True,
+              placed: dict | None = None) -> ElementTOSC:
+        """Create the planned children in parent, one createChildren per
+        layout, then replay the calls and add the properties. Layouts are
+        recorded for relayout unless record is False. placed collects the
+        nodes of every layout by id of its plan."""
+        nodes = parent.createChildren(
+            self.spec.controlType, len(self), frames=self.frames,
+            colors=self.colors, sections=True,
+        )
+        if record:
+            recordLayout(parent.node, self.spec, nodes)
+        if placed is not None:
+            placed[id(self)] = nodes
+        for call in self.calls:
+            child = parent.wrapChild(nodes[call[0]])
+            if isinstance(call[1], LayoutPlan):
+                call[1].build(child, record, placed)
+            else:
+                getattr(child, call[1])(*call[2], **call[3])
+        for p in self.properties:
+            parent.createProperty(p)
+        return parent
+
+    def compile(self) -> "LayoutPlan":
+        """Build the children once into a detached node, which apply
+        copies. Call it again after changing the plan."""
+        scratch = ElementTOSC(createGroup())
+        placed: dict[int, list] = {}
+        nodes = list(self.build(scratch, record=False, placed=placed).children)
+        self.built = ET.Element(ControlElements.CHILDREN.value)
+        self.built.extend(nodes)
+        self.placed = [placed[id(plan)] for _, plan in self.iterPlans()]
+        return self
+
+    def apply(
+        self,
+        parent: ElementTOSC,
+        fill: Callable[[tuple, LayoutChildren], None] | None = None,
+        names: dict[tuple, Sequence[str]] | None = None,
+    ) -> ElementTOSC:
+        """Add a copy of the compiled children to parent, with new IDs.
+        The geometry is reused as is, new data goes in with names and fill.
+
+        Args:
+            parent (ElementTOSC): Parent of the top layout.
+            fill (optional): Called as fill(path, children) for every layout
+                once the whole tree exists, to add scripts, messages etc.
+            names (optional): Names of the children by layout path, see
+                iterPlans.
+        """
+        if self.built is None:
+            self.compile()
+        nodes = cloneElements(list(self.built), newIds=True)
+        # Copies have the same structure, so each built node maps to its copy
+        copies = {
+            e: copy
+            for top, topCopy in zip(self.built, nodes)
+            for e, copy in zip(top.iter(ControlElements.NODE.value),
+                               topCopy.iter(ControlElements.NODE.value))
+        }
+        placed = {
+            id(plan): [copies[e] for e in built]
+            for (_, plan), built in zip(self.iterPlans(), self.placed)
+        }
+        parent.children.extend(nodes)
+        DocumentIndex.attached(parent.node, *nodes)
+        attachPlan(self, parent, placed, (), fill, names or {})
+        for p in self.properties:
+            parent.createProperty(p)
+        return parent
+
+    def save(self, outputPath: str) -> bool:
+        """Pickle the plan to a file, after a PLAN_HEADER line"""
+        with open(outputPath, "wb") as file:
+            file.write(PLAN_HEADER)
+            pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+        return True
+
+    @classmethod
+    def fromFile(cls, inputPath: str) -> "LayoutPlan":
+        """Load a plan saved with save.
+
+        The file is unpickled, which can run arbitrary code, so only load
+        plans you saved yourself. Files of another format version raise
+        TypeError before anything is unpickled.
+        """
+        with open(inputPath, "rb") as file:
+            if file.readline() != PLAN_HEADER:
+                raise TypeError(f"{inputPath} is not a plan of this version.")
+            plan = pickle.load(file)
+        if not isinstance(plan, cls):
+            raise TypeError(f"{inputPath} does not hold a {cls.__name__}.")
+        return plan
+
+
+def attachPlan(
+    plan: LayoutPlan,
+    parent: ElementTOSC,
+    placed: dict[int, list],
+    path: tuple,
+    fill: Callable | None,
+    names: dict,
+):
+    """Record a plan applied to parent for relayout, write its names and
+    call fill, then do the same for its nested plans. placed holds the
+    copied nodes of every plan by id of the plan."""
+    nodes = placed[id(plan)]
+    recordLayout(parent.node, plan.spec, nodes)
+    if path in names:
+        for node, name in zip(nodes, names[path]):
+            parent.wrapChild(node).setName(name)
+    if fill is not None:
+        fill(path, LayoutChildren(parent, nodes))
+    for call in plan.calls:
+        if isinstance(call[1], LayoutPlan):
+            child = parent.wrapChild(nodes[call[0]])
+            attachPlan(call[1], child, placed, path + (call[0],), fill, names)
+
+
+class PlanChild:
+    """Stand-in for a child while a layout is planned. Nested layouts
+    called on it are planned too. getFrame and getColor return the planned
+    values, other ElementTOSC methods are recorded for apply and return
+    None."""
+
+    def __init__(self, frame: tuple, color: tuple = (), plan: LayoutPlan | None = None,
+                 index: int = 0):
+        self.frame = frame
+        self.color = color
+        self.plan = plan
+        self.index = index
+        self.layout: LayoutPlan | None = None
+
+    def getFrame(self) -> tuple[int, ...]:
+        return self.frame
+
+    def getColor(self) -> tuple[float, ...]:
+        return self.color
+
+    def nested(self, layout: LayoutPlan):
+        """Record a nested layout planned on this child"""
+        self.layout = layout
+        if self.plan is not None:
+            self.plan.calls.append((self.index, layout))
+
+    def __getattr__(self, name: str):
+        if not callable(getattr(ElementTOSC, name, None)):
+            raise AttributeError(f"ElementTOSC has no method {name}")
+
+        def record(*args, **kwargs):
+            if self.plan is not None:
+                self.plan.calls.append((self.index, name, args, kwargs))
+
+        return record
+
+
+def planLayout(spec: LayoutSpec, frame: tuple, func: Callable) -> LayoutPlan:
+    """Compute a layout and the layouts nested by func, without XML"""
+    F, C = spec.geometry(frame)
+    plan = LayoutPlan(spec, tuple(frame), F[:, :4], C)
+    # Nested layouts see the frames as written, truncated to int
+    frames = F[:, :4].astype(int).tolist()
+    children = [
+        PlanChild(tuple(f), tuple(c), plan, i)
+        for i, (f, c) in enumerate(zip(frames, C.tolist()))
+    ]
+    properties = func(children)
+    if properties is not None:
+        plan.properties = list(properties)
+    return plan
+
+
+def runLayout(spec: LayoutSpec, parent: ElementTOSC | PlanChild, func: Callable):
+    """Build a layout in parent, or plan it if parent is a PlanChild"""
+    if isinstance(parent, PlanChild):
+        parent.nested(planLayout(spec, parent.getFrame(), func))
+        return parent
+    if (frame := parent.getFrame()) is None:
+        raise ValueError(f"{parent} has no frame.")
+    F, C = spec.geometry(frame)
+    return Layout(parent, spec.controlType, F, C, func, spec)
+
+
+RECORDS: WeakKeyDictionary = WeakKeyDictionary()
+"""<node> -> [(LayoutSpec, child nodes)] of the layouts built in it."""
+
+
+def recordLayout(parent: ET.Element, spec: LayoutSpec, nodes: list):
+    """Remember the layout of nodes in parent, a later setFrame on parent
+    lays them out again, see relayout"""
+    records = RECORDS.setdefault(parent, [])
+    if records:
+        # Drop layouts whose children were all removed
+        section = parent.find(ControlElements.CHILDREN.value)
+        attached = set(section) if section is not None else set()
+        records[:] = [r for r in records if any(c in attached for c in r[1])]
+    records.append((spec, nodes))
+    FRAME_HOOKS[parent] = relayout
+
+
+@gcPaused()
+def relayout(parent: ElementTOSC | ET.Element, frame: tuple | None = None) -> int:
+    """Recompute the frames of the recorded layouts in parent and in the
+    layouts nested below them, and write them all in one setFrames call.
+    Colors, properties and children added by hand are left as they are,
+    but frames set by hand on the laid out children are overwritten.
+    The parent is only read, no section is added to it.
+
+    Args:
+        parent (ElementTOSC | ET.Element): Control that holds layouts.
+        frame (tuple, optional): Its frame, read from it by default.
+
+    Returns:
+        int: Amount of frames written.
+    """
+    node = parent.node if isinstance(parent, ElementTOSC) else parent
+    if frame is None:
+        frame = ElementView(node).getFrame()
+    nodes: list[ET.Element] = []
+    blocks: list[np.ndarray] = []
+    # Nested layouts often repeat the same spec inside the same frame
+    memo: dict[tuple[int, tuple], np.ndarray] = {}
+    stack = [(node, tuple(frame))]
+    while stack:
+        e, f = stack.pop()
+        attached = None
+        for spec, children in RECORDS.get(e, ()):
+            if (F := memo.get((id(spec), f))) is None:
+                F = memo[(id(spec), f)] = spec.frames(f).astype(int)
+            if attached is None:
+                section = e.find(ControlElements.CHILDREN.value)
+                attached = set(section) if section is not None else set()
+            keep = np.fromiter((c in attached for c in children), bool, len(children))
+            kept = list(compress(children, keep))
+            nodes.extend(kept)
+            blocks.append(F[keep])
+            stack.extend(
+                (c, tuple(row)) for c, row in zip(kept, F[keep].tolist()) if c in RECORDS
+            )
+    if nodes:
+        # Nested layouts were already laid out above, skip their hooks
+        setFrames(nodes, np.concatenate(blocks), hooks=False)
+    return len(nodes)
+
+
+def planner(wrapper: Callable, func: Callable) -> Callable:
+    """Add wrapper.plan(frame, *args, **kwargs), the same call with a
+    frame instead of a parent, which returns a LayoutPlan. The decorated
+    function is kept as wrapper.func."""
+
+    def plan(frame: tuple, *args, **kwargs) -> LayoutPlan:
+        root = PlanChild(tuple(frame))
+        wrapper(root, *args, **kwargs)
+        root.layout.key = planKey(wrapper, frame, args, kwargs)
+        return root.layout
+
+    wrapper.func = func
+    wrapper.plan = plan
+    return wrapper
+
+
+def planKey(layout: Callable, frame: tuple, args: tuple, kwargs: dict) -> str:
+    """Digest of a plan call: the decorated function's name and code, with
+    its constants and global names, and the arguments. Nested layout
+    functions are not part of it."""
+    func = getattr(layout, "func", layout)
+    digest = hashlib.sha256()
+    digest.update(f"{func.__module__}.{func.__qualname__}".encode())
+    if (code := getattr(func, "__code__", None)) is not None:
+        hashCode(digest, code)
+    digest.update(repr((tuple(frame), args, sorted(kwargs.items()))).encode())
+    return digest.hexdigest()
+
+
+def hashCode(digest: Any, code: CodeType):
+    """Add the bytecode, names and constants of code to digest, and those
+    of the functions defined inside it"""
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            hashCode(digest, const)
+        elif isinstance(const, frozenset):
+            digest.update(repr(sorted(map(repr, const))).encode())
+        else:
+            digest.update(repr(const).encode())
+
+
+def cachedPlan(path: str, layout: Callable, frame: tuple, *args, **kwargs) -> LayoutPlan:
+    """layout.plan(frame, *args, **kwargs), loaded from path if the same
+    call saved it there, otherwise planned and saved to path.
+
+    Delete the file when a nested layout function changes, only the top
+    function is part of the key. The file is trusted input: it is
+    unpickled, see LayoutPlan.fromFile, so keep it out of shared or
+    downloaded folders.
+    """
+    key = planKey(layout, frame, args, kwargs)
+    if os.path.exists(path):
+        try:
+            if (plan := LayoutPlan.fromFile(path)).key == key:
+                return plan
+        except (pickle.UnpicklingError, EOFError, TypeError, AttributeError):
+            logging.warning(f"Replacing unreadable plan {path}")
+    plan = layout.plan(frame, *args, **kwargs).compile()
+    plan.save(path)
+    return plan
+
+
 def column(func):
     """Create a column of groups with a color gradient.
 
@@ -111,18 +706,10 @@ def column(func):
         colors: tuple = (
             (0.25, 0.25, 0.25, 1.0), (0.25, 0.25, 0.25, 1.0)),
     ):
-        colors = tuple(colorChecker(i) for i in colors)  # makes sure is normalized
-        frame = parent.getFrame()
+        spec = LayoutSpec("column", controlType, tuple(size), tuple(colors))
+        return runLayout(spec, parent, func)
 
-        H = frame[3] * (np.asarray(size) / np.sum(size))
-        W = [frame[2] for i in size]
-        Y = np.cumsum(np.concatenate(([0], H)))[:-1]
-        X = np.resize((0), len(size))
-        F = np.asarray((X, Y, W, H, X)).T
-        C = np.linspace(colors[0], colors[1], len(size))
-        return Layout(parent, controlType, F, C, func)
-
-    return wrapper
+    return planner(wrapper, func)
 
 
 def row(func):
@@ -142,18 +729,10 @@ def row(func):
         frame: tuple = (0, 0, 1600, 640),
         colors: tuple | str = ((0.25, 0.25, 0.25, 1.0), (0.25, 0.25, 0.25, 1.0)),
     ):
-        colors = tuple(colorChecker(i) for i in colors)  # makes sure is normalized
-        frame = parent.getFrame()
-
-        H = np.resize(frame[3], len(size)) # type: ignore
-        W = frame[2] * (np.asarray(size) / np.sum(size))
-        Y = np.resize((0), len(size))
-        X = np.cumsum(np.concatenate(([0], W)))[:-1]
-        F = np.asarray((X, Y, W, H, X)).T
-        C = np.linspace(colors[0], colors[1], len(size))
-        return Layout(parent, controlType, F, C, func)
+        spec = LayoutSpec("row", controlType, tuple(size), tuple(colors))
+        return runLayout(spec, parent, func)
 
-    return wrapper
+    return planner(wrapper, func)
 
 
 def grid(func):
@@ -163,7 +742,7 @@ def grid(func):
         parent: The Control that becomes the layout.
         controlType: The Control type of the generated children.
         size: the row x column size in tuple, ej (4,4) or (5, 3), etc
-        colors: tuple of two colors gradient, see colorStyle
+        colors: tuple of two or more colors gradient, see colorStyle
         colorStyle:
             Select a gradient style.
             0: horizontal gradient
@@ -171,6 +750,10 @@ def grid(func):
             2: sequential gradient 1
             3: sequential gradient 2
             >= 4: centered/mirrored gradient, moves position with number
+            "bilinear": 4 colors at the top left, top right, bottom left
+                and bottom right corners
+            "radial": from the center of the grid to its corners
+        stops: position from 0 to 1 of each color, evenly spaced by default
 
     """
 
@@ -182,53 +765,14 @@ def grid(func):
             (0.25, 0.25, 0.25, 1.0),
             (0.5, 0.5, 0.5, 1.0),
         ),
-        colorStyle: int = 0,
+        colorStyle: int | str = 0,
+        stops: tuple | None = None,
     ):
 
-        if (frame:=parent.getFrame()) is None:
-            raise ValueError(f"{parent} has no frame.")
-
-        colors = tuple(colorChecker(i) for i in colors)
-
-        w = frame[2] / size[0]
-        h = frame[3] / size[1]
-        M = np.asarray(
-            tuple(
-                (row, column)
-                for row in np.arange(stop=frame[2], step=w) # type: ignore
-                for column in np.arange(stop=frame[3], step=h) # type: ignore
-            )
-        ).T
-
-        X = M[0]
-        Y = M[1]
-        W = np.repeat(w, X.size)
-        H = np.repeat(h, Y.size)
-        F = np.asarray((X, Y, W, H, X)).T
-
-        # TO DO : Optimize
-        if colorStyle == 0:  # horizontal
-            C = np.linspace(colors[0], colors[1], size[0])
-            C = np.repeat(C.T, size[1]).T.reshape(4, size[0] * size[1]).T
-        elif colorStyle == 1:  # vertical
-            C = np.linspace(colors[0], colors[1], size[1])
-            C = np.asarray(np.resize(C, size[0] * C.size)).reshape(size[0] * size[1], 4)
-        elif colorStyle == 2:  # sequential
-            C = np.linspace(colors[0], colors[1], size[0] * size[1])
-        elif colorStyle == 3:  # sequential inverted
-            C = np.linspace(colors[0], colors[1], size[0] * size[1])
-            C = np.asarray([C[i :: size[0]] for i in range(size[0])]).reshape(
-                size[0] * size[1], 4
-            )
-        elif colorStyle >= 4:  # centered / mirrored
-            C = np.linspace(colors[0], colors[1], size[0] * size[1])
-            C = np.roll(C, colorStyle * 4)
-            C[0:colorStyle] = np.flip(
-                np.roll(C, (-1 - colorStyle) * 4)[0:colorStyle], axis=0
-            )
-        else:
-            raise ValueError(f"{colorStyle} is not a valid colorStyle.")
-
-        return Layout(parent, controlType, F, C, func)
+        spec = LayoutSpec(
+            "grid", controlType, tuple(size), tuple(colors),
+            {"colorStyle": colorStyle, "stops": stops},
+        )
+        return runLayout(spec, parent, func)
 
-    return wrapper
+    return planner(wrapper, func)
@@ -0,0 +1,411 @@
+"""
+Columnar in-memory copy of a .tosc document.
+
+Every node is a row. IDs, types, parents, names, frames and colors are
+NumPy columns. The rest of each node (its other properties, values and
+messages) is kept as a text template, and nodes with the same structure
+share one interned template, so a document of many similar controls costs
+a few hundred bytes per node instead of a few hundred Elements.
+
+Rows are in document order, so the subtree of row i is the slice
+i:ends[i]. The lexml is only materialized on write. Params, section order
+and whitespace are written as they were read, so an unedited store writes
+the same text as ElementTree does for the loaded file.
+
+    store = DocumentStore.load("big.tosc")
+    rows = store.find("fader")
+    store.frames[rows, 1] += 10
+    store.write("big.tosc")
+"""
+
+import math
+import sys
+from typing import Iterator
+from .elements import ControlElements, ControlType
+from .tosc import (
+    CHUNK_SIZE,
+    ElementXML,
+    escapeAttrib,
+    escapeText,
+    readChunks,
+    writeText,
+)
+
+import numpy as np
+import xml.etree.ElementTree as ET
+
+
+TYPES: tuple[str, ...] = tuple(t.value for t in ControlType)
+"""Node types by the codes stored in DocumentStore.types."""
+TYPE_CODES: dict[str, int] = {t: i for i, t in enumerate(TYPES)}
+
+ID_TOKEN = "\ue000"
+NAME_TOKEN = "\ue001"
+FRAME_TOKENS = ("\ue002", "\ue003", "\ue004", "\ue005")
+COLOR_TOKENS = ("\ue006", "\ue007", "\ue008", "\ue009")
+CHILDREN_TOKEN = "\ue00a"
+"""Private use characters that mark the columns inside a template, and
+where the child nodes go."""
+
+NODE = ControlElements.NODE.value
+CHILDREN = ControlElements.CHILDREN.value
+PROPERTIES = ControlElements.PROPERTIES.value
+
+TOKEN_FIELDS = {
+    t: "{%d}" % i
+    for i, t in enumerate((ID_TOKEN, NAME_TOKEN, *FRAME_TOKENS, *COLOR_TOKENS))
+}
+
+
+def numberText(v: float) -> str:
+    """Text of an edited frame or color param. Integral values are written
+    without a decimal point, -0 included. Params that were not edited keep
+    the text they were read with, see DocumentStore.paramTexts."""
+    if not v.is_integer():
+        return repr(v)
+    if v == 0 and math.copysign(1.0, v) < 0:
+        return "-0"
+    return repr(int(v))
+
+
+def attribText(e: ElementXML) -> str:
+    """Attributes of e as written in its start tag"""
+    return "".join(f' {k}="{escapeAttrib(v)}"' for k, v in e.items()) if e.attrib else ""
+
+
+def elementText(e: ElementXML, parts: list[str]) -> list[str]:
+    """Append the text of e, its subtree and its tail to parts, the same
+    as ET.tostring without namespace handling"""
+    tag = e.tag
+    if not (e.text or len(e)):
+        parts.append(f"<{tag}{attribText(e)} />")
+    else:
+        parts.append(f"<{tag}{attribText(e)}>")
+        if e.text:
+            parts.append(escapeText(e.text))
+        for child in e:
+            # Leaves without attributes or tails are most of a document
+            if child.attrib or len(child) or child.tail:
+                elementText(child, parts)
+            elif child.text:
+                parts.append(f"<{child.tag}>{escapeText(child.text)}</{child.tag}>")
+            else:
+                parts.append(f"<{child.tag} />")
+        parts.append(f"</{tag}>")
+    if e.tail:
+        parts.append(escapeText(e.tail))
+    return parts
+
+
+def isPlain(e: ElementXML) -> bool:
+    """True if e is only a start tag, a text and an end tag"""
+    return not (e.attrib or len(e))
+
+
+def nodeTemplate(node: ElementXML) -> tuple[str, str | None, list, list]:
+    """Template of a <node> without its child nodes and its tail, plus the
+    columns taken out of it. The node is left as it was.
+
+    Sections keep their order, texts and tails. A <children> that holds
+    nodes is written around CHILDREN_TOKEN, the child nodes go there.
+
+    Returns:
+        tuple: template, name, frame texts, color texts. Missing columns
+        are None or empty lists and stay literal in the template, as do
+        frames and colors with empty params.
+    """
+    name, frame, color = None, [], []
+    replaced: list[tuple[ElementXML, str | None]] = []
+    properties = node.find(PROPERTIES)
+    for property in properties if properties is not None else ():
+        key = property.findtext("key")
+        if (value := property.find("value")) is None:
+            continue
+        if key == "name" and isPlain(value):
+            name = value.text or ""
+            replaced.append((value, value.text))
+            value.text = NAME_TOKEN
+        elif key in ("frame", "color"):
+            params = ("x", "y", "w", "h") if key == "frame" else ("r", "g", "b", "a")
+            tokens = FRAME_TOKENS if key == "frame" else COLOR_TOKENS
+            elements = [value.find(p) for p in params]
+            if None in elements or not all(e.text and isPlain(e) for e in elements):
+                continue
+            texts = [sys.intern(e.text) for e in elements]
+            if key == "frame":
+                frame = texts
+            else:
+                color = texts
+            for e, token in zip(elements, tokens):
+                replaced.append((e, e.text))
+                e.text = token
+
+    attrib = "".join(
+        f' {k}="{ID_TOKEN if k == "ID" else escapeAttrib(v)}"' for k, v in node.items()
+    )
+    parts = [f"<node{attrib}>"]
+    if node.text:
+        parts.append(escapeText(node.text))
+    for section in node:
+        if section.tag == CHILDREN and len(section):
+            parts.append(f"<{CHILDREN}{attribText(section)}>")
+            if section.text:
+                parts.append(escapeText(section.text))
+            parts.append(f"{CHILDREN_TOKEN}</{CHILDREN}>")
+            if section.tail:
+                parts.append(escapeText(section.tail))
+        else:
+            elementText(section, parts)
+    parts.append("</node>")
+    for e, original in replaced:
+        e.text = original
+
+    text = "".join(parts).replace("{", "{{").replace("}", "}}")
+    # An empty name is written as <value />, like ElementTree does
+    text = text.replace(f"<value>{NAME_TOKEN}</value>", TOKEN_FIELDS[NAME_TOKEN])
+    for token, field in TOKEN_FIELDS.items():
+        text = text.replace(token, field)
+    return text, name, frame, color
+
+
+class DocumentStore:
+    """
+    Columnar copy of a document, see the module docstring.
+
+    Attributes:
+        ids (np.ndarray): Node IDs.
+        types (np.ndarray): int8 codes into TYPES.
+        parents (np.ndarray): int32 row of the parent node, -1 at the top.
+        ends (np.ndarray): int32 row after the last descendant.
+        names (np.ndarray): Interned names, None when missing.
+        frames (np.ndarray): (N,4) float x,y,w,h.
+        colors (np.ndarray): (N,4) float r,g,b,a.
+        hasFrame (np.ndarray): Rows whose template holds a frame.
+        hasColor (np.ndarray): Rows whose template holds a color.
+        hasChildren (np.ndarray): Rows with a <children> element.
+        templates (list[str]): Interned templates.
+        templateIds (np.ndarray): int32 index into templates.
+        tails (np.ndarray): Text after each </node>, None when missing.
+        frameTexts (np.ndarray): (N,4) texts the frames were read with.
+        colorTexts (np.ndarray): (N,4) texts the colors were read with.
+        rootAttrib (dict): Attributes of <lexml>.
+        rootText (str | None): Text before the first top node.
+    """
+
+    def __init__(self):
+        self.ids = np.array([], dtype=str)
+        self.types = np.array([], dtype=np.int8)
+        self.parents = np.array([], dtype=np.int32)
+        self.ends = np.array([], dtype=np.int32)
+        self.names = np.array([], dtype=object)
+        self.frames = np.zeros((0, 4))
+        self.colors = np.zeros((0, 4))
+        self.hasFrame = np.array([], dtype=bool)
+        self.hasColor = np.array([], dtype=bool)
+        self.hasChildren = np.array([], dtype=bool)
+        self.templates: list[str] = []
+        self.templateIds = np.array([], dtype=np.int32)
+        self.tails = np.array([], dtype=object)
+        self.frameTexts = np.zeros((0, 4), dtype=object)
+        self.colorTexts = np.zeros((0, 4), dtype=object)
+        self.rootAttrib: dict[str, str] = {"version": "3"}
+        self.rootText: str | None = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, inputPath: str, chunkSize: int = CHUNK_SIZE) -> "DocumentStore":
+        """Read a .tosc file into columns while it is parsed. Each <node>
+        is stored when it ends and cleared after, keeping its tail, which
+        is stored with its parent."""
+        builder = StoreBuilder()
+        parser = ET.XMLPullParser(events=("end",))
+        root = None
+        for chunk in readChunks(inputPath, chunkSize):
+            parser.feed(chunk)
+            for _, root in parser.read_events():
+                if root.tag == NODE:
+                    builder.add(root)
+                    tail = root.tail
+                    root.clear()
+                    root.tail = tail
+        parser.close()
+        return builder.finish(root)
+
+    @classmethod
+    def fromRoot(cls, root: ElementXML) -> "DocumentStore":
+        """Columns of a <lexml> root or a single <node>, which is left as is"""
+        builder = StoreBuilder()
+        top = [root] if root.tag == NODE else list(root)
+        stack: list[tuple[ElementXML, bool]] = [(e, False) for e in reversed(top)]
+        while stack:
+            node, done = stack.pop()
+            if done:
+                builder.add(node)
+                continue
+            stack.append((node, True))
+            if (children := node.find(CHILDREN)) is not None:
+                stack.extend((e, False) for e in reversed(children))
+        return builder.finish(root if root.tag != NODE else None)
+
+    def find(self, name: str) -> np.ndarray:
+        """Rows whose name is name"""
+        return np.flatnonzero(self.names == name)
+
+    def ofType(self, type: ControlType) -> np.ndarray:
+        """Rows of the given ControlType"""
+        return np.flatnonzero(self.types == TYPE_CODES[type.value])
+
+    def children(self, row: int) -> np.ndarray:
+        """Rows of the direct children of row"""
+        below = np.arange(row + 1, self.ends[row])
+        return below[self.parents[below] == row]
+
+    def subtree(self, row: int) -> slice:
+        """Rows of row and all its descendants"""
+        return slice(row, int(self.ends[row]))
+
+    @staticmethod
+    def paramTexts(A: np.ndarray, texts: np.ndarray) -> list[list[str]]:
+        """Texts of a (N,4) column: the texts it was read with, and
+        numberText of the values edited since"""
+        read = texts.astype(float)
+        edited = (A != read) & ~(np.isnan(A) & np.isnan(read))
+        if not edited.any():
+            return texts.tolist()
+        out = texts.copy()
+        rows, columns = np.nonzero(edited)
+        out[rows, columns] = [numberText(v) for v in A[rows, columns].tolist()]
+        return out.tolist()
+
+    def iterText(self) -> Iterator[str]:
+        """lexml text pieces of the whole document, in order"""
+        attrib = "".join(
+            f' {k}="{escapeAttrib(v)}"' for k, v in self.rootAttrib.items()
+        )
+        yield f"<lexml{attrib}>" + (escapeText(self.rootText) if self.rootText else "")
+        frames = self.paramTexts(self.frames, self.frameTexts)
+        colors = self.paramTexts(self.colors, self.colorTexts)
+        parents = self.parents.tolist()
+        names = self.names.tolist()
+        tails = [escapeText(t) if t else "" for t in self.tails.tolist()]
+        # Halves of each template, before and after the child nodes
+        halves = [t.split(CHILDREN_TOKEN) for t in self.templates]
+        templates = [halves[t] for t in self.templateIds.tolist()]
+        open: list[tuple[int, str]] = []
+        for i, id in enumerate(self.ids.tolist()):
+            while open and open[-1][0] != parents[i]:
+                yield open.pop()[1]
+            name = f"<value>{escapeText(names[i])}</value>" if names[i] else "<value />"
+            fields = (escapeAttrib(id), name, *frames[i], *colors[i])
+            template = templates[i]
+            yield template[0].format(*fields)
+            if len(template) > 1:
+                open.append((i, template[1].format(*fields) + tails[i]))
+            else:
+                yield tails[i]
+        while open:
+            yield open.pop()[1]
+        yield "</lexml>"
+
+    def toRoot(self) -> ElementXML:
+        """Materialize the whole document as a <lexml> Element"""
+        return ET.fromstring("".join(self.iterText()))
+
+    def write(self, outputPath: str) -> bool:
+        """Encodes the document to .tosc, see writeText"""
+        return writeText(self.iterText(), outputPath)
+
+
+class StoreBuilder:
+    """Collects the rows of a DocumentStore from <node> elements added in
+    post order, each after all its children, then sorts them in document
+    order. Only the end of each node is needed, so it works on a parse
+    that reports end events only."""
+
+    def __init__(self):
+        self.ids: list[str] = []
+        self.types: list[int] = []
+        self.children: list[list[int]] = []
+        self.names: list[str | None] = []
+        self.frames: list[list[str]] = []
+        self.colors: list[list[str]] = []
+        self.hasFrame: list[bool] = []
+        self.hasChildren: list[bool] = []
+        self.hasColor: list[bool] = []
+        self.templates: dict[str, int] = {}
+        self.templateIds: list[int] = []
+        self.tails: list[str | None] = []
+        self.added: dict[ElementXML, int] = {}
+
+    def add(self, node: ElementXML):
+        """Store a <node> whose children were already added"""
+        template, name, frame, color = nodeTemplate(node)
+        self.ids.append(node.get("ID", ""))
+        self.types.append(TYPE_CODES[node.get("type")])
+        self.templateIds.append(self.templates.setdefault(template, len(self.templates)))
+        self.names.append(sys.intern(name) if name is not None else None)
+        self.hasFrame.append(bool(frame))
+        self.hasColor.append(bool(color))
+        self.frames.append(frame or ["0"] * 4)
+        self.colors.append(color or ["0"] * 4)
+        self.tails.append(None)
+        children = node.find(CHILDREN)
+        self.hasChildren.append(children is not None)
+        self.children.append(
+            [self.claim(e) for e in children] if children is not None else []
+        )
+        self.added[node] = len(self.ids) - 1
+
+    def claim(self, node: ElementXML) -> int:
+        """Row of an added child node, its tail is only known now"""
+        row = self.added.pop(node)
+        self.tails[row] = sys.intern(node.tail) if node.tail else None
+        return row
+
+    def finish(self, root: ElementXML | None) -> DocumentStore:
+        """Sort the rows in document order and build the columns.
+        root is the <lexml> of the nodes, if any."""
+        n = len(self.ids)
+        order: list[int] = []
+        parents = [-1] * n
+        ends = [0] * n
+        # Rows not claimed by a parent are the top nodes, in order
+        if root is not None:
+            tops = [self.claim(e) for e in root if e in self.added]
+        else:
+            tops = list(self.added.values())
+        stack: list[int] = list(reversed(tops))
+        while stack:
+            row = stack.pop()
+            if row < 0:
+                ends[~row] = len(order)
+                continue
+            rank = len(order)
+            order.append(row)
+            stack.append(~row)
+            for child in reversed(self.children[row]):
+                parents[child] = rank
+                stack.append(child)
+        store = DocumentStore()
+        order = np.array(order, dtype=np.int64)
+        store.ids = np.array(self.ids, dtype=str)[order]
+        store.types = np.array(self.types, dtype=np.int8)[order]
+        store.parents = np.array(parents, dtype=np.int32)[order]
+        store.ends = np.array(ends, dtype=np.int32)[order]
+        store.names = np.array(self.names, dtype=object)[order]
+        store.frameTexts = np.array(self.frames, dtype=object).reshape(-1, 4)[order]
+        store.colorTexts = np.array(self.colors, dtype=object).reshape(-1, 4)[order]
+        store.frames = store.frameTexts.astype(float)
+        store.colors = store.colorTexts.astype(float)
+        store.hasFrame = np.array(self.hasFrame, dtype=bool)[order]
+        store.hasColor = np.array(self.hasColor, dtype=bool)[order]
+        store.hasChildren = np.array(self.hasChildren, dtype=bool)[order]
+        store.templates = list(self.templates)
+        store.templateIds = np.array(self.templateIds, dtype=np.int32)[order]
+        store.tails = np.array(self.tails, dtype=object)[order]
+        if root is not None:
+            store.rootAttrib = dict(root.attrib)
+            store.rootText = root.text
+        return store
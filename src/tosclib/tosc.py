@@ -2,10 +2,14 @@
 API for TOSC Control Elements.
 """
 import logging
+import gc
+from contextlib import contextmanager
 from copy import deepcopy
 import sys
 import re
-from typing import Callable, Generic, NewType, TypeAlias, TypeGuard, TypeVar
+from weakref import WeakKeyDictionary, WeakSet, ref
+from typing import Callable, Generic, Iterable, Iterator, NewType, TypeAlias, TypeGuard, TypeVar
+import os
 import zlib
 import uuid
 from typing import Any
@@ -28,30 +32,294 @@ from .elements import (
 )
 from .controls import (
     ControlConverter,
+    ControlDecoder,
+    ITEM_TAGS,
     ControlFactory,
     Message,
+    mergeProperties,
     XmlFactory,
     Properties,
     controlType,
     Control,
 )
 
+import numpy as np
 import xml.etree.ElementTree as ET
 # from lxml import etree as ET
 
 ElementXML: TypeAlias = ET.Element
 
+CHUNK_SIZE = 1 << 16
+"""Bytes read from and written to .tosc files per chunk."""
+
+
+class KeyIndex:
+    """Lazy key -> position map of a <properties> or <values> section.
+
+    There is one index per section, shared by every ElementTOSC that wraps
+    the node. It is built on the first lookup. Elements appended later,
+    by ElementTOSC or directly to the section, are indexed on the next
+    lookup. Hits are checked against the section and misses are looked up
+    again in a rebuilt index, so elements removed, replaced, reordered or
+    with their <key> edited in place are found. A miss costs one pass.
+
+    The index holds no reference to its section or its elements, so the
+    section is freed with its document.
+    """
+
+    __slots__ = ("keys", "size", "duplicates", "__weakref__")
+
+    _indexes: "WeakKeyDictionary[ElementXML, KeyIndex]" = WeakKeyDictionary()
+
+    def __init__(self):
+        self.keys: dict[str | None, int] = {}
+        self.size = 0
+        self.duplicates = False
+
+    @classmethod
+    def of(cls, section: ElementXML) -> "KeyIndex":
+        """Get the shared index of a section, create it if needed"""
+        if (index := cls._indexes.get(section)) is None:
+            index = cls._indexes[section] = cls()
+        return index
+
+    @classmethod
+    def removed(cls, section: ElementXML, e: ElementXML):
+        """Update the index of section, if there is one, after removing e"""
+        if (index := cls._indexes.get(section)) is not None:
+            index.remove(section, e)
+
+    def get(self, section: ElementXML, key: str) -> ElementXML | None:
+        """First element of section whose <key> text matches, like findKey"""
+        size = len(section)
+        rebuilt = self.size == 0
+        if size != self.size:
+            self.update(section, size)
+        position = self.keys.get(key)
+        if position is not None and section[position].findtext("key") == key:
+            return section[position]
+        # A miss or a stale hit, keys may have been edited in place
+        if rebuilt:
+            return None
+        self.clear()
+        self.update(section, size)
+        if (position := self.keys.get(key)) is None:
+            return None
+        return section[position]
+
+    def update(self, section: ElementXML, size: int):
+        """Index appended elements, or rebuild everything if it shrunk"""
+        if size < self.size:
+            self.clear()
+        keys = self.keys
+        for position in range(self.size, size):
+            key = section[position].findtext("key")
+            if key in keys:
+                self.duplicates = True
+            else:
+                keys[key] = position
+        self.size = size
+
+    def clear(self):
+        self.keys = {}
+        self.size = 0
+        self.duplicates = False
+
+    def remove(self, section: ElementXML, e: ElementXML):
+        """Forget an element that was just removed from the section"""
+        key = e.findtext("key")
+        if (
+            self.size == len(section) + 1
+            and not self.duplicates
+            and self.keys.get(key) == self.size - 1
+        ):
+            del self.keys[key]
+            self.size -= 1
+        else:
+            self.clear()
+
+
+class DocumentIndex:
+    """ID -> <node> and name -> IDs maps of a whole document.
+
+    Built in one walk over an in-memory root. Every live index is kept up
+    to date when ElementTOSC creates, appends, renames or moves nodes
+    inside it, changes made directly to the XML are not tracked.
+
+    The root is only held weakly, descendants are held by the maps, so a
+    cached index is freed with its root.
+
+    Args:
+        root (ET.Element): Root or any <node> to index with its descendants.
+    """
+
+    _live: "WeakSet[DocumentIndex]" = WeakSet()
+    _cache: "WeakKeyDictionary[ElementXML, DocumentIndex]" = WeakKeyDictionary()
+
+    def __init__(self, root: ElementXML):
+        self._root = ref(root)
+        self.top: tuple[str, str | None] | None = None
+        self.nodes: dict[str, ElementXML] = {}
+        self.names: dict[str | None, list[str]] = {}
+        self.parents: dict[ElementXML, ElementXML | None] = {}
+        self.named: dict[ElementXML, str | None] = {}
+        self.refresh()
+        self._live.add(self)
+
+    @property
+    def root(self) -> ElementXML | None:
+        return self._root()
+
+    def refresh(self):
+        """Walk the root again, for changes made directly to the XML"""
+        self.nodes.clear()
+        self.names.clear()
+        self.parents.clear()
+        self.named.clear()
+        self.top = None
+        if (root := self.root) is None:
+            return
+        if root.tag == ControlElements.NODE.value:
+            # A <node> root stays out of the maps, its children are top level
+            self.top = (root.get("ID"), nodeName(root))
+            self.names.setdefault(self.top[1], []).append(self.top[0])
+            nodes = self.childNodes(root)
+        else:
+            nodes = root.iterfind(ControlElements.NODE.value)
+        for node in nodes:
+            self.add(node, None)
+
+    @staticmethod
+    def childNodes(node: ElementXML) -> list[ElementXML]:
+        if (children := node.find(ControlElements.CHILDREN.value)) is None:
+            return []
+        return [e for e in children if e.tag == ControlElements.NODE.value]
+
+    @classmethod
+    def of(cls, root: ElementXML) -> "DocumentIndex":
+        """Get the cached index of a root, create it if needed"""
+        if (index := cls._cache.get(root)) is None:
+            index = cls._cache[root] = cls(root)
+        return index
+
+    def __contains__(self, node: ElementXML) -> bool:
+        return node in self.parents or (self.top is not None and node is self.root)
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def getNode(self, id: str) -> ElementXML | None:
+        """<node> with the given ID"""
+        if self.top is not None and id == self.top[0] and id not in self.nodes:
+            return self.root
+        return self.nodes.get(id)
+
+    def getIds(self, name: str) -> list[str]:
+        """IDs of all nodes with the given name, in document order"""
+        return self.names.get(name, [])
+
+    def getParent(self, node: ElementXML) -> ElementXML | None:
+        """Parent <node> or None if node is a top level node"""
+        if (parent := self.parents.get(node)) is None and self.top is not None:
+            return self.root if node in self.parents else None
+        return parent
+
+    def add(self, node: ElementXML, parent: ElementXML | None):
+        """Index a node and all of its descendants"""
+        stack = [(node, self.parentKey(parent))]
+        while stack:
+            node, parent = stack.pop()
+            self.parents[node] = parent
+            self.nodes.setdefault(node.get("ID"), node)
+            name = self.named[node] = nodeName(node)
+            self.names.setdefault(name, []).append(node.get("ID"))
+            stack.extend((child, node) for child in reversed(self.childNodes(node)))
+
+    def parentKey(self, parent: ElementXML | None) -> ElementXML | None:
+        """Parent as stored in the maps, a <node> root is stored as None"""
+        return None if self.top is not None and parent is self.root else parent
+
+    def discard(self, node: ElementXML):
+        """Forget a node and all of its descendants"""
+        for e in node.iter(ControlElements.NODE.value):
+            if e not in self.parents:
+                continue
+            del self.parents[e]
+            id = e.get("ID")
+            if self.nodes.get(id) is e:
+                del self.nodes[id]
+            self._unname(e)
+
+    def rename(self, node: ElementXML):
+        """Read the node's name again"""
+        if self.top is not None and node is self.root:
+            if (ids := self.names.get(self.top[1])) is not None:
+                ids.remove(self.top[0])
+                if not ids:
+                    del self.names[self.top[1]]
+            self.top = (node.get("ID"), nodeName(node))
+            self.names.setdefault(self.top[1], []).append(self.top[0])
+            return
+        self._unname(node)
+        name = self.named[node] = nodeName(node)
+        self.names.setdefault(name, []).append(node.get("ID"))
+
+    def _unname(self, node: ElementXML):
+        name = self.named.pop(node, None)
+        if (ids := self.names.get(name)) is not None:
+            ids.remove(node.get("ID"))
+            if not ids:
+                del self.names[name]
+
+    @classmethod
+    def attached(cls, parent: ElementXML, *nodes: ElementXML):
+        """Let every index that holds parent know about new children"""
+        for index in cls._live:
+            if parent in index:
+                for node in nodes:
+                    index.add(node, parent)
+
+    @classmethod
+    def detached(cls, node: ElementXML):
+        """Let every index that holds node know it was removed"""
+        for index in cls._live:
+            if node in index:
+                index.discard(node)
+
+    @classmethod
+    def renamed(cls, node: ElementXML):
+        """Let every index that holds node know its name changed"""
+        for index in cls._live:
+            if node in index:
+                index.rename(node)
+
+    @classmethod
+    def moved(cls, parent: ElementXML, *nodes: ElementXML):
+        """Let every index know nodes were reparented under parent"""
+        for index in cls._live:
+            holdsParent = parent in index
+            for node in nodes:
+                if node in index and holdsParent:
+                    index.parents[node] = index.parentKey(parent)
+                elif node in index:
+                    index.discard(node)
+                elif holdsParent:
+                    index.add(node, parent)
+
+    def isDescendant(self, node: ElementXML, ancestor: ElementXML) -> bool:
+        """True if ancestor is above node, both must be in the index"""
+        while (node := self.getParent(node)) is not None:
+            if node is ancestor:
+                return True
+        return False
+
 
 def simpleProperty(func):
     """Pass value as text arg"""
 
     def wrapper(self: "ElementTOSC", value):
         type, key = func(self)
-        element = self.getProperty(key)
-        if element is not None:
-            self.properties.remove(element)
-        return self.createPropertyUnsafe(
-            Property(type.value, key, str(value)))
+        return self.updateProperty(Property(type.value, key, str(value)))
 
     return wrapper
 
@@ -60,31 +328,55 @@ def booleanProperty(func):
 
     def wrapper(self: "ElementTOSC", value):
         type, key = func(self)
-        element = self.getProperty(key)
-        if element is not None:
-            self.properties.remove(element)
-        return self.createPropertyUnsafe(
+        return self.updateProperty(
             Property(type.value, key, repr(int(value)))
         )
 
     return wrapper
 
+
+@contextmanager
+def gcPaused():
+    """Pause the cyclic garbage collector while many Elements are built.
+    Elements hold no reference cycles, but each allocation counts towards
+    a collection that has to walk the growing tree."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+FRAME_HOOKS: WeakKeyDictionary = WeakKeyDictionary()
+"""<node> -> function(node, frame) called after its frame is set through
+setFrame, update or arrays.setFrames, see layout.relayout. frame is None
+when the hook has to read it from the node."""
+
+
+def frameChanged(node: ElementXML, frame: Any):
+    """Call the frame hook of a node, if any"""
+    if (hook := FRAME_HOOKS.get(node)) is not None:
+        hook(node, tuple(frame))
+
+
 def multiProperty(func):
     """Pass args as tuple of keys, so color is ("r","g","b","a")"""
 
     def wrapper(self: "ElementTOSC", params):
         type, key, paramKeys = func(self)
-        element = self.getProperty(key)
-        if element is not None:
-            self.properties.remove(element)
-        return self.createPropertyUnsafe(
+        done = self.updateProperty(
             Property(
                 type.value,
                 key,
-                params={k: repr(params[i])
+                params={k: paramText(params[i])
                         for i, k in enumerate(paramKeys)},
             )
         )
+        if key == "frame":
+            frameChanged(self.node, params)
+        return done
 
     return wrapper
 
@@ -92,13 +384,18 @@ def multiProperty(func):
 class ElementTOSC:
     """
     Contains a Node Element and its SubElements. Creates them if not found.
+
+    Iterating or indexing yields the children as ElementTOSC, each built
+    once and reused while its node stays a child. Their <node> is .node,
+    and wrapping one again, as in ElementTOSC(child), gives a wrapper of
+    the same node.
     """
 
-    def __init__(self, e: ElementXML):
+    def __init__(self, e: "ElementXML | ElementTOSC"):
         """Find SubElements on init
 
         Args:
-            e (ET.Element): <node> Element
+            e (ET.Element): <node> Element, or an ElementTOSC of it
 
         Attributes:
             properties (ET.Element): Find <properties>
@@ -106,22 +403,36 @@ class ElementTOSC:
             messages (ET.Element): Find <messages>
             children (ET.Element): Find <children>
         """
+        if isinstance(e, ElementTOSC):
+            e = e.node
         self.node = e
         self.properties = self.getCreate("properties")
         self.values = self.getCreate("values")
         self.messages = self.getCreate("messages")
         self.children = self.getCreate("children")
 
-    def __iter__(self):
-        """Return iter over children"""
-        return iter(self.children)
+    _wrappers: WeakKeyDictionary = WeakKeyDictionary()
+    """<children> section -> {child node: wrapper}, see wrapChild."""
 
-    def __getitem__(self,item):
-        return self.__class__(self.children[item])
+    def __iter__(self) -> Iterator["ElementTOSC"]:
+        """Return iter over children as cached ElementTOSC"""
+        return map(self.wrapChild, self.children)
+
+    def __getitem__(self, item) -> "ElementTOSC | list[ElementTOSC]":
+        """Child or slice of children as cached ElementTOSC"""
+        if isinstance(item, slice):
+            return [self.wrapChild(e) for e in self.children[item]]
+        return self.wrapChild(self.children[item])
+
+    def wrapChild(self, node: ElementXML) -> "ElementTOSC":
+        """Wrapper of a child node, built once and reused"""
+        return wrapChild(self.__class__._wrappers, self.__class__,
+                         self.children, node)
 
     def append(self, e: "ElementTOSC") -> "ElementTOSC":
         """Append an ElementTOSC's Node to this element's Children"""
         self.children.append(e.node)
+        DocumentIndex.attached(self.node, e.node)
         return self
 
     def getCreate(self, target):
@@ -173,13 +484,16 @@ class ElementTOSC:
         return None
 
     def hasProperty(self, key: str) -> bool:
-        return True if findKey(self.properties, key) else False
+        return findKey(self.properties, key) is not None
 
     def setProperty(self, key: str, value: str = "",
                     params: dict = {}) -> bool:
         if (e:=findKey(self.properties, key)) is None:
             raise ValueError(f"{key} doesn't exist.")
-        return XmlFactory.modifyProperty(e, value, params)
+        result = XmlFactory.modifyProperty(e, value, params)
+        if key == "name":
+            DocumentIndex.renamed(self.node)
+        return result
 
     def createProperty(self, property: Property) -> bool:
         if findKey(self.properties, property.key) is not None:
@@ -187,7 +501,78 @@ class ElementTOSC:
         return self.createPropertyUnsafe(property)
 
     def createPropertyUnsafe(self, property: Property) -> bool:
-        return XmlFactory.buildProperties(self.properties,[property])
+        result = XmlFactory.buildProperties(self.properties,[property])
+        if property.key == "name":
+            DocumentIndex.renamed(self.node)
+        return result
+
+    def updateProperty(self, property: Property) -> bool:
+        """Set a property in place if it exists with the same type and
+        params, otherwise replace it or create it.
+
+        Args:
+            property (Property): Property with the new value or params.
+
+        Returns:
+            bool: bool
+        """
+        e = findKey(self.properties, property.key)
+        if e is not None and e.get("type") == property.type:
+            if writeValue(e, property.value, property.params):
+                if property.key == "name":
+                    DocumentIndex.renamed(self.node)
+                return True
+        if e is not None:
+            self.removeProperty(property.key)
+        return self.createPropertyUnsafe(property)
+
+    def update(self, **props) -> bool:
+        """Set many properties in one pass over <properties>.
+
+        Existing properties keep their type and are modified in place,
+        the rest are built with buildProperty and appended.
+
+        Example:
+            update(name="fader", frame=(0, 0, 40, 200), visible=False)
+
+        Returns:
+            bool: bool
+        """
+        pending = dict(props)
+        replace = []
+        for e in self.properties:
+            if (key := e.findtext("key")) not in pending:
+                continue
+            value = pending.pop(key)
+            if (params := PARAMS.get(e.get("type"))) is not None:
+                texts = dict(zip(params, map(paramText, value)))
+                done = len(texts) == len(params) and writeValue(e, "", texts)
+            elif e.get("type") == PropertyType.BOOLEAN.value:
+                done = writeValue(e, repr(int(value)), {})
+            else:
+                done = writeValue(e, paramText(value), {})
+            if not done:
+                replace.append((key, value))
+
+        for key, _ in replace:
+            self.removeProperty(key)
+        for key, value in replace + list(pending.items()):
+            self.createPropertyUnsafe(buildProperty(key, value))
+        if "name" in props:
+            DocumentIndex.renamed(self.node)
+        if "frame" in props:
+            frameChanged(self.node, props["frame"])
+        return True
+
+    def removeProperty(self, key: str) -> bool:
+        """Remove the property with the given key, if any"""
+        if (e := findKey(self.properties, key)) is None:
+            return False
+        self.properties.remove(e)
+        KeyIndex.removed(self.properties, e)
+        if key == "name":
+            DocumentIndex.renamed(self.node)
+        return True
 
     def getValue(self, key: str) -> ElementXML | None:
         return findKey(self.values, key)
@@ -241,20 +626,131 @@ class ElementTOSC:
         return True
 
     def findChildByName(self, name: str) -> ElementXML | None:
+        """First direct child whose name matches, name can be a regex"""
+        match = compileMatcher(name)
         for child in self.children:
-            if child.find(ControlElements.PROPERTIES.value) is None:
-                continue
-            if re.fullmatch(
-                getTextValueFromKey(
-                    child.find(ControlElements.PROPERTIES.value), "name"
-                ),
-                name,
-            ):
+            if match(nodeName(child)):
                 return child
         return None
 
+    def findAll(
+        self,
+        name: str | re.Pattern | None = None,
+        tag: str | re.Pattern | None = None,
+        type: ControlType | None = None,
+    ) -> Iterator[ElementXML]:
+        """Generator over all descendant nodes that match every given filter.
+
+        Args:
+            name (str | re.Pattern, optional): Name, literal or regex.
+            tag (str | re.Pattern, optional): Tag property, literal or regex.
+            type (ControlType, optional): Control type.
+
+        Yields:
+            ElementXML: <node>
+        """
+        matchName = compileMatcher(name) if name is not None else None
+        matchTag = compileMatcher(tag) if tag is not None else None
+        typeValue = type.value if type is not None else None
+
+        # The tree is always walked, a DocumentIndex misses nodes appended
+        # directly to the XML and maps shared IDs to a single node
+        for node in self.children.iter(ControlElements.NODE.value):
+            if typeValue is not None and node.get("type") != typeValue:
+                continue
+            if matchName is not None or matchTag is not None:
+                nameText, tagText = propertyTexts(node, "name", "tag")
+                if matchName is not None and not matchName(nameText):
+                    continue
+                if matchTag is not None and not matchTag(tagText):
+                    continue
+            yield node
+
     def createChild(self, type: controlType) -> ElementXML:
-        return XmlFactory.buildNode(self.children, type)
+        child = XmlFactory.buildNode(self.children, type)
+        DocumentIndex.attached(self.node, child)
+        return child
+
+    @gcPaused()
+    def createChildren(
+        self,
+        type: controlType,
+        n: int,
+        frames: Iterable | np.ndarray | None = None,
+        colors: Iterable | np.ndarray | None = None,
+        names: Iterable[str] | None = None,
+        sections: bool = False,
+    ) -> list[ElementXML]:
+        """Create n children at once from a single prototype node.
+
+        The prototype holds the <properties> that are set, each child is
+        a copy of it with a new ID and its own texts. Like createChild,
+        the other sections are only added once a child is wrapped,
+        unless sections is True.
+
+        Args:
+            type (controlType): ControlType of all the children.
+            n (int): Amount of children.
+            frames (optional): (n,4) array or n tuples of x,y,w,h.
+            colors (optional): (n,4) array or n tuples of r,g,b,a.
+            names (optional): n names.
+            sections (bool): Add empty <values>, <messages> and <children>
+                as ElementTOSC would.
+
+        Returns:
+            list[ElementXML]: The new <node> Elements.
+        """
+        properties: list[Property] = []
+        columns: list[list[list[str]]] = []
+        if names is not None:
+            properties.append(Property(PropertyType.STRING.value, "name", ""))
+            columns.append([[str(name)] for name in names])
+        if frames is not None:
+            properties.append(Property(PropertyType.FRAME.value, "frame", "",
+                {k: "" for k in ("x", "y", "w", "h")}))
+            columns.append(formatFrames(frames))
+        if colors is not None:
+            properties.append(Property(PropertyType.COLOR.value, "color", "",
+                {k: "" for k in ("r", "g", "b", "a")}))
+            columns.append(formatColors(colors))
+        for column in columns:
+            if len(column) != n:
+                raise ValueError(f"Expected {n} rows, got {len(column)}.")
+
+        prototype = ET.Element(
+            ControlElements.NODE.value, attrib={"ID": "", "type": type.value}
+        )
+        XmlFactory.buildProperties(
+            ET.SubElement(prototype, ControlElements.PROPERTIES.value), properties
+        )
+        if sections:
+            for tag in ("values", "messages", "children"):
+                ET.SubElement(prototype, tag)
+
+        # Text slots of the prototype in iter() order, each row of texts
+        # is the columns joined in the same order
+        elements = list(prototype.iter())
+        slots = [
+            elements.index(e)
+            for property in prototype[0]
+            for e in (property[1] if len(property[1]) else (property[1],))
+        ]
+        # deepcopy of a C Element is only fast for children nothing else holds
+        del elements
+        rows = [sum(texts, []) for texts in zip(*columns)] if columns else [[]] * n
+
+        nodes = []
+        for id, row in zip(generateIds(n), rows):
+            node = cloneElement(prototype)
+            node.set("ID", id)
+            copied = list(node.iter())
+            for slot, text in zip(slots, row):
+                copied[slot].text = text
+            nodes.append(node)
+
+        self.children.extend(nodes)
+        DocumentIndex.attached(self.node, *nodes)
+        return nodes
 
     def getID(self) -> str:
         return str(self.node.attrib["ID"])
@@ -383,6 +879,119 @@ class ElementTOSC:
             raise ValueError(f"{name} doesn't exist")
 
 
+EMPTY_SECTION = ET.Element("empty")
+"""Read by views in place of a missing section, never attached to a tree."""
+
+
+class ElementView:
+    """
+    Read-only view of a Node Element. Finds SubElements lazily on first
+    access and never creates them, missing ones read as empty. Children
+    are iterated as cached views, like ElementTOSC.
+    """
+
+    __slots__ = ("node", "_properties", "_values", "_messages", "_children",
+                 "__weakref__")
+
+    def __init__(self, e: "ElementXML | ElementView | ElementTOSC"):
+        """
+        Args:
+            e (ET.Element): <node> Element, or a view or ElementTOSC of it
+        """
+        if isinstance(e, (ElementView, ElementTOSC)):
+            e = e.node
+        self.node = e
+        self._properties = None
+        self._values = None
+        self._messages = None
+        self._children = None
+
+    _wrappers: WeakKeyDictionary = WeakKeyDictionary()
+    """<children> section -> {child node: view}, see wrapChild."""
+
+    def __iter__(self) -> Iterator["ElementView"]:
+        """Return iter over children as cached views"""
+        return map(self.wrapChild, self.children)
+
+    def __getitem__(self, item) -> "ElementView | list[ElementView]":
+        """Child or slice of children as cached views"""
+        if isinstance(item, slice):
+            return [self.wrapChild(e) for e in self.children[item]]
+        return self.wrapChild(self.children[item])
+
+    def wrapChild(self, node: ElementXML) -> "ElementView":
+        """View of a child node, built once and reused"""
+        return wrapChild(ElementView._wrappers, ElementView,
+                         self.children, node)
+
+    def __len__(self) -> int:
+        return len(self.children)
+
+    def find(self, target: str) -> ElementXML:
+        s = self.node.find(target)
+        return s if s is not None else EMPTY_SECTION
+
+    @property
+    def properties(self) -> ElementXML:
+        if self._properties is None:
+            self._properties = self.find("properties")
+        return self._properties
+
+    @property
+    def values(self) -> ElementXML:
+        if self._values is None:
+            self._values = self.find("values")
+        return self._values
+
+    @property
+    def messages(self) -> ElementXML:
+        if self._messages is None:
+            self._messages = self.find("messages")
+        return self._messages
+
+    @property
+    def children(self) -> ElementXML:
+        if self._children is None:
+            self._children = self.find("children")
+        return self._children
+
+    @classmethod
+    def fromFile(cls, file: str) -> "ElementView":
+        """Load a .tosc file into an XML Element and then as ElementView"""
+        return cls(load(file)[0])
+
+    def edit(self) -> ElementTOSC:
+        """Writable ElementTOSC of the same node, creates missing sections"""
+        return ElementTOSC(self.node)
+
+    # Readers shared with ElementTOSC, they only go through the sections
+    getProperty = ElementTOSC.getProperty
+    getPropertyValue = ElementTOSC.getPropertyValue
+    getPropertyParam = ElementTOSC.getPropertyParam
+    hasProperty = ElementTOSC.hasProperty
+    getValue = ElementTOSC.getValue
+    getValueParam = ElementTOSC.getValueParam
+    hasValue = ElementTOSC.hasValue
+    findChildByName = ElementTOSC.findChildByName
+    findAll = ElementTOSC.findAll
+    getID = ElementTOSC.getID
+    isControlType = ElementTOSC.isControlType
+    getFrame = ElementTOSC.getFrame
+    getColor = ElementTOSC.getColor
+    getR = ElementTOSC.getR
+    getG = ElementTOSC.getG
+    getB = ElementTOSC.getB
+    getA = ElementTOSC.getA
+    getX = ElementTOSC.getX
+    getY = ElementTOSC.getY
+    getW = ElementTOSC.getW
+    getH = ElementTOSC.getH
+    getName = ElementTOSC.getName
+    show = ElementTOSC.show
+    showProperty = ElementTOSC.showProperty
+    showValue = ElementTOSC.showValue
+
+
 """
 
 GENERAL FUNCTIONS
@@ -391,12 +1000,36 @@ GENERAL FUNCTIONS
 
 
 def findKey(elements: ElementXML, key: str) -> ElementXML | Any:
-    """Iterate through element with children and return child whose key matches"""
-    return elements.find(f"*[key='{key}']")
-    # for e in elements:
-    #     if re.fullmatch(e.find("key").text, key):
-    #         return e
-    # return None
+    """Return the first child whose key matches, see KeyIndex"""
+    return KeyIndex.of(elements).get(elements, key)
+
+
+def wrapChild(cache: WeakKeyDictionary, cls: type,
+              children: ElementXML, node: ElementXML):
+    """Cached cls(node) for a node in a <children> section.
+
+    The cache is keyed weakly by the section, which is never referenced
+    by its child nodes, so the wrappers live as long as the parent does.
+    Wrappers of nodes that left the section are dropped once they
+    outnumber the children.
+
+    Args:
+        cache (WeakKeyDictionary): Wrappers per section of this cls.
+        cls (type): ElementTOSC or ElementView.
+        children (ElementXML): <children>
+        node (ElementXML): <node> in children.
+    """
+    wrappers = cache.get(children)
+    if wrappers is None:
+        wrappers = cache[children] = {}
+    if (wrapper := wrappers.get(node)).__class__ is cls:
+        return wrapper
+    if len(wrappers) >= 2 * len(children):
+        current = set(children)
+        for e in [e for e in wrappers if e not in current]:
+            del wrappers[e]
+    wrapper = wrappers[node] = cls(node)
+    return wrapper
 
 
 def showElement(e: ElementXML | None):
@@ -427,20 +1060,350 @@ def createGroup() -> ElementXML:
     )
 
 
-def load(inputPath: str) -> ElementXML:
-    """Reads a .tosc file and returns the XML root Element"""
+def readChunks(inputPath: str, chunkSize: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Decompress a .tosc file and yield the XML in chunks.
+
+    Neither the compressed file nor the decompressed XML is ever held
+    in memory as a whole, every chunk is at most chunkSize bytes.
+
+    Args:
+        inputPath (str): .tosc file.
+        chunkSize (int, optional): Max bytes per read and per chunk.
+
+    Yields:
+        bytes: Decompressed XML
+    """
+    decompressor = zlib.decompressobj()
     with open(inputPath, "rb") as file:
-        return ET.fromstring(zlib.decompress(file.read()))
+        while data := file.read(chunkSize):
+            while data:
+                yield decompressor.decompress(data, chunkSize)
+                data = decompressor.unconsumed_tail
+    yield decompressor.flush()
+
+
+def load(inputPath: str, chunkSize: int = CHUNK_SIZE) -> ElementXML:
+    """Reads a .tosc file and returns the XML root Element.
+    The file is decompressed in chunks that are fed straight to the parser."""
+    parser = ET.XMLParser()
+    for chunk in readChunks(inputPath, chunkSize):
+        parser.feed(chunk)
+    return parser.close()
+
+
+class CompressedWriter:
+    """File-like object that compresses everything written to it
+    and passes the compressed chunks on to the underlying file."""
+
+    def __init__(self, file):
+        self.file = file
+        self.compressor = zlib.compressobj()
+
+    def write(self, data: bytes) -> int:
+        self.file.write(self.compressor.compress(data))
+        return len(data)
+
+    def close(self):
+        self.file.write(self.compressor.flush())
 
 
 def write(root: ElementXML, outputPath: str) -> bool:
-    """Encodes a root Element to .tosc"""
+    """Encodes a root Element to .tosc.
+    The tree is serialized in chunks straight into the compressor,
+    so no full copy of the XML is ever held in memory."""
+    with open(outputPath, "wb") as file:
+        writer = CompressedWriter(file)
+        ET.ElementTree(root).write(writer, encoding="UTF-8", method="xml")
+        writer.close()
+    return True
+
+
+def escapeText(text: str) -> str:
+    """Escape character data the same way ElementTree does"""
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def escapeAttrib(text: str) -> str:
+    """Escape an attribute value the same way ElementTree does"""
+    text = escapeText(text)
+    if '"' in text:
+        text = text.replace('"', "&quot;")
+    if "\r" in text:
+        text = text.replace("\r", "&#13;")
+    if "\n" in text:
+        text = text.replace("\n", "&#10;")
+    if "\t" in text:
+        text = text.replace("\t", "&#09;")
+    return text
+
+
+def leafText(tag: str, text: str | None) -> str:
+    """<tag>text</tag>, or <tag /> when there is no text"""
+    if text:
+        return f"<{tag}>{escapeText(text)}</{tag}>"
+    return f"<{tag} />"
+
+
+def slotsText(tag: str, obj: Any) -> str:
+    """<tag> with one leaf per slot of obj, like Value or Partial"""
+    return (f"<{tag}>"
+            + "".join(leafText(k, getattr(obj, k)) for k in obj.__slots__)
+            + f"</{tag}>")
+
+
+def propertyText(prop: Property) -> str:
+    """<property> of a single Property, see XmlFactory.propertyElement"""
+    key = leafText("key", prop.key)
+    if prop.params:
+        value = ("<value>" + escapeText(prop.value or "")
+                 + "".join(leafText(k, v) for k, v in prop.params.items())
+                 + "</value>")
+    else:
+        value = leafText("value", prop.value)
+    return f'<property type="{escapeAttrib(prop.type)}">{key}{value}</property>'
+
+
+def valueText(value: Value) -> str:
+    """<value> of a single Value, see XmlFactory.valueElement"""
+    return slotsText(ControlElements.VALUE.value, value)
+
+
+def messageText(message: Message) -> str:
+    """<osc>, <midi> or <local>, see XmlFactory.messageElement"""
+    parts = []
+    for k in message.__slots__:
+        v = getattr(message, k)
+        if isinstance(v, list):
+            items = "".join(slotsText(ITEM_TAGS[type(pt)], pt) for pt in v)
+            parts.append(f"<{k}>{items}</{k}>" if items else f"<{k} />")
+        elif isinstance(v, MidiMessage):
+            parts.append(slotsText(k, v))
+        else:
+            parts.append(leafText(k, v))
+    tag = message.__class__.__name__.lower()
+    return f"<{tag}>" + "".join(parts) + f"</{tag}>"
+
+
+class ControlWriter:
+    """Serializes Control trees to lexml text without building Elements.
+    Texts of Property, Value and message objects are kept by identity,
+    like the FragmentCache of ControlConverter, so shared objects such
+    as the default tables are only formatted once."""
+
+    def __init__(self):
+        self.texts: dict[Any, tuple[Any, str]] = {}
+
+    def text(self, obj: Any, build: Callable[[Any], str]) -> str:
+        if (entry := self.texts.get(id(obj))) is not None:
+            return entry[1]
+        text = build(obj)
+        # Keep obj alive so its id isn't reused while the writer exists
+        self.texts[id(obj)] = (obj, text)
+        return text
+
+    def section(self, tag: str, objs: list, build: Callable[[Any], str]) -> str:
+        if not objs:
+            return f"<{tag} />"
+        key = (tag, *map(id, objs))
+        if (entry := self.texts.get(key)) is not None:
+            return entry[1]
+        text = f"<{tag}>" + "".join(self.text(o, build) for o in objs) + f"</{tag}>"
+        self.texts[key] = (objs, text)
+        return text
+
+    def iterText(self, control: Control) -> Iterator[str]:
+        """Pieces of the <node> of a Control and all its children,
+        in document order. Walks the children with a stack."""
+        stack: list[Control | str] = [control]
+        while stack:
+            control = stack.pop()
+            if isinstance(control, str):
+                yield control
+                continue
+            yield (
+                f'<node ID="{escapeAttrib(control.id)}" '
+                f'type="{escapeAttrib(control.controlT.value)}">'
+                + self.section(
+                    ControlElements.PROPERTIES.value,
+                    mergeProperties(getattr(control, "defaults", ()), control.properties),
+                    propertyText,
+                )
+                + self.section(ControlElements.VALUES.value, control.values, valueText)
+                + self.section(
+                    ControlElements.MESSAGES.value, control.messages, messageText
+                )
+            )
+            if not control.children:
+                yield "</node>" if control.children is None else "<children /></node>"
+                continue
+            yield "<children>"
+            stack.append("</children></node>")
+            stack.extend(reversed(control.children))
+
+
+def writeText(pieces: Iterable[str], outputPath: str) -> bool:
+    """Encodes lexml text pieces to .tosc, joined and compressed in
+    CHUNK_SIZE chunks so the whole text is never held in memory."""
     with open(outputPath, "wb") as file:
-        treeFile = ET.tostring(root, encoding="UTF-8", method="xml")
-        file.write(zlib.compress(treeFile))
+        writer = CompressedWriter(file)
+        buffer = []
+        size = 0
+        for piece in pieces:
+            buffer.append(piece)
+            size += len(piece)
+            if size >= CHUNK_SIZE:
+                writer.write("".join(buffer).encode("utf-8"))
+                buffer.clear()
+                size = 0
+        writer.write("".join(buffer).encode("utf-8"))
+        writer.close()
+    return True
+
+
+def writeControls(control: Control, outputPath: str) -> bool:
+    """Encodes a Control tree to .tosc without building XML Elements.
+    The output is the same as write(asRoot(control), outputPath).
+
+    Args:
+        control (Control): Root Control, usually a Group.
+        outputPath (str): .tosc file path.
+
+    Returns:
+        bool: bool
+    """
+    def pieces():
+        yield '<lexml version="3">'
+        yield from ControlWriter().iterText(control)
+        yield "</lexml>"
+
+    return writeText(pieces(), outputPath)
+
+
+_PATTERN_CHARS = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+
+def isPattern(text: str) -> bool:
+    """True if text contains any regex metacharacter"""
+    return _PATTERN_CHARS.search(text) is not None
+
+
+def compileMatcher(pattern: str | re.Pattern) -> Callable[[str | None], bool]:
+    """Compile a name pattern once into a fullmatch predicate.
+    Plain strings without metacharacters are compared directly."""
+    if isinstance(pattern, str) and not isPattern(pattern):
+        return lambda text: text == pattern
+    compiled = re.compile(pattern)
+    return lambda text: text is not None and compiled.fullmatch(text) is not None
+
+
+def propertyTexts(node: ElementXML, *keys: str) -> list[str | None]:
+    """Value texts of a node's properties in the order of keys,
+    None for keys it doesn't have. Scans the properties once."""
+    texts: list[str | None] = [None] * len(keys)
+    if (properties := node.find(ControlElements.PROPERTIES.value)) is not None:
+        for property in properties:
+            if (key := property.findtext("key")) in keys:
+                texts[keys.index(key)] = property.findtext("value")
+    return texts
+
+
+PARAMS = {
+    PropertyType.FRAME.value: ("x", "y", "w", "h"),
+    PropertyType.COLOR.value: ("r", "g", "b", "a"),
+}
+"""Param tags of each multi value PropertyType"""
+
+KEY_TYPES = {
+    "frame": PropertyType.FRAME.value,
+    "color": PropertyType.COLOR.value,
+}
+"""PropertyType of the multi value keys, whatever the value looks like"""
+
+
+def paramText(value: Any) -> str:
+    """Text of a single value, NumPy scalars are written as python numbers"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    return value if isinstance(value, str) else repr(value)
+
+
+def buildProperty(key: str, value: Any) -> Property:
+    """Property of a key and value. Frame and color take their type and
+    params from KEY_TYPES, as setFrame and setColor do, the rest is left
+    to PropertyFactory."""
+    if (type := KEY_TYPES.get(key)) is None:
+        return PropertyFactory.build(key, value)
+    params = PARAMS[type]
+    return Property(type, key, params={k: paramText(value[i]) for i, k in enumerate(params)})
+
+
+def writeValue(property: ElementXML, text: str | None,
+               params: dict[str, str]) -> bool:
+    """Set the <value> text or param texts of a <property> in place.
+    Returns False if the value doesn't have exactly those params."""
+    if (value := property.find("value")) is None or len(value) != len(params):
+        return False
+    if not params:
+        value.text = text
+        return True
+    targets = [value.find(k) for k in params]
+    if None in targets:
+        return False
+    for target, k in zip(targets, params):
+        target.text = params[k]
     return True
 
 
+def formatTexts(A: np.ndarray) -> list[list[str]]:
+    """repr texts of an array of rows. Each distinct value is formatted
+    once and the texts are gathered back in one indexing step, layouts
+    repeat the same few coordinates many times."""
+    if A.dtype.kind == "f" and np.any(np.signbit(A) & (A == 0)):
+        # unique would merge -0.0 with 0.0
+        return [list(map(repr, row)) for row in A.tolist()]
+    unique, inverse = np.unique(A, return_inverse=True)
+    texts = np.array(list(map(repr, unique.tolist())), dtype=object)
+    return texts[inverse.reshape(A.shape)].tolist()
+
+
+def formatFrames(frames: Iterable | np.ndarray) -> list[list[str]]:
+    """Texts of x,y,w,h for many frames at once, floats are truncated"""
+    return formatTexts(np.asarray(frames).astype(int))
+
+
+def formatColors(colors: Iterable | np.ndarray) -> list[list[str]]:
+    """Texts of r,g,b,a for many colors at once"""
+    return formatTexts(np.asarray(colors).astype(float))
+
+
+def generateIds(n: int) -> list[str]:
+    """n random UUID4 strings, like str(uuid.uuid4()) but in one batch"""
+    data = np.frombuffer(os.urandom(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    data[:, 6] = data[:, 6] & 0x0F | 0x40  # version 4
+    data[:, 8] = data[:, 8] & 0x3F | 0x80  # RFC 4122 variant
+    h = data.tobytes().hex()
+    return [
+        f"{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-"
+        f"{h[i + 16:i + 20]}-{h[i + 20:i + 32]}"
+        for i in range(0, 32 * n, 32)
+    ]
+
+
+def nodeName(node: ElementXML) -> str | None:
+    """Text of a node's name property, None if it has none"""
+    if (properties := node.find(ControlElements.PROPERTIES.value)) is not None:
+        for property in properties:
+            if property.findtext("key") == "name":
+                return property.findtext("value")
+    return None
+
+
 def getTextValueFromKey(properties: ElementXML | Any, key: str) -> str | Any:
     """Find the value.text from a known key"""
     if prop:= properties.find(f"./property/[key='{key}']"):
@@ -448,8 +1411,38 @@ def getTextValueFromKey(properties: ElementXML | Any, key: str) -> str | Any:
         return value.text if value is not None else ""
     return None
 
-def asCtrl(xml:ElementXML) -> Control:
-    pass
+def asCtrl(xml: ElementXML) -> Control:
+    """Decode a <node> and its children into Controls, see ControlDecoder"""
+    return ControlDecoder.build(xml)
+
+def loadControls(inputPath: str, chunkSize: int = CHUNK_SIZE) -> Control:
+    """Decode a .tosc file into Controls while it is parsed.
+    Each <node> is decoded as soon as it ends and then cleared, so the
+    whole document is never held as XML.
+
+    Args:
+        inputPath (str): .tosc file path.
+        chunkSize (int, optional): Bytes read per chunk.
+
+    Returns:
+        Control: The root Control, usually a Group.
+    """
+    parser = ET.XMLPullParser(events=("end",))
+    decoded: dict[ElementXML, Control] = {}
+    root = None
+    for chunk in readChunks(inputPath, chunkSize):
+        parser.feed(chunk)
+        for _, e in parser.read_events():
+            if e.tag != ControlElements.NODE.value:
+                continue
+            root = ControlDecoder.decodeNode(e)
+            if (children := e.find(ControlElements.CHILDREN.value)) is not None:
+                root.children = [decoded.pop(child) for child in children]
+            decoded[e] = root
+            e.clear()
+    parser.close()
+    return root
+
 
 def asXml(source: Control) -> ElementXML:
     return ControlConverter.build(source)
@@ -471,127 +1464,202 @@ COPY AND MOVE
 """
 
 
-def copyProperties(source: ElementTOSC, target: ElementTOSC, *args: str):
-    """Args can be any number of property keys"""
-    if args is None:
-        [target.properties.append(deepcopy(e)) for e in source.properties]
-        return True
-    for arg in args:
-        if elements := source.properties.findall(f"*[key='{arg}']"):
-            [target.properties.append(deepcopy(e)) for e in elements]
-        else:
-            raise ValueError(f"Failed to find all elements with {args}")
-    return True
+def cloneElement(e: ElementXML, newIds: bool = False) -> ElementXML:
+    """Copy an Element and its whole subtree, see cloneElements"""
+    return cloneElements([e], newIds)[0]
 
 
-def moveProperties(source: ElementTOSC, target: ElementTOSC, *args):
-    elements = []
-    if args is None:
-        elements = source.properties
-    for arg in args:
-        if e := source.properties.findall(f"*[key='{arg}']"):
-            elements += e
-        else:
-            raise ValueError(f"Failed to find all elements with {args}")
+def cloneElements(elements: list[ElementXML],
+                  newIds: bool = False) -> list[ElementXML]:
+    """Copy Elements and their subtrees.
 
-    [target.properties.append(deepcopy(e)) for e in elements]
-    [source.properties.remove(e) for e in elements]
+    Each subtree is copied by one copy.deepcopy call. With the C
+    accelerated ElementTree that is a single __deepcopy__ for the whole
+    subtree, which is faster than copying element by element in Python.
+    The pure Python Element is copied by the generic deepcopy.
+
+    Args:
+        elements (list[ET.Element]): Elements to copy.
+        newIds (bool, optional): Give every copied <node> a new ID, and
+        point LOCAL messages that target a copied node to its copy.
+
+    Returns:
+        list[ET.Element]: Copies in the same order.
+    """
+    copies = [deepcopy(e) for e in elements]
+    if not newIds:
+        return copies
+
+    nodes = [n for e in copies for n in e.iter(ControlElements.NODE.value)]
+    ids = {}
+    for node, id in zip(nodes, generateIds(len(nodes))):
+        ids[node.get("ID")] = id
+        node.set("ID", id)
+    for e in copies:
+        for dst in e.iter("dstID"):
+            if dst.text in ids:
+                dst.text = ids[dst.text]
+    return copies
+
+
+def asTargets(target: ElementTOSC | Iterable[ElementTOSC]) -> list[ElementTOSC]:
+    """One or many ElementTOSC as a list"""
+    return [target] if isinstance(target, ElementTOSC) else list(target)
+
+
+def pasteKeyed(elements: list[ElementXML], section: ElementXML) -> bool:
+    """Paste <property> or <value> elements into a section by key.
+
+    An element whose key already exists with the same structure only has
+    its texts written in place. Otherwise the existing one is replaced by
+    a clone, or a clone is appended. Keys are found through the section's
+    KeyIndex if it has one, or else in one pass over the section.
+    If several elements share a key the last one wins.
+    """
+    latest = {e.findtext("key"): e for e in elements}
+    keys, elements = list(latest), list(latest.values())
+    if (index := KeyIndex._indexes.get(section)) is not None:
+        existing = {key: index.get(section, key) for key in keys}
+    else:
+        wanted = set(keys)
+        existing = {}
+        for e in section:
+            if (key := e.findtext("key")) in wanted:
+                existing.setdefault(key, e)
+
+    missing = []
+    for key, e in zip(keys, elements):
+        if (old := existing.get(key)) is not None and copyTexts(e, old):
+            continue
+        if old is not None:
+            section.remove(old)
+            KeyIndex.removed(section, old)
+        missing.append(e)
+    section.extend(cloneElements(missing))
     return True
 
 
-def copyValues(source: ElementTOSC, target: ElementTOSC, *args: str):
-    """Args can be any number of value keys"""
-    if args is None:
-        [target.values.append(deepcopy(e)) for e in source.values]
-        return True
-    for arg in args:
-        if elements := source.values.findall(f"*[key='{arg}']"):
-            [target.values.append(deepcopy(e)) for e in elements]
-        else:
-            raise ValueError(f"Failed to find all elements with {args}")
+def copyTexts(source: ElementXML, target: ElementXML) -> bool:
+    """Write the texts of source into target if both subtrees have the
+    same tags and attributes in the same order, else change nothing."""
+    sources, targets = list(source.iter()), list(target.iter())
+    if len(sources) != len(targets) or any(
+        s.tag != t.tag or s.attrib != t.attrib for s, t in zip(sources, targets)
+    ):
+        return False
+    for s, t in zip(sources, targets):
+        t.text = s.text
     return True
 
 
-def moveValues(source: ElementTOSC, target: ElementTOSC, *args: str):
-    elements = []
-    if args is None:
-        elements = source.values
-    for arg in args:
-        if e := source.values.findall(f"*[key='{arg}']"):
-            elements += e
-        else:
-            raise ValueError(f"Failed to find all elements with {args}")
+def selectElements(
+    section: ElementXML, args: tuple[str, ...], value: Callable[[ElementXML], Any]
+) -> list[ElementXML]:
+    """Children of a section whose value(child) is one of args, in order.
+    All children if args is empty.
 
-    [target.values.append(deepcopy(e)) for e in elements]
-    [source.values.remove(e) for e in elements]
+    Raises:
+        ValueError: If any of the args matches nothing.
+    """
+    if not args:
+        return list(section)
+    wanted = set(args)
+    elements = [e for e in section if value(e) in wanted]
+    if missing := wanted.difference(value(e) for e in elements):
+        raise ValueError(f"Failed to find all elements with {sorted(missing)}")
+    return elements
+
+
+def moveElements(
+    source: ElementXML, target: ElementXML, elements: list[ElementXML]
+) -> bool:
+    """Reparent elements from source to target without copying them.
+    The source's child list is rebuilt once without the moved elements."""
+    moving = set(elements)
+    source[:] = [e for e in source if e not in moving]
+    target.extend(elements)
     return True
 
 
-def copyMessages(source: ElementTOSC, target: ElementTOSC, *args: elementType):
-    """Args can be ControlElements.OSC, MIDI, LOCAL, GAMEPAD"""
-    if args is None:
-        [target.messages.append(deepcopy(e)) for e in source.messages]
-        return True
-    for arg in args:
-        if elements := source.messages.findall(f"./{arg.value}"):
-            [target.messages.append(deepcopy(e)) for e in elements]
-        else:
-            raise ValueError(f"Failed to find all elements with {arg.value}")
+def copyProperties(source: ElementTOSC,
+                   target: ElementTOSC | Iterable[ElementTOSC], *args: str):
+    """Args can be any number of property keys, all if none given.
+    Target can be one ElementTOSC or many, see pasteKeyed."""
+    elements = selectElements(source.properties, args, lambda e: e.findtext("key"))
+    renames = any(e.findtext("key") == "name" for e in elements)
+    for t in asTargets(target):
+        pasteKeyed(elements, t.properties)
+        if renames:
+            DocumentIndex.renamed(t.node)
     return True
 
 
-def moveMessages(source: ElementTOSC, target: ElementTOSC, *args: elementType):
-    elements = []
-    if args is None:
-        elements = source.messages
-    for arg in args:
-        if e := source.messages.findall(f"./{arg.value}"):
-            elements += e
-        else:
-            raise ValueError(f"Failed to find all elements with {arg.value}")
-
-    [target.messages.append(deepcopy(e)) for e in elements]
-    [source.messages.remove(e) for e in elements]
-    return True
+def moveProperties(source: ElementTOSC, target: ElementTOSC, *args: str):
+    """Args can be any number of property keys, all if none given"""
+    elements = selectElements(source.properties, args, lambda e: e.findtext("key"))
+    return moveElements(source.properties, target.properties, elements)
 
 
-def copyChildren(source: ElementTOSC, target: ElementTOSC, *args: elementType):
-    """Args can be ControlType.BOX, BUTTON, etc."""
-    if args is None:
-        [target.children.append(deepcopy(e)) for e in source.children]
-        return True
-    for arg in args:
-        if elements := source.children.findall(
-            f"./{ControlElements.NODE.value}[@type='{arg.value}']"
-        ):
-            [target.children.append(deepcopy(e)) for e in elements]
-        else:
-            raise ValueError(f"Failed to find all elements with {arg.value}")
+def copyValues(source: ElementTOSC,
+               target: ElementTOSC | Iterable[ElementTOSC], *args: str):
+    """Args can be any number of value keys, all if none given.
+    Target can be one ElementTOSC or many, see pasteKeyed."""
+    elements = selectElements(source.values, args, lambda e: e.findtext("key"))
+    for t in asTargets(target):
+        pasteKeyed(elements, t.values)
     return True
 
 
-def moveChildren(source: ElementTOSC, target: ElementTOSC, *args: elementType):
-    elements = []
-    if args is None:
-        elements = source.children
-    for arg in args:
-        if e := source.children.findall(
-            f"./{ControlElements.NODE}[@type='{arg.value}']"
-        ):
-            elements += e
-        else:
-            raise ValueError(f"Failed to find all elements with {arg.value}")
+def moveValues(source: ElementTOSC, target: ElementTOSC, *args: str):
+    """Args can be any number of value keys, all if none given"""
+    elements = selectElements(source.values, args, lambda e: e.findtext("key"))
+    return moveElements(source.values, target.values, elements)
 
-    [target.children.append(deepcopy(e)) for e in elements]
-    [source.children.remove(e) for e in elements]
+
+def copyMessages(source: ElementTOSC,
+                 target: ElementTOSC | Iterable[ElementTOSC], *args: elementType):
+    """Args can be ControlElements.OSC, MIDI, LOCAL, GAMEPAD, all if none given.
+    Target can be one ElementTOSC or many."""
+    elements = selectElements(
+        source.messages, tuple(arg.value for arg in args), lambda e: e.tag
+    )
+    for t in asTargets(target):
+        t.messages.extend(cloneElements(elements))
     return True
 
 
-"""
+def moveMessages(source: ElementTOSC, target: ElementTOSC, *args: elementType):
+    """Args can be ControlElements.OSC, MIDI, LOCAL, GAMEPAD, all if none given"""
+    elements = selectElements(
+        source.messages, tuple(arg.value for arg in args), lambda e: e.tag
+    )
+    return moveElements(source.messages, target.messages, elements)
 
-GENERAL PARSERS
 
-"""
+def copyChildren(source: ElementTOSC,
+                 target: ElementTOSC | Iterable[ElementTOSC], *args: elementType,
+                 newIds: bool = False):
+    """Args can be ControlType.BOX, BUTTON, etc., all if none given.
+    Target can be one ElementTOSC or many.
+    With newIds the copies get new node IDs, see cloneElements."""
+    elements = selectElements(
+        source.children, tuple(arg.value for arg in args), lambda e: e.get("type")
+    )
+    for t in asTargets(target):
+        copies = cloneElements(elements, newIds)
+        t.children.extend(copies)
+        DocumentIndex.attached(t.node, *copies)
+    return True
+
+
+def moveChildren(source: ElementTOSC, target: ElementTOSC, *args: elementType):
+    """Args can be ControlType.BOX, BUTTON, etc., all if none given"""
+    elements = selectElements(
+        source.children, tuple(arg.value for arg in args), lambda e: e.get("type")
+    )
+    moveElements(source.children, target.children, elements)
+    DocumentIndex.moved(target.node, *elements)
+    return True
 
 
 def pullValueFromKey(inputFile: str, key: str, value: str,
@@ -610,14 +1678,14 @@ def pullValueFromKey(inputFile: str, key: str, value: str,
         str: Value
     """
     parser = ET.XMLPullParser()
-    with open(inputFile, "rb") as file:
-        parser.feed(zlib.decompress(file.read()))
+    for chunk in readChunks(inputFile):
+        parser.feed(chunk)
         for _, e in parser.read_events():  # event, element
             if e.find("properties") is None:
                 continue
             if re.fullmatch(getTextValueFromKey(
                     e.find("properties"), key), value):
-                parser.close()
+                # Stop reading, the rest of the file is never parsed
                 return getTextValueFromKey(e.find("properties"), targetKey)
 
     parser.close()
@@ -627,7 +1695,8 @@ def pullValueFromKey(inputFile: str, key: str, value: str,
 def pullValueFromKey2(root: ElementXML, key: str,
                       value: str, targetKey: str) -> str | None:
     """If you know the name of an element but don't know its other properties.
-    This parses an Element and has to convert it to string so its slower.
+    This walks the Element in memory, names are looked up in the
+    DocumentIndex of the root.
 
     Args:
         root (ET.Element): Parses the whole element, so you can feed the root.
@@ -638,31 +1707,37 @@ def pullValueFromKey2(root: ElementXML, key: str,
     Returns:
         str: Value
     """
-    parser = ET.XMLPullParser()
-    parser.feed(ET.tostring(root, encoding="UTF-8"))
-    for _, e in parser.read_events():  # event, element
+    if key == "name":
+        if (node := findNodeByName(root, value)) is None:
+            return None
+        return getTextValueFromKey(node.find("properties"), targetKey)
+
+    for e in root.iter(ControlElements.NODE.value):
         if e.find("properties") is None:
             continue
         if re.fullmatch(getTextValueFromKey(e.find("properties"), key), value):
-            parser.close()
             return getTextValueFromKey(e.find("properties"), targetKey)
     return None
 
-def pullIdfromName(root: ElementXML, name: str) -> str:
-    """
-    """
-    parser = ET.XMLPullParser()
-    parser.feed(ET.tostring(root, encoding="UTF-8"))
-    for _, e in parser.read_events():  # event, element
-        if e.find("properties") is None:
-            continue
-        # xpath ftw
-        if e.find(f"./properties/property/[value='{name}']") is not None:            
-            parser.close()
-            return e.attrib["ID"]
-    
-    raise ValueError(f"{name}'s ID wasn't found.")
 
+def findNodeByName(root: ElementXML, name: str) -> ElementXML | None:
+    """First <node> named name, looked up in the cached DocumentIndex
+    of the root. The index is refreshed once if it misses or is stale."""
+    index = DocumentIndex.of(root)
+    for attempt in range(2):
+        for id in index.getIds(name):
+            if (node := index.getNode(id)) is not None and nodeName(node) == name:
+                return node
+        if attempt == 0:
+            index.refresh()
+    return None
+
+
+def pullIdfromName(root: ElementXML, name: str) -> str:
+    """ID of the first node named name, see findNodeByName"""
+    if (node := findNodeByName(root, name)) is None:
+        raise ValueError(f"{name}'s ID wasn't found.")
+    return node.attrib["ID"]
 
 
 class PropertyParser:
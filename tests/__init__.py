@@ -5,3 +5,6 @@ from .test_parsers import *
 from .test_copiers import *
 from .test_basics import *
 from .test_layout import *
+from .test_indexes import *
+from .test_arrays import *
+from .test_flex import *
@@ -0,0 +1,61 @@
+"""
+Compare frames()/colors() and their bulk write-back with
+per control getFrame/getColor and setFrame/setColor.
+
+python -m tests.bench_arrays
+"""
+import numpy as np
+
+import tosclib as tosc
+from tosclib import ControlType
+from .benchmark import bestTime, compare
+
+
+def buildPage(size: int) -> tosc.ElementTOSC:
+    page = tosc.ElementTOSC(tosc.createGroup())
+    for i in range(size):
+        child = tosc.ElementTOSC(page.createChild(ControlType.BUTTON))
+        child.setName(f"button{i}")
+        child.setFrame((i, i, 10, 10))
+        child.setColor((0.25, 0.5, 0.75, 1.0))
+    return page
+
+
+def readEach(page: tosc.ElementTOSC):
+    children = [tosc.ElementTOSC(e) for e in page.children]
+    F = np.array([e.getFrame() for e in children])
+    C = np.array([e.getColor() for e in children])
+    return F, C
+
+
+def readBulk(page: tosc.ElementTOSC):
+    return tosc.frames(page)[0], tosc.colors(page)[0]
+
+
+def writeEach(page: tosc.ElementTOSC, F: np.ndarray, C: np.ndarray):
+    for e, f, c in zip(page.children, F.tolist(), C.tolist()):
+        e = tosc.ElementTOSC(e)
+        e.setFrame(f)
+        e.setColor(c)
+
+
+def writeBulk(page: tosc.ElementTOSC, F: np.ndarray, C: np.ndarray):
+    nodes = list(page.children)
+    tosc.setFrames(nodes, F)
+    tosc.setColors(nodes, C)
+
+
+def main(size: int = 10000):
+    page = buildPage(size)
+    F, C = readBulk(page)
+    assert np.array_equal(F, readEach(page)[0])
+    compare("read frames and colors", bestTime(readEach, page), bestTime(readBulk, page))
+    compare(
+        "write frames and colors",
+        bestTime(writeEach, page, F + 1, C / 2),
+        bestTime(writeBulk, page, F + 1, C / 2),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Compare createChildren with one createChild and three setters per child,
+on the image converter demo workload: a 64x64 grid of colored boxes.
+The per child path is timed as the first release had it, with XPath key
+lookups and remove-and-rebuild setters, and as it is now.
+
+python -m tests.bench_children
+"""
+import uuid
+import numpy as np
+import xml.etree.ElementTree as ET
+
+import tosclib as tosc
+from tosclib import ControlType
+from .benchmark import bestTime, compare
+
+
+def setBaseline(properties: ET.Element, type: str, key: str,
+                value: str = "", params: dict = {}):
+    """A setter of the first release: find by XPath, remove, rebuild"""
+    if (e := properties.find(f"*[key='{key}']")) is not None:
+        properties.remove(e)
+    property = ET.SubElement(properties, "property", attrib={"type": type})
+    ET.SubElement(property, "key").text = key
+    value_ = ET.SubElement(property, "value")
+    value_.text = value
+    for k in params:
+        ET.SubElement(value_, k).text = params[k]
+
+
+def drawBaseline(pixels: np.ndarray, pxs: int = 4):
+    canvas = tosc.ElementTOSC(tosc.createGroup())
+    for iy, row in enumerate(pixels.tolist()):
+        for ix, (r, g, b) in enumerate(row):
+            box = ET.SubElement(
+                canvas.children, "node",
+                attrib={"ID": str(uuid.uuid4()), "type": ControlType.BOX.value},
+            )
+            # ElementTOSC(box) found or created its four sections
+            for tag in ("properties", "values", "messages", "children"):
+                if box.find(tag) is None:
+                    ET.SubElement(box, tag)
+            properties = box.find("properties")
+            setBaseline(properties, "s", "name", str(f"p{ix}{iy}"))
+            color = (r, g, b, 1)
+            setBaseline(properties, "c", "color",
+                        params={k: repr(color[i]) for i, k in enumerate("rgba")})
+            frame = (ix * pxs, iy * pxs, pxs, pxs)
+            setBaseline(properties, "r", "frame",
+                        params={k: repr(frame[i]) for i, k in enumerate("xywh")})
+    return canvas
+
+
+def drawEach(pixels: np.ndarray, pxs: int = 4):
+    canvas = tosc.ElementTOSC(tosc.createGroup())
+    for iy, row in enumerate(pixels.tolist()):
+        for ix, (r, g, b) in enumerate(row):
+            box = tosc.ElementTOSC(canvas.createChild(ControlType.BOX))
+            box.setName(f"p{ix}{iy}")
+            box.setColor((r, g, b, 1))
+            box.setFrame((ix * pxs, iy * pxs, pxs, pxs))
+    return canvas
+
+
+def drawBulk(pixels: np.ndarray, pxs: int = 4):
+    canvas = tosc.ElementTOSC(tosc.createGroup())
+    iy, ix = np.indices(pixels.shape[:2]).reshape(2, -1)
+    size = np.full(ix.size, pxs)
+    frames = np.stack((ix * pxs, iy * pxs, size, size), axis=1)
+    colors = np.concatenate((pixels.reshape(-1, 3), np.ones((ix.size, 1))), axis=1)
+    names = [f"p{x}{y}" for x, y in zip(ix.tolist(), iy.tolist())]
+    canvas.createChildren(ControlType.BOX, ix.size, frames, colors, names, sections=True)
+    return canvas
+
+
+def main(size: int = 64):
+    pixels = np.random.default_rng(0).random((size, size, 3))
+    baseline, each, bulk = drawBaseline(pixels), drawEach(pixels), drawBulk(pixels)
+    for other in (baseline, each):
+        assert [tosc.ElementView(e).getFrame() for e in other.children] == [
+            tosc.ElementView(e).getFrame() for e in bulk.children
+        ]
+        assert [[s.tag for s in e] for e in other.children] == [
+            [s.tag for s in e] for e in bulk.children
+        ]
+    new = bestTime(drawBulk, pixels)
+    compare(f"{size}x{size} boxes, first release", bestTime(drawBaseline, pixels), new)
+    compare(f"{size}x{size} boxes, setters now", bestTime(drawEach, pixels), new)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Compare building controls with their own default Property lists,
+as the default_factory did, with the shared default tables,
+PropertyFactory.build dispatch with the compiled property builders,
+and recursive conversion from scratch with the ControlConverter.
+
+python -m tests.bench_controls
+"""
+import xml.etree.ElementTree as ET
+
+from tosclib import controls
+from tosclib.controls import XmlFactory
+from tosclib.elements import PropertyFactory, LOCAL, OSC
+from .benchmark import bestTime, compare, peakMemory
+
+
+def buildEach(n: int):
+    return [controls.Box(properties=controls.BoxProperties().build()) for _ in range(n)]
+
+
+def buildShared(n: int):
+    return [controls.Box() for _ in range(n)]
+
+
+def dispatchEach(props, n: int):
+    for _ in range(n):
+        [PropertyFactory.build(k, v) for k, v in vars(props).items()]
+
+
+def buildCompiled(props, n: int):
+    for _ in range(n):
+        props.build()
+
+
+def convertEach(control) -> ET.Element:
+    """Recursive conversion that builds every element, as before."""
+    node = ET.Element("node", attrib={"ID": control.id, "type": control.controlT.value})
+    XmlFactory.buildProperties(
+        ET.SubElement(node, "properties"),
+        controls.mergeProperties(control.defaults, control.properties),
+    )
+    XmlFactory.buildValues(ET.SubElement(node, "values"), control.values)
+    XmlFactory.buildMessages(ET.SubElement(node, "messages"), control.messages)
+    if control.children is not None:
+        children = ET.SubElement(node, "children")
+        for child in control.children:
+            children.append(convertEach(child))
+    return node
+
+
+def largeTree(n: int):
+    """Pager of 3 pages with n controls each, sharing their messages."""
+    messages = [OSC(), LOCAL()]
+    return controls.Pager(children=[
+        controls.Group(children=[
+            (controls.Button if i % 2 else controls.Label)(messages=messages)
+            for i in range(n)
+        ])
+        for _ in range(3)
+    ])
+
+
+def main(n: int = 100000):
+    compare(
+        f"build {n} boxes",
+        bestTime(buildEach, n, repeat=1),
+        bestTime(buildShared, n, repeat=1),
+    )
+    compare(
+        f"build {n} boxes, memory",
+        peakMemory(buildEach, n) / 1e6,
+        peakMemory(buildShared, n) / 1e6,
+        "MB",
+    )
+
+    props = controls.PageProperties()
+    compare(
+        f"build {n // 10} PageProperties",
+        bestTime(dispatchEach, props, n // 10),
+        bestTime(buildCompiled, props, n // 10),
+    )
+
+    tree = largeTree(n // 10)
+    assert ET.tostring(convertEach(tree)) == ET.tostring(controls.ControlConverter.build(tree))
+    compare(
+        f"convert a tree of {3 * n // 10} controls",
+        bestTime(convertEach, tree, repeat=1),
+        bestTime(controls.ControlConverter.build, tree, repeat=1),
+    )
+
+
+if __name__ == "__main__":
+    main()
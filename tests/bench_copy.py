@@ -0,0 +1,69 @@
+"""
+Compare cloneElements with copy.deepcopy on a loaded document,
+and broadcast copyProperties with a per target copy.
+
+python -m tests.bench_copy
+"""
+from copy import deepcopy
+
+import tosclib as tosc
+from tosclib.controls import ControlType
+from .benchmark import bestTime, compare
+
+
+def copyEach(source, targets, *args):
+    """Per target copy, as copyProperties did before broadcasting."""
+    for t in targets:
+        for arg in args:
+            e = source.properties.find(f"*[key='{arg}']")
+            t.properties.append(deepcopy(e))
+
+
+def broadcast(n: int):
+    source = tosc.ElementTOSC(tosc.createGroup())
+    source.setScript("-- " + "x" * 1000)
+    source.setColor((1.0, 0.0, 0.0, 1.0))
+    parent = tosc.ElementTOSC(tosc.createGroup())
+    targets = [tosc.ElementTOSC(e) for e in parent.createChildren(ControlType.BOX, n)]
+    compare(
+        f"copy 2 properties to {n} targets",
+        bestTime(
+            lambda: [copyEach(source, targets, "script", "color"), clear(targets)]
+        ),
+        bestTime(
+            lambda: [
+                tosc.copyProperties(source, targets, "script", "color"),
+                clear(targets),
+            ]
+        ),
+    )
+
+
+def clear(targets):
+    for t in targets:
+        t.properties.clear()
+
+
+def main():
+    root = tosc.load("docs/demos/files/stoic.tosc")
+    nodes = [e for e in root.iter("node") if e.find("children/node") is None]
+    compare(
+        "copy a whole document",
+        bestTime(deepcopy, root),
+        bestTime(tosc.cloneElement, root),
+    )
+    compare(
+        f"copy {len(nodes)} leaf nodes",
+        bestTime(lambda: [deepcopy(e) for e in nodes]),
+        bestTime(tosc.cloneElements, nodes),
+    )
+    compare(
+        "copy a document with new IDs",
+        bestTime(deepcopy, root),
+        bestTime(tosc.cloneElement, root, True),
+    )
+    broadcast(1000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Round trip a large .tosc through the Control model: decode from a loaded
+tree and while streaming, then encode with ControlConverter and with
+writeControls.
+
+python -m tests.bench_decode
+"""
+import tempfile
+from pathlib import Path
+
+import tosclib as tosc
+from .benchmark import bestTime, compare, peakMemory
+
+
+def decodeTree(path) -> tosc.Control:
+    return tosc.asCtrl(tosc.load(path)[0])
+
+
+def main(path: str = "docs/demos/files/stoic.tosc"):
+    control = decodeTree(path)
+    count = sum(1 for _ in tosc.asXml(control).iter("node"))
+    compare(
+        f"decode {count} nodes",
+        bestTime(decodeTree, path, repeat=3),
+        bestTime(tosc.loadControls, path, repeat=3),
+    )
+    compare(
+        "decode peak memory",
+        peakMemory(decodeTree, path) / 2**20,
+        peakMemory(tosc.loadControls, path) / 2**20,
+        "MB",
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        output = Path(directory) / "roundtrip.tosc"
+        compare(
+            "encode the decoded controls",
+            bestTime(lambda: tosc.write(tosc.asRoot(control), output), repeat=3),
+            bestTime(tosc.writeControls, control, output, repeat=3),
+        )
+        compare(
+            "round trip file to file",
+            bestTime(lambda: tosc.write(tosc.asRoot(decodeTree(path)), output), repeat=3),
+            bestTime(lambda: tosc.writeControls(tosc.loadControls(path), output), repeat=3),
+        )
+
+
+if __name__ == "__main__":
+    main()
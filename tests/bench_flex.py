@@ -0,0 +1,76 @@
+"""
+Compare applyFlex with nested layout decorators on a dashboard of
+alternating columns and rows, 6 children per box and 4 levels deep.
+The decorators also write colors, applyFlex only writes frames.
+
+python -m tests.bench_flex
+"""
+import tosclib as tosc
+from tosclib import ControlType, layout
+from tosclib.flex import Flex, applyFlex, flexFrames
+from .benchmark import bestTime, compare
+
+SIZE = (1,) * 6
+FRAME = (0, 0, 3200, 3200)
+
+
+@layout.row
+def level3(children):
+    return None
+
+
+@layout.column
+def level2(children):
+    for child in children:
+        level3(child, ControlType.BOX, SIZE)
+
+
+@layout.row
+def level1(children):
+    for child in children:
+        level2(child, ControlType.GROUP, SIZE)
+
+
+@layout.column
+def level0(children):
+    for child in children:
+        level1(child, ControlType.GROUP, SIZE)
+
+
+def dashboard(depth: int = 4) -> Flex:
+    def box(level: int) -> Flex:
+        direction = "row" if level % 2 else "column"
+        if level == depth:
+            return Flex(controlType=ControlType.BOX)
+        return Flex(direction=direction, children=[box(level + 1) for _ in SIZE])
+
+    root = box(0)
+    root.direction = "column"
+    return root
+
+
+def buildEach():
+    page = tosc.ElementTOSC(tosc.createTemplate(frame=FRAME)[0])
+    return level0(page, ControlType.GROUP, SIZE)
+
+
+def buildFlex():
+    page = tosc.ElementTOSC(tosc.createTemplate(frame=FRAME)[0])
+    return applyFlex(page, dashboard())
+
+
+def main():
+    each, flex = buildEach(), buildFlex()
+    assert len(list(each.node.iter("node"))) == len(list(flex.node.iter("node")))
+    compare("build 1554 controls", bestTime(buildEach), bestTime(buildFlex))
+
+    root = dashboard()
+    compare("solve 1554 frames", bestTime(buildEach), bestTime(flexFrames, root, FRAME))
+
+    page = tosc.ElementTOSC(tosc.createTemplate(frame=FRAME)[0])
+    applyFlex(page, root)
+    compare("relayout 1554 controls", bestTime(buildEach), bestTime(applyFlex, page, root))
+
+
+if __name__ == "__main__":
+    main()
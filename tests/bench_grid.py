@@ -0,0 +1,83 @@
+"""
+Compare the grid frames and colors of gridFrames and gridColors with the
+former tuple comprehension and colorStyle branches of layout.grid.
+
+python -m tests.bench_grid
+"""
+import numpy as np
+
+from tosclib import layout
+from .benchmark import bestTime, compare
+
+
+def gridEach(frame: tuple, size: tuple, colors: tuple, colorStyle: int):
+    w = frame[2] / size[0]
+    h = frame[3] / size[1]
+    M = np.asarray(
+        tuple(
+            (row, column)
+            for row in np.arange(stop=frame[2], step=w)
+            for column in np.arange(stop=frame[3], step=h)
+        )
+    ).T
+
+    X = M[0]
+    Y = M[1]
+    W = np.repeat(w, X.size)
+    H = np.repeat(h, Y.size)
+    F = np.asarray((X, Y, W, H, X)).T
+
+    if colorStyle == 0:
+        C = np.linspace(colors[0], colors[1], size[0])
+        C = np.repeat(C.T, size[1]).T.reshape(4, size[0] * size[1]).T
+    elif colorStyle == 1:
+        C = np.linspace(colors[0], colors[1], size[1])
+        C = np.asarray(np.resize(C, size[0] * C.size)).reshape(size[0] * size[1], 4)
+    elif colorStyle == 2:
+        C = np.linspace(colors[0], colors[1], size[0] * size[1])
+    elif colorStyle == 3:
+        C = np.linspace(colors[0], colors[1], size[0] * size[1])
+        C = np.asarray([C[i :: size[0]] for i in range(size[0])]).reshape(
+            size[0] * size[1], 4
+        )
+    else:
+        C = np.linspace(colors[0], colors[1], size[0] * size[1])
+        C = np.roll(C, colorStyle * 4)
+        C[0:colorStyle] = np.flip(
+            np.roll(C, (-1 - colorStyle) * 4)[0:colorStyle], axis=0
+        )
+    return F, C
+
+
+def gridBulk(frame: tuple, size: tuple, colors: tuple, colorStyle: int | str):
+    return layout.gridFrames(frame, size), layout.gridColors(size, colors, colorStyle)
+
+
+COLORS = ((0.8, 0.4, 0.5, 1.0), (0.36, 0.2, 0.3, 1.0))
+
+
+def main():
+    frame = (0, 0, 1600, 1600)
+    for size in ((1, 1), (3, 3), (4, 7), (16, 5), (5, 16), (8, 8)):
+        for colorStyle in range(10):
+            F, C = gridEach(frame, size, COLORS, colorStyle)
+            G, D = gridBulk(frame, size, COLORS, colorStyle)
+            assert np.array_equal(F[:, :4], G) and np.array_equal(C, D), (size, colorStyle)
+
+    for side in (100, 1000):
+        size = (side, side)
+        for colorStyle in (0, 3, 4):
+            compare(
+                f"{side}x{side} colorStyle {colorStyle}",
+                bestTime(gridEach, frame, size, COLORS, colorStyle, repeat=3),
+                bestTime(gridBulk, frame, size, COLORS, colorStyle, repeat=3),
+            )
+        corners = COLORS + ((0.0, 0.0, 1.0, 1.0), (1.0, 1.0, 0.0, 1.0))
+        for style, colors in (("bilinear", corners), ("radial", COLORS)):
+            title = f"{side}x{side} {style}"
+            new = bestTime(gridBulk, frame, size, colors, style, repeat=3)
+            print(f"{title:<40} new {new:>12.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare the streaming .tosc reader and writer with
+whole file decompress/parse and serialize/compress,
+and writeControls with converting Controls to Elements first.
+
+python -m tests.bench_io
+"""
+import tempfile
+import zlib
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import tosclib as tosc
+from tosclib.elements import ControlType
+from .benchmark import bestTime, peakMemory, transientMemory, compare
+from .bench_controls import largeTree
+
+
+def loadWhole(inputPath) -> ET.Element:
+    """The previous tosc.load"""
+    with open(inputPath, "rb") as file:
+        return ET.fromstring(zlib.decompress(file.read()))
+
+
+def writeWhole(root: ET.Element, outputPath):
+    """The previous tosc.write"""
+    with open(outputPath, "wb") as file:
+        file.write(zlib.compress(ET.tostring(root, encoding="UTF-8", method="xml")))
+
+
+def buildTemplate(path: Path, size: int):
+    root = tosc.createTemplate(frame=(0, 0, 1000, 1000))
+    parent = tosc.ElementTOSC(root[0])
+    for i in range(size):
+        child = tosc.ElementTOSC(parent.createChild(ControlType.BOX))
+        child.setName(f"box{i}")
+        child.setFrame((i % 100, i // 100, 10, 10))
+        child.setColor((0.25, 0.5, 0.75, 1.0))
+        child.setScript(f"-- script {i}\n" * 20)
+    tosc.write(root, path)
+
+
+def main(size: int = 20000):
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "bench.tosc"
+        buildTemplate(path, size)
+
+        assert ET.tostring(tosc.load(path)) == ET.tostring(loadWhole(path))
+
+        compare("load time", bestTime(loadWhole, path), bestTime(tosc.load, path))
+        compare(
+            "load peak memory",
+            peakMemory(loadWhole, path) / 2**20,
+            peakMemory(tosc.load, path) / 2**20,
+            "MB",
+        )
+        compare(
+            "load memory on top of the tree",
+            transientMemory(loadWhole, path) / 2**20,
+            transientMemory(tosc.load, path) / 2**20,
+            "MB",
+        )
+
+        root = tosc.load(path)
+        old, new = Path(directory) / "old.tosc", Path(directory) / "new.tosc"
+        writeWhole(root, old)
+        tosc.write(root, new)
+        assert old.read_bytes() == new.read_bytes()
+
+        compare(
+            "write time",
+            bestTime(writeWhole, root, old),
+            bestTime(tosc.write, root, new),
+        )
+        compare(
+            "write peak memory",
+            peakMemory(writeWhole, root, old) / 2**20,
+            peakMemory(tosc.write, root, new) / 2**20,
+            "MB",
+        )
+
+        tree = largeTree(size // 10)
+        tosc.write(tosc.asRoot(tree), old)
+        tosc.writeControls(tree, new)
+        assert old.read_bytes() == new.read_bytes()
+        compare(
+            f"write {3 * size // 10} controls",
+            bestTime(lambda: tosc.write(tosc.asRoot(tree), old), repeat=1),
+            bestTime(tosc.writeControls, tree, new, repeat=1),
+        )
+
+
+if __name__ == "__main__":
+    main()
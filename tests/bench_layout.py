@@ -0,0 +1,113 @@
+"""
+Compare layout.Layout building all children in one step with the former
+wrapper and two setters per child, on grids of cells.
+
+python -m tests.bench_layout
+"""
+import os
+import tempfile
+
+import numpy as np
+
+import tosclib as tosc
+from tosclib import ControlType, layout
+from .benchmark import bestTime, compare
+
+
+def layoutEach(parent: tosc.ElementTOSC, controlT, F: np.ndarray, C: np.ndarray, func):
+    children = [tosc.ElementTOSC(parent.createChild(controlT)) for i in range(F.shape[0])]
+    for g, f, c in zip(children, F, C):
+        g.setFrame(f.astype(int))
+        g.setColor(c)
+    func(children)
+    return parent
+
+
+def gridArrays(size: int):
+    x, y = np.meshgrid(np.arange(size) * 16.0, np.arange(size) * 16.0, indexing="ij")
+    F = np.stack((x.ravel(), y.ravel(), np.full(x.size, 16.0), np.full(x.size, 16.0)), axis=1)
+    C = np.linspace((0.25, 0.25, 0.25, 1.0), (0.5, 0.5, 0.5, 1.0), x.size)
+    return F, C
+
+
+def build(func, size: int):
+    F, C = gridArrays(size)
+    parent = tosc.ElementTOSC(tosc.createGroup())
+    return func(parent, ControlType.BOX, F, C, lambda children: None)
+
+
+@layout.grid
+def cells(children):
+    return None
+
+
+def buildSizes(sizes: list):
+    for size in sizes:
+        parent = tosc.ElementTOSC(tosc.createTemplate(frame=(0, 0, 1600, 1600))[0])
+        cells(parent, ControlType.BOX, size)
+
+
+def planSizes(sizes: list):
+    return [cells.plan((0, 0, 1600, 1600), ControlType.BOX, size) for size in sizes]
+
+
+@layout.column
+def strip(children):
+    return None
+
+
+@layout.grid
+def panel(children):
+    for child in children:
+        strip(child, ControlType.BUTTON, (1, 2, 1), ("#CE6A85", "#5C374C"))
+
+
+DEVICES = [f"device{i}" for i in range(20)]
+PANEL = ((0, 0, 1600, 1600), ControlType.GROUP, (8, 8), ("#202020", "#404040"), 2)
+
+
+def fillDevice(device: str):
+    def fill(path, children):
+        if path:
+            children[0].setScript(f"-- {device} {path}")
+    return fill
+
+
+def templatesEach():
+    for device in DEVICES:
+        parent = tosc.ElementTOSC(tosc.createTemplate(frame=PANEL[0])[0])
+        panel(parent, *PANEL[1:])
+        for path, child in enumerate(parent):
+            child[0].setScript(f"-- {device} {(path,)}")
+
+
+def templatesPlanned(path: str):
+    plan = layout.cachedPlan(path, panel, *PANEL)
+    for device in DEVICES:
+        parent = tosc.ElementTOSC(tosc.createTemplate(frame=PANEL[0])[0])
+        plan.apply(parent, fillDevice(device))
+
+
+def main():
+    for size in (10, 50, 100):
+        each, bulk = build(layoutEach, size), build(layout.Layout, size)
+        assert [e.getFrame() for e in each] == [e.getFrame() for e in bulk]
+        assert [e.getColor() for e in each] == [e.getColor() for e in bulk]
+        compare(
+            f"{size}x{size} cells",
+            bestTime(build, layoutEach, size),
+            bestTime(build, layout.Layout, size),
+        )
+    sizes = [(x, y) for x in range(1, 21) for y in range(1, 21)]
+    compare("400 candidate grid sizes", bestTime(buildSizes, sizes), bestTime(planSizes, sizes))
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "panel.plan")
+        compare(
+            f"{len(DEVICES)} templates, cached plan",
+            bestTime(templatesEach, repeat=3),
+            bestTime(templatesPlanned, path, repeat=3),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Compare reparenting moves with the previous deepcopy and remove moves.
+
+python -m tests.bench_move
+"""
+from copy import deepcopy
+
+import tosclib as tosc
+from tosclib import ControlType
+from .benchmark import bestTime, compare
+
+
+def moveChildrenCopy(source: tosc.ElementTOSC, target: tosc.ElementTOSC):
+    """The previous moveChildren"""
+    elements = source.children.findall("./node[@type='BOX']")
+    [target.children.append(deepcopy(e)) for e in elements]
+    [source.children.remove(e) for e in elements]
+
+
+def buildPair(size: int) -> tuple[tosc.ElementTOSC, tosc.ElementTOSC]:
+    source = tosc.ElementTOSC(tosc.createGroup())
+    target = tosc.ElementTOSC(tosc.createGroup())
+    names = [f"box{i}" for i in range(size)]
+    frames = [(i, i, 10, 10) for i in range(size)]
+    source.createChildren(ControlType.BOX, size, frames=frames, names=names)
+    source.createChildren(ControlType.BUTTON, size, frames=frames, names=names)
+    return source, target
+
+
+def main():
+    for size in (1000, 5000):
+        pairs = [buildPair(size) for _ in range(6)]
+        old = bestTime(lambda: moveChildrenCopy(*pairs.pop()), repeat=3)
+        new = bestTime(
+            lambda: tosc.moveChildren(*pairs.pop(), ControlType.BOX), repeat=3
+        )
+        compare(f"move {size} of {2 * size} children", old, new)
+
+
+if __name__ == "__main__":
+    main()
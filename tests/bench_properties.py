@@ -0,0 +1,98 @@
+"""
+Compare property lookups through KeyIndex with the XPath scan
+that findKey used before, on controls with wide property lists,
+and in place setters with the previous remove and recreate.
+
+python -m tests.bench_properties
+"""
+import xml.etree.ElementTree as ET
+
+import tosclib as tosc
+from tosclib import Property, XmlFactory
+from .benchmark import bestTime, compare
+
+
+def findKeyXPath(elements: ET.Element, key: str) -> ET.Element | None:
+    """The previous findKey"""
+    return elements.find(f"*[key='{key}']")
+
+
+def buildControl(width: int) -> tosc.ElementTOSC:
+    element = tosc.ElementTOSC(tosc.createGroup())
+    for i in range(width):
+        element.createProperty(Property("s", f"key{i}", f"value{i}"))
+    return element
+
+
+def lookupsXPath(element: tosc.ElementTOSC, keys: list[str]):
+    for key in keys:
+        findKeyXPath(element.properties, key)
+
+
+def lookups(element: tosc.ElementTOSC, keys: list[str]):
+    for key in keys:
+        element.getProperty(key)
+
+
+def editsXPath(element: tosc.ElementTOSC, keys: list[str]):
+    for key in keys:
+        XmlFactory.modifyProperty(findKeyXPath(element.properties, key), "x", {})
+
+
+def edits(element: tosc.ElementTOSC, keys: list[str]):
+    for key in keys:
+        element.setProperty(key, "x")
+
+
+def settersReplace(element: tosc.ElementTOSC, frame: tuple, color: tuple):
+    """The previous setFrame and setColor"""
+    for key, type, params, values in (
+        ("frame", "r", "xywh", frame),
+        ("color", "c", "rgba", color),
+    ):
+        element.removeProperty(key)
+        element.createPropertyUnsafe(
+            Property(type, key, params={k: repr(v) for k, v in zip(params, values)})
+        )
+
+
+def setters(element: tosc.ElementTOSC, frame: tuple, color: tuple):
+    element.setFrame(frame)
+    element.setColor(color)
+
+
+def main(controls: int = 200):
+    for width in (10, 40, 100):
+        elements = [buildControl(width) for _ in range(controls)]
+        keys = [f"key{i}" for i in range(width)]
+
+        def run(func):
+            return lambda: [func(e, keys) for e in elements]
+
+        compare(
+            f"getProperty x{width}",
+            bestTime(run(lookupsXPath)),
+            bestTime(run(lookups)),
+        )
+        compare(
+            f"setProperty x{width}",
+            bestTime(run(editsXPath)),
+            bestTime(run(edits)),
+        )
+
+    elements = [buildControl(40) for _ in range(controls)]
+    [setters(e, (0, 0, 1, 1), (1.0, 1.0, 1.0, 1.0)) for e in elements]
+
+    def run(func):
+        args = (1, 2, 3, 4), (0.5, 0.5, 0.5, 1.0)
+        return lambda: [func(e, *args) for e in elements]
+
+    compare(
+        "setFrame + setColor",
+        bestTime(run(settersReplace)),
+        bestTime(run(setters)),
+    )
+
+
+if __name__ == "__main__":
+    main()
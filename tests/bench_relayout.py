@@ -0,0 +1,74 @@
+"""
+Compare setFrame on a layout parent, which lays out its recorded subtree
+again in place, with removing its children and running the layout again.
+The template has 20500 controls: a 10x10 grid of panels, each a column of
+4 rows of 50 boxes.
+
+python -m tests.bench_relayout
+"""
+import tosclib as tosc
+from tosclib import ControlType, layout
+from .benchmark import bestTime, compare
+
+FRAME = (0, 0, 4000, 4000)
+
+
+@layout.row
+def strip(children):
+    return None
+
+
+@layout.column
+def panel(children):
+    for child in children:
+        strip(child, ControlType.BOX, (1,) * 50)
+
+
+@layout.grid
+def page(children):
+    for child in children:
+        panel(child, ControlType.GROUP, (1, 1, 1, 1))
+
+
+def template() -> tosc.ElementTOSC:
+    parent = tosc.ElementTOSC(tosc.createTemplate(frame=FRAME)[0])
+    return page(parent, ControlType.GROUP, (10, 10))
+
+
+def rebuildPanel(parent: tosc.ElementTOSC, frame: tuple):
+    target = parent[0]
+    for child in list(target.children):
+        target.children.remove(child)
+    target.setFrame(frame)
+    panel(target, ControlType.GROUP, (1, 1, 1, 1))
+
+
+def resizePanel(parent: tosc.ElementTOSC, frame: tuple):
+    parent[0].setFrame(frame)
+
+
+def rebuildPage(frame: tuple):
+    parent = tosc.ElementTOSC(tosc.createTemplate(frame=frame)[0])
+    return page(parent, ControlType.GROUP, (10, 10))
+
+
+def main():
+    parent = template()
+    assert len(list(parent.node.iter("node"))) == 20501
+    compare(
+        "resize 1 of 100 panels",
+        bestTime(rebuildPanel, template(), (0, 0, 300, 500)),
+        bestTime(resizePanel, parent, (0, 0, 300, 500)),
+    )
+    compare(
+        "resize the whole page",
+        bestTime(rebuildPage, (0, 0, 3000, 3000), repeat=3),
+        bestTime(parent.setFrame, (0, 0, 3000, 3000), repeat=3),
+    )
+    fresh = rebuildPage((0, 0, 3000, 3000))
+    frames = [tosc.ElementTOSC(n).getFrame() for n in parent.node.iter("node")]
+    assert frames == [tosc.ElementTOSC(n).getFrame() for n in fresh.node.iter("node")]
+
+
+if __name__ == "__main__":
+    main()
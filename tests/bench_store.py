@@ -0,0 +1,74 @@
+"""
+Compare a loaded ElementTree document with a DocumentStore on a page of
+100k boxes: memory held, name lookup, moving every frame and writing.
+
+python -m tests.bench_store
+"""
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+import tosclib as tosc
+from tosclib import ControlType
+from .benchmark import bestTime, compare, heldMemory
+
+
+def buildDocument(path: Path, n: int):
+    root = tosc.createTemplate(frame=(0, 0, 1000, 1000))
+    page = tosc.ElementTOSC(root[0])
+    i = np.arange(n)
+    frames = np.stack((i % 1000, i // 1000, np.full(n, 10), np.full(n, 10)), axis=1)
+    colors = np.random.default_rng(0).random((n, 4))
+    nodes = page.createChildren(ControlType.BOX, n, frames, colors, [f"box{k}" for k in range(n)])
+    for node in nodes:
+        tosc.ElementTOSC(node)
+    tosc.write(root, path)
+
+
+def moveTree(root):
+    F, nodes = tosc.frames(root)
+    F[:, 1] += 10
+    tosc.setFrames(nodes, F)
+
+
+def moveStore(store):
+    store.frames[store.hasFrame, 1] += 10
+
+
+def main(n: int = 100000):
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "boxes.tosc"
+        buildDocument(path, n)
+        root, store = tosc.load(path), tosc.DocumentStore.load(path)
+        assert tosc.ET.tostring(root) == tosc.ET.tostring(store.toRoot())
+
+        compare(
+            f"memory held, {n} boxes",
+            heldMemory(tosc.load, path) / 2**20,
+            heldMemory(tosc.DocumentStore.load, path) / 2**20,
+            "MB",
+        )
+        compare(
+            "load time",
+            bestTime(tosc.load, path, repeat=1),
+            bestTime(tosc.DocumentStore.load, path, repeat=1),
+        )
+        page = tosc.ElementTOSC(root[0])
+        name = f"box{n - 1}"
+        compare(
+            "find a name",
+            bestTime(lambda: list(page.findAll(name=name))),
+            bestTime(store.find, name),
+        )
+        compare("move every frame", bestTime(moveTree, root), bestTime(moveStore, store))
+        output = Path(directory) / "out.tosc"
+        compare(
+            "write",
+            bestTime(tosc.write, root, output, repeat=1),
+            bestTime(store.write, output, repeat=1),
+        )
+
+
+if __name__ == "__main__":
+    main()
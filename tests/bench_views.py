@@ -0,0 +1,63 @@
+"""
+Compare walking a loaded document with ElementTOSC and with ElementView,
+and repeat navigation with new wrappers and with cached ones.
+
+python -m tests.bench_views
+"""
+import tosclib as tosc
+from .benchmark import bestTime, compare, peakMemory
+
+
+def walkTOSC(root):
+    return [tosc.ElementTOSC(e).getName() for e in root.iter("node")]
+
+
+def walkView(root):
+    return [tosc.ElementView(e).getName() for e in root.iter("node")]
+
+
+def navigateEach(e: tosc.ElementTOSC, n: int):
+    for _ in range(n):
+        tosc.ElementTOSC(tosc.ElementTOSC(e.children[1]).children[0])
+
+
+def navigateCached(e: tosc.ElementTOSC, n: int):
+    for _ in range(n):
+        e[1][0]
+
+
+def main():
+    file = "docs/demos/files/stoic.tosc"
+    compare(
+        "walk a document, time",
+        bestTime(walkTOSC, tosc.load(file)),
+        bestTime(walkView, tosc.load(file)),
+    )
+    compare(
+        "walk a document, memory",
+        peakMemory(walkTOSC, tosc.load(file)) / 1e6,
+        peakMemory(walkView, tosc.load(file)) / 1e6,
+        "MB",
+    )
+    root = tosc.load(file)
+    walkTOSC(root)
+    grown = len(tosc.ET.tostring(root))
+    root = tosc.load(file)
+    walkView(root)
+    compare(
+        "serialized size after walk",
+        grown / 1e6,
+        len(tosc.ET.tostring(root)) / 1e6,
+        "MB",
+    )
+
+    main = tosc.ElementTOSC(tosc.load(file)[0])
+    compare(
+        "navigate main[1][0] 10000 times",
+        bestTime(navigateEach, main, 10000),
+        bestTime(navigateCached, main, 10000),
+    )
+
+
+if __name__ == "__main__":
+    main()
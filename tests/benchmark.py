@@ -0,0 +1,52 @@
+import time
+import tracemalloc
+
+
+def bestTime(func, *args, repeat: int = 5, **kwargs) -> float:
+    """Best wall time in seconds out of repeat calls"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peakMemory(func, *args, **kwargs) -> int:
+    """Peak traced memory in bytes allocated during a single call"""
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def transientMemory(func, *args, **kwargs) -> int:
+    """Peak memory in bytes minus the memory still held by the result"""
+    tracemalloc.start()
+    try:
+        result = func(*args, **kwargs)
+        current, peak = tracemalloc.get_traced_memory()
+        del result
+        return peak - current
+    finally:
+        tracemalloc.stop()
+
+
+def compare(title: str, old: float, new: float, unit: str = "s"):
+    """Print old vs new measurements and the ratio between them"""
+    ratio = old / new if new else float("inf")
+    print(f"{title:<40} old {old:>12.4f}{unit}  new {new:>12.4f}{unit}  x{ratio:.1f}")
+
+
+def heldMemory(func, *args, **kwargs) -> int:
+    """Memory in bytes still held by the result of a single call"""
+    tracemalloc.start()
+    try:
+        result = func(*args, **kwargs)
+        current = tracemalloc.get_traced_memory()[0]
+        del result
+        return current
+    finally:
+        tracemalloc.stop()
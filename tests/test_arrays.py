@@ -0,0 +1,106 @@
+import glob
+import os
+import numpy as np
+import tosclib as tosc
+from tosclib import ControlType
+from .profiler import profile
+
+
+@profile
+def test_arrays():
+    root = tosc.load("docs/demos/files/stoic.tosc")
+    F, nodes = tosc.frames(root)
+    C, colored = tosc.colors(root)
+    assert F.shape == (len(nodes), 4)
+    assert C.shape == (len(colored), 4)
+    for node, f, c in zip(nodes[:50], F, C):
+        element = tosc.ElementTOSC(node)
+        assert element.getFrame() == tuple(f)
+        assert element.getColor() == tuple(c)
+
+    """A <node> or ElementTOSC only covers its descendants."""
+    main = tosc.ElementTOSC(root[0])
+    assert len(tosc.frames(main)[1]) == len(nodes) - 1
+    assert len(tosc.frames(root[0])[1]) == len(nodes) - 1
+
+    """Write back in place, in bulk."""
+    F[:, 0] += 10
+    C[:, 3] = 0.5
+    assert tosc.setFrames(nodes, F)
+    assert tosc.setColors(colored, C)
+    assert np.array_equal(tosc.frames(root)[0], F)
+    assert np.array_equal(tosc.colors(root)[0], C)
+    assert tosc.ElementTOSC(nodes[3]).getX() == F[3][0]
+
+    """Nodes without the property get one."""
+    parent = tosc.ElementTOSC(tosc.createGroup())
+    boxes = [parent.createChild(ControlType.BOX) for _ in range(3)]
+    tosc.ElementTOSC(boxes[0]).setFrame((1, 1, 1, 1))
+    assert tosc.frames(parent)[1] == boxes[:1]
+    assert tosc.setFrames(boxes, np.arange(12.0).reshape(3, 4))
+    assert tosc.ElementTOSC(boxes[2]).getFrame() == (8, 9, 10, 11)
+    assert len(tosc.ElementTOSC(boxes[0]).properties) == 1
+    assert tosc.setColors(boxes, np.ones((3, 4)))
+    assert tosc.ElementTOSC(boxes[1]).getColor() == (1.0, 1.0, 1.0, 1.0)
+
+
+@profile
+def test_store():
+    path = "docs/demos/files/stoic.tosc"
+    root = tosc.load(path)
+    store = tosc.DocumentStore.load(path, 1000)
+    assert len(store) == sum(1 for _ in root.iter("node"))
+    assert len(store.templates) < len(store)
+    assert tosc.ET.tostring(store.toRoot()) == tosc.ET.tostring(root)
+    assert tosc.ET.tostring(tosc.DocumentStore.fromRoot(root).toRoot()) == (
+        tosc.ET.tostring(root)
+    )
+
+    """Columns match the tree"""
+    F, nodes = tosc.frames(root)
+    assert np.array_equal(store.frames[store.hasFrame], F)
+    ids = [n.get("ID") for n in root.iter("node")]
+    assert store.ids.tolist() == ids
+    rows = store.find(tosc.ElementView(nodes[10]).getName())
+    assert nodes[10].get("ID") in store.ids[rows].tolist()
+    row = int(rows[0])
+    top = tosc.ElementTOSC(root[0])
+    assert store.ids[store.children(0)].tolist() == [c.getID() for c in top]
+    assert store.ids[store.subtree(0)].tolist() == ids
+    groups = list(root.iter("node"))
+    groups = [n for n in groups if n.get("type") == ControlType.GROUP.value]
+    assert len(store.ofType(ControlType.GROUP)) == len(groups)
+
+    """Edits are written on materialize"""
+    store.frames[row, 0] = 7
+    store.names[row] = "a & b"
+    node = next(n for n in store.toRoot().iter("node") if n.get("ID") == ids[row])
+    assert tosc.ElementView(node).getX() == 7
+    assert tosc.ElementView(node).getName() == "a & b"
+
+
+@profile
+def test_store_round_trip():
+    paths = sorted(glob.glob("docs/demos/files/*.tosc"))
+    root = tosc.createTemplate()
+    group = tosc.ElementTOSC(root[0])
+    group.setName("grid")
+    group.createChildren(
+        ControlType.BUTTON, 3, frames=[(0.5, 0, 10, 10)] * 3, names="abc", sections=True
+    )
+    tosc.ElementTOSC(group.createChild(ControlType.BOX)).setColor((1.0, 0.5, 0, 1))
+    tosc.write(root, "tests/test_round_trip.tosc")
+    paths.append("tests/test_round_trip.tosc")
+    for path in paths:
+        root = tosc.load(path)
+        text = tosc.ET.tostring(root, encoding="unicode")
+        assert "".join(tosc.DocumentStore.load(path, 1000).iterText()) == text
+        assert "".join(tosc.DocumentStore.fromRoot(root).iterText()) == text
+    os.remove("tests/test_round_trip.tosc")
+
+    """Only edited params are rewritten"""
+    store = tosc.DocumentStore.load("docs/demos/files/out.tosc")
+    row = int(np.flatnonzero(store.hasFrame)[0])
+    store.frames[row, 2] = 12.0
+    edited = tosc.ET.tostring(store.toRoot(), encoding="unicode")
+    assert edited.count("<w>12</w>") == 1
@@ -1,3 +1,5 @@
+import pytest
+import numpy as np
 import tosclib as tosc
 from .profiler import profile
 from tosclib import Value, Partial, ControlType, OSC
@@ -99,3 +101,145 @@ end
         )
 
     return "tests/test_basics.prof"
+
+
+@profile
+def test_create_children():
+    root = tosc.createTemplate()
+    parent = tosc.ElementTOSC(root[0])
+    index = tosc.DocumentIndex(root)
+
+    frames = [(i * 10, 0, 10, 10) for i in range(5)]
+    colors = [(i / 5, 0.0, 1.0, 1.0) for i in range(5)]
+    names = [f"child{i}" for i in range(5)]
+    nodes = parent.createChildren(ControlType.BOX, 5, frames, colors, names)
+
+    assert list(parent.children) == nodes
+    assert len({node.get("ID") for node in nodes}) == 5
+    for node, frame, color, name in zip(nodes, frames, colors, names):
+        child = tosc.ElementTOSC(node)
+        assert child.isControlType(ControlType.BOX)
+        assert child.getFrame() == frame
+        assert child.getColor() == color
+        assert child.getName() == name
+        assert index.getIds(name) == [child.getID()]
+
+    """Only the given properties, arrays work too."""
+    nodes = parent.createChildren(ControlType.LABEL, 2, names=("a", "b"))
+    assert [tosc.ElementTOSC(n).getName() for n in nodes] == ["a", "b"]
+    assert not tosc.ElementTOSC(nodes[0]).hasProperty("frame")
+    nodes = parent.createChildren(ControlType.BOX, 3, frames=np.ones((3, 4)) * 2.7)
+    assert tosc.ElementTOSC(nodes[2]).getFrame() == (2, 2, 2, 2)
+
+    with pytest.raises(ValueError):
+        parent.createChildren(ControlType.BOX, 3, names=("a", "b"))
+
+
+@profile
+def test_update():
+    element = tosc.ElementTOSC(tosc.createGroup())
+    element.setName("first")
+    element.setFrame((0, 0, 10, 10))
+    element.setColor((1.0, 0.0, 0.0, 1.0))
+    element.setVisible(True)
+    properties = list(element.properties)
+
+    """Setters modify in place and keep the order."""
+    assert element.setName("second")
+    assert element.setFrame((1, 2, 3, 4))
+    assert element.setColor((0.5, 0.5, 0.5, 1.0))
+    assert element.setVisible(False)
+    assert list(element.properties) == properties
+    assert element.getName() == "second"
+    assert element.getFrame() == (1, 2, 3, 4)
+    assert element.getPropertyValue("visible").text == "0"
+
+    """A property of another type is replaced."""
+    element.createPropertyUnsafe(tosc.Property("i", "tag", "3"))
+    assert element.setTag("label")
+    assert element.getProperty("tag").get("type") == "s"
+    assert element.getPropertyValue("tag").text == "label"
+
+    """Many properties in one pass, new ones are created."""
+    assert element.update(
+        name="third",
+        frame=(5, 6, 7, 8),
+        visible=True,
+        textSize=12,
+        script="-- lua",
+    )
+    assert element.getName() == "third"
+    assert element.getFrame() == (5, 6, 7, 8)
+    assert element.getPropertyValue("visible").text == "1"
+    assert element.getPropertyValue("textSize").text == "12"
+    assert element.getProperty("textSize").get("type") == "i"
+    assert element.getPropertyValue("script").text == "-- lua"
+    assert list(element.properties)[:4] == properties
+    assert len(element.properties.findall("*[key='name']")) == 1
+
+    """Missing frames and colors take their type from the key."""
+    missing = tosc.ElementTOSC(tosc.createGroup())
+    assert missing.update(color=(1, 0, 0, 1), frame=np.array([1, 2, 3, 4]))
+    assert missing.getProperty("color").get("type") == "c"
+    assert missing.getColor() == (1.0, 0.0, 0.0, 1.0)
+    assert missing.getProperty("frame").get("type") == "r"
+    assert missing.getFrame() == (1, 2, 3, 4)
+
+
+@profile
+def test_view():
+    root = tosc.load("docs/demos/files/stoic.tosc")
+    before = tosc.ET.tostring(root)
+    names = []
+
+    def walk(view: tosc.ElementView):
+        for child in view:
+            names.append(child.getName())
+            child.getFrame()
+            child.hasValue("touch")
+            len(child.messages)
+            walk(child)
+
+    view = tosc.ElementView(root[0])
+    walk(view)
+    assert tosc.ET.tostring(root) == before
+    assert len(names) == sum(1 for _ in root[0].iter("node")) - 1
+    assert not hasattr(view, "__dict__")
+
+    """Missing sections read as empty and are not created"""
+    node = tosc.ET.Element("node", ID="0", type="BOX")
+    view = tosc.ElementView(node)
+    assert len(view) == 0 and not view.hasProperty("name")
+    assert list(view) == [] and len(node) == 0
+    view.edit().setName("box")
+    assert tosc.ElementView(node).getName() == "box"
+
+
+@profile
+def test_wrapper_cache():
+    parent = tosc.ElementTOSC(tosc.createGroup())
+    parent.createChildren(ControlType.BOX, 5)
+    first = parent[0]
+    assert isinstance(first, tosc.ElementTOSC)
+    assert parent[0] is first and tosc.ElementTOSC(parent.node)[0] is first
+    assert [c.node for c in parent] == list(parent.children)
+    assert next(iter(parent)) is first and parent[:2][0] is first
+
+    """Wrapping a child again, as before children were wrapped"""
+    box = tosc.ElementTOSC(tosc.createGroup())
+    first.append(box)
+    assert tosc.ElementTOSC(first).node is first.node
+    assert tosc.ElementTOSC(first)[0].node is box.node
+    assert tosc.ElementView(first).node is first.node
+    assert tosc.ElementView(tosc.ElementView(first)).node is first.node
+
+    """Removed children are dropped from the cache eventually"""
+    for _ in range(3):
+        parent.children.remove(parent.children[0])
+        parent.createChild(ControlType.BUTTON)
+        [c for c in parent]
+    cache = tosc.ElementTOSC._wrappers[parent.children]
+    assert len(cache) <= 2 * len(parent.children)
+
+    view = tosc.ElementView(parent.node)
+    assert view[1] is view[1] and isinstance(view[1], tosc.ElementView)
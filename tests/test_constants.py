@@ -1,4 +1,4 @@
-from .profiler import profile2
+from .profiler import profile, profile2
 import tosclib as tosc
 import pytest
 import sys
@@ -48,3 +48,89 @@ def capture_stdout(monkeypatch):
 
     monkeypatch.setattr(sys.stdout, "write", fake_write)
     return buffer
+
+
+@profile
+def test_default_tables():
+    box = controls.Box()
+    assert box.properties == [] and box.defaults is controls.Box().defaults
+    with pytest.raises(TypeError):
+        box.defaults[3].params["x"] = "1"
+
+    """Defaults are merged at conversion, same as building them all"""
+    full = controls.ControlConverter.build(
+        controls.Box(box.id, controls.BoxProperties().build())
+    )
+    assert tosc.ET.tostring(controls.ControlConverter.build(box)) == tosc.ET.tostring(full)
+
+    """Overrides replace the default of the same key in place"""
+    name = tosc.PropertyFactory.build("name", "box")
+    extra = tosc.PropertyFactory.build("extra", 1)
+    merged = controls.mergeProperties(box.defaults, [extra, name])
+    keys = [p.key for p in merged]
+    assert keys == [p.key for p in box.defaults] + ["extra"]
+    assert merged[keys.index("name")] is name and len(box.defaults) == len(merged) - 1
+
+    """Repeated overrides appear once, the last one wins"""
+    other = tosc.PropertyFactory.build("extra", 2)
+    merged = controls.mergeProperties(box.defaults, [extra, name, other])
+    assert [p.key for p in merged].count("extra") == 1 and merged[-1] is other
+
+    """The merged list of a control is a read-only copy"""
+    box.properties.append(name)
+    merged = controls.mergedProperties(box)
+    assert isinstance(merged, tuple) and merged[keys.index("name")] is name
+    assert len(merged) == len(box.defaults)
+
+
+@profile
+def test_property_builders():
+    classes = (
+        controls.BoxProperties, controls.ButtonProperties, controls.LabelProperties,
+        controls.TextProperties, controls.FaderProperties, controls.XyProperties,
+        controls.RadialProperties, controls.EncoderProperties,
+        controls.RadarProperties, controls.RadioProperties,
+        controls.GroupProperties, controls.GridProperties,
+        controls.PagerProperties, controls.PageProperties,
+    )
+    for cls in classes:
+        props = cls()
+        built = props.build()
+        assert [p.key for p in built] == list(vars(props))
+        for p in built:
+            old = tosc.PropertyFactory.build(p.key, getattr(props, p.key))
+            assert (p.type, p.value, p.params) == (old.type, old.value, old.params)
+
+    """Colors are colors even when written with ints"""
+    color = controls.LabelProperties(textColor=(1, 0, 0, 1)).build("textColor")[0]
+    assert color.type == "c" and color.params["g"] == "0.0"
+    assert controls.BoxProperties().build("frame", "shape")[1].value == "0"
+
+
+@profile
+def test_converter():
+    """Deep nests don't hit the recursion limit"""
+    top = group = controls.Group(children=[])
+    for _ in range(sys.getrecursionlimit() * 2):
+        child = controls.Group(children=[])
+        group.children.append(child)
+        group = child
+    node = controls.ControlConverter.build(top)
+    assert sum(1 for _ in node.iter("node")) == sys.getrecursionlimit() * 2 + 1
+
+    """Shared objects are copied, not shared between nodes"""
+    osc = tosc.OSC(triggers=[tosc.Trigger()], path=[tosc.Partial()])
+    boxes = [controls.Box(messages=[osc, tosc.LOCAL()]) for _ in range(3)]
+    pager = controls.Pager(children=[controls.Group(children=boxes)])
+    node = controls.ControlConverter.build(pager)
+    nodes = list(node.iter("node"))
+    assert [n.get("ID") for n in nodes] == [
+        pager.id, pager.children[0].id, *(b.id for b in boxes)
+    ]
+    messages = [n.find("messages") for n in nodes[2:]]
+    assert all([m.tag for m in e] == ["osc", "local"] for e in messages)
+    assert messages[0][0] is not messages[1][0]
+    assert messages[0].find("osc/triggers/trigger/var").text == "x"
+    properties = [n.find("properties") for n in nodes[2:]]
+    assert tosc.ET.tostring(properties[0]) == tosc.ET.tostring(properties[2])
+    assert properties[0][0] is not properties[2][0]
@@ -1,4 +1,5 @@
 import logging
+import xml.etree.ElementTree as ET
 import tosclib as tosc
 import pytest
 from tosclib.tosc import ControlElements, ControlType
@@ -77,3 +78,110 @@ def test_copiers():
         childList.append(n2.getPropertyValue("name").text)
 
     assert controlsList.sort() == childList.sort()
+
+
+@profile
+def test_movers():
+    source = tosc.ElementTOSC(tosc.createGroup())
+    target = tosc.ElementTOSC(tosc.createGroup())
+    nodes = source.createChildren(ControlType.BOX, 10, names=map(str, range(10)))
+    button = source.createChild(ControlType.BUTTON)
+    source.setName("source")
+    source.setFrame((0, 0, 1, 1))
+
+    """Elements are reparented, not copied, the rest keeps its order."""
+    assert tosc.moveChildren(source, target, ControlType.BOX)
+    assert list(target.children) == nodes
+    assert list(source.children) == [button]
+    frame = source.getProperty("frame")
+    assert tosc.moveProperties(source, target, "frame")
+    assert target.getProperty("frame") is frame
+    assert source.getProperty("frame") is None
+    assert source.getName() == "source"
+
+    """No args moves everything."""
+    assert tosc.moveChildren(source, target)
+    assert list(target.children) == nodes + [button]
+    assert len(source.children) == 0
+    assert source.createOSC() and source.createMIDI()
+    assert tosc.moveMessages(source, target)
+    assert len(source.messages) == 0
+    assert [m.tag for m in target.messages] == ["osc", "midi"]
+
+    with pytest.raises(ValueError):
+        tosc.moveProperties(source, target, "name", "missing")
+    assert source.getName() == "source"
+
+
+@profile
+def test_clone():
+    root = tosc.load("docs/demos/files/Numpad_basic.tosc")
+    main = root[0]
+    clone = tosc.cloneElement(main)
+    assert clone is not main
+    assert ET.tostring(clone) == ET.tostring(main)
+
+    """New IDs for every node, LOCAL targets inside the copy follow."""
+    source = tosc.ElementTOSC(tosc.createGroup())
+    a, b = source.createChildren(ControlType.BUTTON, 2, names=("a", "b"))
+    tosc.ElementTOSC(a).createLOCAL(tosc.LOCAL(dstID=b.get("ID")))
+    tosc.ElementTOSC(b).createLOCAL(tosc.LOCAL(dstID="elsewhere"))
+    copy = tosc.cloneElement(source.node, newIds=True)
+    ids = [n.get("ID") for n in copy.iter("node")]
+    assert len(set(ids)) == 3
+    assert not set(ids) & {n.get("ID") for n in source.node.iter("node")}
+    dst = [e.text for e in copy.iter("dstID")]
+    assert dst == [ids[2], "elsewhere"]
+
+    """Copies without args take everything."""
+    target = tosc.ElementTOSC(tosc.createGroup())
+    assert tosc.copyChildren(source, target, newIds=True)
+    assert len(target.children) == 2
+    assert target.children[0].get("ID") != a.get("ID")
+    assert tosc.copyMessages(tosc.ElementTOSC(a), target)
+    assert len(target.messages) == 1
+
+
+@profile
+def test_broadcast():
+    source = tosc.ElementTOSC(tosc.createGroup())
+    source.setScript("-- shared")
+    source.setColor((1.0, 0.0, 0.0, 1.0))
+    source.createValue(tosc.Value("x", default="0.5"))
+    source.createOSC()
+
+    parent = tosc.ElementTOSC(tosc.createGroup())
+    nodes = parent.createChildren(ControlType.BOX, 20, names=map(str, range(20)))
+    targets = [tosc.ElementTOSC(n) for n in nodes]
+    targets[0].setScript("-- old")
+    targets[1].createPropertyUnsafe(tosc.Property("i", "script", "1"))
+    script = targets[0].getProperty("script")
+
+    assert tosc.copyProperties(source, targets, "script", "color")
+    assert tosc.copyValues(source, targets)
+    assert tosc.copyMessages(source, targets, ControlElements.OSC)
+    for t in targets:
+        assert t.getPropertyValue("script").text == "-- shared"
+        assert t.getColor() == (1.0, 0.0, 0.0, 1.0)
+        assert len(t.properties.findall("*[key='script']")) == 1
+        assert t.getValueParam("x", "default").text == "0.5"
+        assert len(t.messages) == 1
+
+    """Same structure is written in place, other types are replaced."""
+    assert targets[0].getProperty("script") is script
+    assert targets[1].getProperty("script").get("type") == "s"
+    assert targets[2].getProperty("script") is not source.getProperty("script")
+
+    """A single target still works."""
+    assert tosc.copyChildren(parent, source, ControlType.BOX)
+    assert len(source.children) == 20
+
+    """Elements sharing a key are pasted once, the last one wins."""
+    source.createPropertyUnsafe(tosc.Property("s", "script", "-- later"))
+    for target in (targets[0], targets[3]):
+        assert tosc.copyProperties(source, target, "script")
+        assert target.properties.findall("*[key='script']/value")[0].text == "-- later"
+        assert len(target.properties.findall("*[key='script']")) == 1
+    targets[4].properties.remove(targets[4].getProperty("script"))
+    assert tosc.copyProperties(source, targets[4], "script")
+    assert len(targets[4].properties.findall("*[key='script']")) == 1
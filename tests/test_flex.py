@@ -0,0 +1,58 @@
+from tosclib.elements import ControlType
+from tosclib.tosc import ElementTOSC, createTemplate
+from tosclib.flex import Flex, applyFlex, flexFrames
+from .profiler import profile
+import numpy as np
+
+
+@profile
+def test_flex_frames():
+    root = Flex(direction="row", padding=10, gap=5, children=[
+        Flex(basis=200, grow=0),
+        Flex(gap=10, children=[Flex(), Flex(maxSize=100)]),
+        Flex(grow=2, minSize=600, cross=100),
+    ])
+    F, boxes = flexFrames(root, (0, 0, 1000, 400))
+    assert boxes[1] is root.children[0] and boxes[4] is root.children[1].children[0]
+    assert np.allclose(F[1:], [
+        [10, 10, 200, 380],
+        [215, 10, 170, 380],
+        [390, 10, 600, 100],
+        [0, 0, 170, 270],
+        [0, 280, 170, 100],
+    ])
+
+    root = Flex(align="center", justify="between", children=[
+        Flex(grow=0, basis=50, cross=80),
+        Flex(grow=0, basis=50, cross=200),
+    ])
+    F, _ = flexFrames(root, (0, 0, 400, 400))
+    assert np.allclose(F[1:], [[160, 0, 80, 50], [100, 350, 200, 50]])
+
+    """Only the violators of the larger total violation are frozen first."""
+    root = Flex(direction="row", children=[Flex(maxSize=10), Flex(minSize=80)])
+    F, _ = flexFrames(root, (0, 0, 100, 10))
+    assert np.allclose(F[1:, 2], [10, 90])
+    root = Flex(direction="row", children=[Flex(maxSize=40), Flex(minSize=70)])
+    F, _ = flexFrames(root, (0, 0, 100, 10))
+    assert np.allclose(F[1:, 2], [30, 70])
+
+
+@profile
+def test_apply_flex():
+    page = ElementTOSC(createTemplate(frame=(0, 0, 300, 100))[0])
+    root = Flex(direction="row", children=[
+        Flex(name="left"),
+        Flex(controlType=ControlType.BUTTON, children=[Flex(), Flex()]),
+    ])
+    applyFlex(page, root)
+    assert [c.getFrame() for c in page] == [(0, 0, 150, 100), (150, 0, 150, 100)]
+    assert page[0].getPropertyValue("name").text == "left"
+    assert page[1].isControlType(ControlType.BUTTON)
+    assert [c.getFrame() for c in page[1]] == [(0, 0, 150, 50), (0, 50, 150, 50)]
+
+    root.children[0].grow = 2
+    applyFlex(page, root)
+    assert len(list(page.node.iter("node"))) == 5
+    assert [c.getFrame() for c in page] == [(0, 0, 200, 100), (200, 0, 100, 100)]
+    assert [c.getFrame() for c in page[1]] == [(0, 0, 100, 50), (0, 50, 100, 50)]
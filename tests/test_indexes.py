@@ -0,0 +1,219 @@
+import gc
+import weakref
+import pytest
+import tosclib as tosc
+from copy import deepcopy
+from tosclib import Property, Value, ControlType
+from .profiler import profile
+
+
+@profile
+def test_key_index():
+    element = tosc.ElementTOSC(tosc.createGroup())
+    for i in range(50):
+        assert element.createProperty(Property("s", f"key{i}", f"value{i}"))
+    assert element.getPropertyValue("key49").text == "value49"
+
+    """Setters replace the property, other wrappers see the change."""
+    other = tosc.ElementTOSC(element.node)
+    assert element.setName("first")
+    assert element.setName("second")
+    assert other.getPropertyValue("name").text == "second"
+    assert element.setFrame((0, 0, 10, 10))
+    assert element.setFrame((1, 2, 3, 4))
+    assert other.getFrame() == (1, 2, 3, 4)
+    assert len(element.properties.findall("*[key='frame']")) == 1
+
+    """Direct appends and removals are picked up."""
+    element.properties.append(deepcopy(element.getProperty("key0")))
+    element.getProperty("key0").find("key").text = "key0"
+    extra = deepcopy(element.getProperty("key1"))
+    extra.find("key").text = "extra"
+    element.properties.append(extra)
+    assert element.getProperty("extra") is extra
+    element.properties.remove(element.getProperty("key3"))
+    assert not element.hasProperty("key3")
+    assert element.getProperty("extra") is extra
+
+    """Duplicates resolve to the first one, like the XPath did."""
+    assert element.getProperty("key0") is element.properties[0]
+    assert element.removeProperty("key0")
+    assert element.getProperty("key0") is not None
+    assert element.removeProperty("key0")
+    assert not element.hasProperty("key0")
+    assert not element.removeProperty("key0")
+
+    """Values use the same index."""
+    assert element.createValue(Value("touch"))
+    assert element.createValue(Value("x", default="0.5"))
+    assert element.getValueParam("x", "default").text == "0.5"
+    assert element.hasValue("touch")
+    assert not element.hasValue("y")
+
+
+@profile
+def test_key_index_replaced():
+    """Removing a property and appending a new one keeps the length."""
+    element = tosc.ElementTOSC(tosc.createGroup())
+    element.setName("a")
+    element.setFrame((0, 0, 1, 1))
+    assert element.getName() == "a"
+    element.properties.remove(element.getProperty("name"))
+    element.createPropertyUnsafe(Property("s", "name", "b"))
+    assert element.getName() == "b"
+    assert element.setName("c")
+    assert element.properties.findtext("*[key='name']/value") == "c"
+
+    """Reordering is picked up too."""
+    frame = element.getProperty("frame")
+    element.properties.remove(frame)
+    element.properties.insert(0, frame)
+    assert element.getProperty("frame") is frame
+    assert element.getName() == "c"
+
+    """Misses are looked up again after direct changes of the same length."""
+    element.properties.remove(element.getProperty("frame"))
+    element.createPropertyUnsafe(Property("s", "tag", "t"))
+    assert element.getPropertyValue("tag").text == "t"
+    element.getProperty("tag").find("key").text = "script"
+    assert element.hasProperty("script") and not element.hasProperty("tag")
+    element.properties[0] = deepcopy(element.getProperty("name"))
+    element.properties[0].find("key").text = "visible"
+    assert element.hasProperty("visible")
+
+
+@profile
+def test_key_index_collected():
+    """Indexed sections are freed with their document."""
+    gc.collect()
+    before = len(tosc.KeyIndex._indexes)
+    root = tosc.createTemplate()
+    for i in range(100):
+        child = tosc.ElementTOSC(tosc.ElementTOSC(root[0]).createChild(ControlType.BOX))
+        child.setName(f"box{i}")
+        assert tosc.ElementView(child.node).getName() == f"box{i}"
+    assert len(tosc.KeyIndex._indexes) > before
+    document = weakref.ref(root)
+    del root, child
+    gc.collect()
+    assert document() is None
+    assert len(tosc.KeyIndex._indexes) == before
+
+
+@profile
+def test_document_index():
+    root = tosc.load("docs/demos/files/Numpad_basic.tosc")
+    index = tosc.DocumentIndex(root)
+    assert len(index) == len(list(root.iter("node")))
+
+    id = tosc.pullIdfromName(root, "num7")
+    node = index.getNode(id)
+    assert tosc.nodeName(node) == "num7"
+    assert index.getIds("num7") == [id]
+    assert index.getParent(root[0]) is None
+
+    """Created, appended and renamed nodes are tracked."""
+    main = tosc.ElementTOSC(root[0])
+    group = tosc.ElementTOSC(main.createChild(ControlType.GROUP))
+    assert group.node in index
+    assert index.getParent(group.node) is main.node
+    group.setName("fresh")
+    group.setName("renamed")
+    assert index.getIds("fresh") == []
+    assert index.getIds("renamed") == [group.getID()]
+
+    box = tosc.ElementTOSC(tosc.createGroup())
+    box.setName("box")
+    group.append(box)
+    assert index.getNode(box.getID()) is box.node
+    assert index.getParent(box.node) is group.node
+
+    """Moves reparent the same node."""
+    other = tosc.ElementTOSC(main.createChild(ControlType.GROUP))
+    assert tosc.moveChildren(group, other, ControlType.GROUP)
+    assert index.getNode(box.getID()) is box.node
+    assert index.getParent(box.node) is other.node
+    assert list(group.findAll(name="box")) == []
+    assert list(other.findAll(name="box")) == [box.node]
+
+    """Lookups see nodes added directly to the XML after a refresh."""
+    raw = tosc.ElementTOSC(tosc.createGroup())
+    raw.setName("raw")
+    other.children.append(raw.node)
+    assert tosc.pullIdfromName(root, "raw") == raw.getID()
+    with pytest.raises(ValueError):
+        tosc.pullIdfromName(root, "missing")
+
+
+@profile
+def test_document_index_collected():
+    """Cached indexes are freed with their root, <node> roots included."""
+    gc.collect()
+    before = len(tosc.DocumentIndex._live)
+    root = tosc.load("docs/demos/files/Numpad_basic.tosc")
+    main = tosc.ElementTOSC(root[0])
+    id = tosc.pullIdfromName(root, "num7")
+    assert tosc.pullIdfromName(main.node, "num7") == id
+    assert tosc.findNodeByName(main.node, main.getName()) is main.node
+
+    """A <node> root is in its own index but not held by it."""
+    index = tosc.DocumentIndex.of(main.node)
+    child = tosc.ElementTOSC(main.createChild(ControlType.BOX))
+    assert index.getParent(child.node) is main.node
+    assert index.isDescendant(child.node, main.node)
+    main.setName("main")
+    assert index.getNode(index.getIds("main")[0]) is main.node
+
+    document = weakref.ref(root)
+    del root, main, child, index
+    gc.collect()
+    assert document() is None
+    assert len(tosc.DocumentIndex._live) == before
+
+
+@profile
+def test_find_all():
+    root = tosc.createTemplate()
+    main = tosc.ElementTOSC(root[0])
+    for i in range(3):
+        group = tosc.ElementTOSC(main.createChild(ControlType.GROUP))
+        group.setName(f"group{i}")
+        for j in range(4):
+            button = tosc.ElementTOSC(group.createChild(ControlType.BUTTON))
+            button.setName(f"button{j}")
+            button.setTag("odd" if j % 2 else "even")
+
+    assert len(list(main.findAll())) == 15
+    assert len(list(main.findAll(name="button1"))) == 3
+    assert len(list(main.findAll(name=r"button\d"))) == 12
+    assert len(list(main.findAll(name="button.", tag="odd"))) == 6
+    assert len(list(main.findAll(type=ControlType.GROUP))) == 3
+    assert len(list(main.findAll(name="group.", type=ControlType.BUTTON))) == 0
+    group0 = tosc.ElementTOSC(main.findChildByName("group0"))
+    assert len(list(group0.findAll(tag="even"))) == 2
+    assert main.findChildByName("button0") is None
+
+    """Same results while a name index exists."""
+    index = tosc.DocumentIndex(root)
+    for name in ("button1", "group2", "missing"):
+        found = list(main.findAll(name=name))
+        assert found == [e for e in main.children.iter("node")
+                         if tosc.nodeName(e) == name]
+    assert len(list(group0.findAll(name="button1"))) == 1
+    assert len(list(group0.findAll(name="button1", tag="odd"))) == 1
+    assert len(index) == 16
+
+    """Nodes appended directly to the XML are found."""
+    knob = tosc.ElementTOSC(tosc.createGroup())
+    knob.setName("knob")
+    group0.children.append(knob.node)
+    assert list(main.findAll(name="knob")) == [knob.node]
+    assert list(main.findAll(name="kno.")) == [knob.node]
+
+    """Copies that keep their IDs are found in their own parent."""
+    group1 = tosc.ElementTOSC(main.findChildByName("group1"))
+    assert tosc.copyChildren(group0, group1)
+    copy = group1.children[-1]
+    assert copy is not knob.node and copy.get("ID") == knob.getID()
+    assert list(main.findAll(name="knob")) == [knob.node, copy]
+    assert list(group1.findAll(name="knob")) == [copy]
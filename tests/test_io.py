@@ -1,4 +1,6 @@
 import unittest
+import zlib
+import xml.etree.ElementTree as ET
 import tosclib as tosc
 from pathlib import Path
 from tosclib import Property
@@ -47,6 +49,89 @@ class TestTemplate(unittest.TestCase):
         self.assertEqual(self.template.getPropertyParam("frame", "w").text, str(w))
         self.assertEqual(self.template.getPropertyParam("frame", "h").text, str(h))
 
+    def test_load_chunks(self):
+        """Streaming load builds the same tree for any chunk size"""
+        path = "docs/demos/files/Numpad_basic.tosc"
+        with open(path, "rb") as file:
+            expected = ET.tostring(ET.fromstring(zlib.decompress(file.read())))
+        for chunkSize in (7, 1024, tosc.CHUNK_SIZE):
+            self.assertEqual(ET.tostring(tosc.load(path, chunkSize)), expected)
+        self.assertEqual(
+            b"".join(tosc.readChunks(path, 100)),
+            zlib.decompress(open(path, "rb").read()),
+        )
+
+    def test_write_chunks(self):
+        """Streaming write is byte for byte the same as compressing tostring"""
+        root = tosc.load("docs/demos/files/Numpad_basic.tosc")
+        tosc.ElementTOSC(root[0]).setName("Ñandú & <numpad>")
+        path = self.directory / "chunks.tosc"
+        self.assertTrue(tosc.write(root, path))
+        with open(path, "rb") as file:
+            self.assertEqual(
+                file.read(), zlib.compress(ET.tostring(root, encoding="UTF-8"))
+            )
+
+    def test_write_controls(self):
+        """Controls written directly match the ElementTree path"""
+        from tosclib import controls
+        osc = tosc.OSC(triggers=[tosc.Trigger()], path=[tosc.Partial("VALUE")])
+        label = controls.Label(
+            properties=[tosc.PropertyFactory.build("script", 'if a < b & "c"\n')],
+            values=[tosc.Value("text", default="Ñandú")],
+            messages=[osc, tosc.MIDI(), tosc.LOCAL()],
+        )
+        pager = controls.Pager(
+            children=[controls.Group(children=[label, controls.Fader()]), controls.Box()]
+        )
+        old, new = self.directory / "old.tosc", self.directory / "new.tosc"
+        self.assertTrue(tosc.write(tosc.asRoot(pager), old))
+        self.assertTrue(tosc.writeControls(pager, new))
+        self.assertEqual(new.read_bytes(), old.read_bytes())
+
+    def test_decode_controls(self):
+        """Decoded controls convert back to the same XML"""
+        from tosclib import controls
+
+        def dropEmpty(root):
+            for node in root.iter("node"):
+                for section in [s for s in node if s.tag != "children" and not len(s)]:
+                    node.remove(section)
+            return ET.tostring(root)
+
+        path = "docs/demos/files/Numpad_basic.tosc"
+        root = tosc.load(path)
+        control = tosc.asCtrl(root[0])
+        self.assertIsInstance(control, controls.Group)
+        self.assertEqual(dropEmpty(tosc.asXml(control)), dropEmpty(root[0]))
+
+        streamed = tosc.loadControls(path, 100)
+        self.assertEqual(
+            ET.tostring(tosc.asXml(streamed)), ET.tostring(tosc.asXml(control))
+        )
+
+        root = tosc.load("docs/demos/files/stoic.tosc")
+        midi = next(root.iter("midi"))
+        decoded = controls.ControlDecoder.decodeMessage(midi)
+        self.assertIsInstance(decoded, tosc.MIDI)
+        self.assertEqual(decoded.message.channel, "0")
+        self.assertEqual([v.scaleMax for v in decoded.values], ["15", "1", "127"])
+        self.assertEqual(
+            ET.tostring(controls.XmlFactory.messageElement(decoded)), ET.tostring(midi)
+        )
+
+        """Unknown messages are kept and written back"""
+        node = tosc.ElementTOSC(tosc.createGroup()).node
+        gamepad = ET.SubElement(node.find("messages"), "gamepad")
+        ET.SubElement(gamepad, "enabled").text = "1"
+        ET.SubElement(gamepad, "button").text = "3"
+        ET.SubElement(node.find("messages"), "osc").append(ET.Element("send"))
+        control = tosc.asCtrl(node)
+        self.assertEqual([type(m) for m in control.messages], [ET.Element, tosc.OSC])
+        written = tosc.asXml(control).find("messages")
+        self.assertEqual([m.tag for m in written], ["gamepad", "osc"])
+        self.assertEqual(ET.tostring(written[0]), ET.tostring(gamepad))
+
     @classmethod
     def tearDownClass(cls):
         [Path.unlink(file) for file in cls.directory.iterdir()]
@@ -1,10 +1,17 @@
 from typing import List
 from tosclib.elements import ControlType, Property, PropertyFactory
-from tosclib.tosc import ElementTOSC, createTemplate, write
+from tosclib.tosc import ElementTOSC, ElementView, createTemplate, write
+from tosclib.arrays import setFrames
 from tosclib import layout
 from .profiler import profile
 from logging import debug
+import numpy as np
+import xml.etree.ElementTree as ET
 import inspect
+import os
+import pickle
+import pytest
+import tempfile
 
 # from memory_profiler import profile
 
@@ -48,3 +55,185 @@ def test_layout():
     
     assert mainLayout(node, ControlType.GROUP, (3,3), ("#CE6A85", "#5C374C")) is node
     assert write(root, "tests/test_layout.tosc")
+
+
+@profile
+def test_layout_children():
+    node = ElementTOSC(createTemplate(frame=(0, 0, 300, 200))[0])
+    accessed = []
+
+    @layout.grid
+    def cells(children):
+        accessed.append(len(children))
+        accessed.append(children[1].getFrame())
+        return (PropertyFactory.name("cells"),)
+
+    cells(node, ControlType.BOX, (3, 2), ((1.0, 0.0, 0.0, 1.0), (0.0, 0.0, 1.0, 1.0)))
+    assert accessed == [6, (0, 100, 100, 100)]
+    assert node.getPropertyValue("name").text == "cells"
+    children = list(node)
+    assert [c.getFrame() for c in children][-1] == (200, 100, 100, 100)
+    assert children[0].getColor() == (1.0, 0.0, 0.0, 1.0)
+    assert all(len(c.node) == 4 for c in children)
+
+
+@profile
+def test_grid_colors():
+    black, red, green, blue = (0, 0, 0, 1), (1, 0, 0, 1), (0, 1, 0, 1), (0, 0, 1, 1)
+    F = layout.gridFrames((0, 0, 300, 200), (3, 2))
+    assert F.tolist()[:3] == [[0, 0, 100, 100], [0, 100, 100, 100], [100, 0, 100, 100]]
+
+    C = layout.gridColors((3, 1), (black, red, blue), 0, stops=(0, 0.25, 1))
+    assert np.allclose(C, [black, (2/3, 0, 1/3, 1), blue])
+
+    C = layout.gridColors((2, 2), (black, red, green, blue), "bilinear")
+    assert np.allclose(C, [black, green, red, blue])
+
+    C = layout.gridColors((3, 3), (red, blue), "radial")
+    assert np.allclose(C[4], red) and np.allclose(C[[0, 2, 6, 8]], blue)
+
+
+@profile
+def test_layout_plan():
+    @layout.column
+    def inner(children):
+        children[0].setName("first")
+
+    @layout.row
+    def outer(children):
+        inner(children[1], ControlType.BUTTON, size=(1, 3))
+        return (PropertyFactory.name("outer"),)
+
+    plan = outer.plan((0, 0, 400, 100), ControlType.GROUP, size=(1, 1))
+    assert [(path, p.spec.kind) for path, p in plan.iterPlans()] == [((), "row"), ((1,), "column")]
+    assert plan.frames.tolist() == [[0, 0, 200, 100], [200, 0, 200, 100]]
+    nested = plan.calls[0][1]
+    assert nested.frames.tolist() == [[0, 0, 200, 25], [0, 25, 200, 75]]
+    assert nested.calls == [(0, "setName", ("first",), {})]
+
+    planned = ElementTOSC(createTemplate(frame=(0, 0, 400, 100))[0])
+    built = ElementTOSC(createTemplate(frame=(0, 0, 400, 100))[0])
+    plan.apply(planned)
+    outer(built, ControlType.GROUP, size=(1, 1))
+    for a, b in zip(planned.node.iter("node"), built.node.iter("node")):
+        a.set("ID", b.get("ID"))
+    assert ET.tostring(planned.node) == ET.tostring(built.node)
+    assert planned[1][0].getPropertyValue("name").text == "first"
+
+
+@profile
+def test_cached_plan():
+    @layout.column
+    def strip(children):
+        children[0].setTag("top")
+
+    @layout.row
+    def panel(children):
+        for child in children:
+            strip(child, ControlType.BUTTON, size=(1, 1))
+
+    filled = []
+
+    def fill(path, children):
+        filled.append((path, len(children)))
+        children[-1].setScript(f"-- {path}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "panel.plan")
+        args = ((0, 0, 200, 100), ControlType.GROUP, (1, 1))
+        plan = layout.cachedPlan(path, panel, *args)
+        assert layout.cachedPlan(path, panel, *args).key == plan.key
+        assert layout.cachedPlan(path, panel, (0, 0, 400, 100), *args[1:]).key != plan.key
+
+    first = ElementTOSC(createTemplate(frame=(0, 0, 200, 100))[0])
+    second = ElementTOSC(createTemplate(frame=(0, 0, 200, 100))[0])
+    plan.apply(first, fill, names={(1,): ("a", "b")})
+    plan.apply(second)
+    assert filled == [((), 2), ((0,), 2), ((1,), 2)]
+    assert first[1][1].getPropertyValue("name").text == "b"
+    assert first[1][1].getPropertyValue("script").text == "-- (1,)"
+    assert first[0][0].getPropertyValue("tag").text == "top"
+    assert second[1][1].getProperty("script") is None
+    assert first[1][1].getFrame() == second[1][1].getFrame() == (0, 50, 100, 50)
+    ids = [n.get("ID") for e in (first, second) for n in e.children.iter("node")]
+    assert len(set(ids)) == len(ids) == 12
+
+    """Nested layouts are found by their nodes, not by their position."""
+    @layout.row
+    def labelled(children):
+        children[0].createChild(ControlType.LABEL)
+        strip(children[0], ControlType.BUTTON, size=(1, 1))
+
+    third = ElementTOSC(createTemplate(frame=(0, 0, 200, 100))[0])
+    filled.clear()
+    labelled.plan((0, 0, 200, 100), ControlType.GROUP, (1,)).apply(third, fill)
+    buttons = [third[0][1].node, third[0][2].node]
+    assert third[0][0].isControlType(ControlType.LABEL)
+    assert filled == [((), 1), ((0,), 2)]
+    assert third[0][2].getPropertyValue("script").text == "-- (0,)"
+    assert layout.RECORDS[third[0].node][0][1] == buttons
+
+    """Files without the plan header are planned again, never unpickled."""
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "panel.plan")
+        with open(path, "wb") as file:
+            pickle.dump(plan, file)
+        with pytest.raises(TypeError):
+            layout.LayoutPlan.fromFile(path)
+        assert layout.cachedPlan(path, panel, *args).key == plan.key
+        assert layout.LayoutPlan.fromFile(path).key == plan.key
+
+    """Changing a constant of the layout function is a cache miss."""
+    @layout.row
+    def cells(children):
+        layout.grid(lambda c: None)(children[0], ControlType.BOX, (2, 2))
+
+    small = cells.plan(*args)
+
+    @layout.row
+    def cells(children):
+        layout.grid(lambda c: None)(children[0], ControlType.BOX, (5, 5))
+
+    assert cells.plan(*args).key != small.key
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "cells.plan")
+        small.compile().save(path)
+        assert len(layout.cachedPlan(path, cells, *args).calls[0][1]) == 25
+
+
+@profile
+def test_relayout():
+    def frames(e, skip=None):
+        return [ElementTOSC(n).getFrame() for n in e.node.iter("node") if n is not skip]
+
+    built = ElementTOSC(createTemplate(frame=(0, 0, 900, 600))[0])
+    fresh = ElementTOSC(createTemplate(frame=(0, 0, 600, 300))[0])
+    applied = ElementTOSC(createTemplate(frame=(0, 0, 900, 600))[0])
+    colors = ("#CE6A85", "#5C374C")
+    mainLayout(built, ControlType.GROUP, (3, 3), colors)
+    mainLayout(fresh, ControlType.GROUP, (3, 3), colors)
+    mainLayout.plan((0, 0, 900, 600), ControlType.GROUP, (3, 3), colors).apply(applied)
+    extra = ElementTOSC(built[0].createChild(ControlType.LABEL))
+    extra.setFrame((1, 2, 3, 4))
+
+    built.setFrame((0, 0, 600, 300))
+    applied.update(frame=(0, 0, 600, 300))
+    assert frames(built, extra.node) == frames(fresh) == frames(applied)
+    assert extra.getFrame() == (1, 2, 3, 4)
+
+    assert layout.relayout(built[4], (0, 0, 20, 40)) == 4
+    assert [c.getFrame() for c in built[4]] == [(0, y, 20, 10) for y in (0, 10, 20, 30)]
+    built.children.remove(built[8].node)
+    assert layout.relayout(built) == 8 + 4 + 2
+
+    """Bulk setFrames lays out again too, relayout only reads the parent."""
+    bare = built[4].node
+    for tag in ("values", "messages"):
+        bare.remove(bare.find(tag))
+    assert setFrames([bare], np.array([(0, 0, 40, 80)]))
+    assert [c.getFrame() for c in ElementView(bare)] == [
+        (0, y, 40, 20) for y in (0, 20, 40, 60)
+    ]
+    assert [e.tag for e in bare] == ["properties", "children"]
+    assert setFrames([bare], np.array([(0, 0, 80, 80)]), hooks=False)
+    assert ElementView(bare)[0].getFrame() == (0, 0, 40, 20)